@@ -12,31 +12,41 @@ Extended benchmarks for thorough terminal performance comparison including:
 - Resource usage (CPU, memory over time)
 - Special characters (box drawing, powerline, nerd fonts)
 
+Every workload is written to the terminal this script runs in and timed
+until the terminal has parsed it (terminal_harness.py), so run it inside
+the terminal under test, once per terminal. `--compare` then compares the
+newest saved result of each terminal.
+
+With `--daemon`, workloads go to a headless session of a running BossTerm
+session daemon instead (daemon_harness.py), so BossTerm's emulator can be
+benchmarked on a machine with no display or controlling terminal. Those
+results are filed as bossterm-headless.
+
 Usage:
     python3 benchmark_comprehensive.py [options]
 """
 
 import argparse
 import json
-import os
 import platform
 import psutil
-import random
 import shutil
-import statistics
 import string
 import subprocess
 import sys
-import tempfile
 import threading
-import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Union
 from concurrent.futures import ThreadPoolExecutor
 import io
 
+from terminal_harness import TerminalHarness, TerminalUnavailable, current_terminal
+from daemon_harness import DaemonHarness
+from workload_corpus import Corpus, DEFAULT_SEED, Payload
+from sampling import Sample, SamplingPolicy, margin, measure
+
 
 # === Data Classes ===
 
@@ -51,21 +61,16 @@ class BenchmarkResult:
     raw_data: List[float] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def add_timing(self, values: List[float], unit: str = "ms"):
-        self.raw_data = values
-        n = len(values)
-        sorted_vals = sorted(values)
-        self.metrics = {
-            "min": min(values),
-            "max": max(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "stdev": statistics.stdev(values) if n > 1 else 0,
-            "p50": sorted_vals[int(n * 0.50)] if n > 0 else 0,
-            "p90": sorted_vals[int(n * 0.90)] if n >= 10 else max(values),
-            "p95": sorted_vals[int(n * 0.95)] if n >= 20 else max(values),
-            "p99": sorted_vals[int(n * 0.99)] if n >= 100 else max(values),
-            "unit": unit
+    def add_timing(self, sample: Sample, label: str = "timing"):
+        """Record a timing in ms; percentiles the runs can't support are None, not max"""
+        self.raw_data = sample.values
+        self.metrics[label] = {
+            **sample.stats("time_ms"),
+            "min_ms": min(sample.values),
+            "max_ms": max(sample.values),
+            "p90_ms": sample.percentile(90),
+            "p95_ms": sample.percentile(95),
+            "p99_ms": sample.percentile(99),
         }
 
     def to_dict(self) -> Dict:
@@ -80,6 +85,8 @@ class BenchmarkSuite:
     cpu_info: str
     memory_gb: float
     timestamp: str
+    seed: Optional[int] = None  # corpus seed; None for results from before seeding
+    sampling: Optional[Dict[str, Any]] = None  # SamplingPolicy; None for fixed-run results
     results: List[BenchmarkResult] = field(default_factory=list)
 
     def add_result(self, result: BenchmarkResult):
@@ -93,41 +100,49 @@ class BenchmarkSuite:
             "cpu_info": self.cpu_info,
             "memory_gb": self.memory_gb,
             "timestamp": self.timestamp,
+            "seed": self.seed,
+            "sampling": self.sampling,
             "results": [r.to_dict() for r in self.results]
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BenchmarkSuite":
+        results = [BenchmarkResult(**r) for r in data.get("results", [])]
+        return cls(**{**data, "results": results})
+
 
 # === Enhanced Data Generators ===
 
 class DataGenerator:
-    """Comprehensive test data generators"""
+    """Comprehensive test data generators
+
+    Random content comes from `corpus` (workload_corpus.py): every generator
+    is seeded from the corpus seed and its own name, so runs with the same
+    seed see the same bytes. The bulk ones return a Workload, cached on disk
+    and streamed to the terminal in bounded chunks; the rest are a few KB
+    and return str.
+    """
+
+    corpus = Corpus()
 
     # ===== Basic Data =====
     @staticmethod
-    def random_ascii(size_bytes: int) -> bytes:
-        chars = string.ascii_letters + string.digits
-        return ''.join(random.choice(chars) for _ in range(size_bytes)).encode()
+    def random_ascii(size_bytes: int) -> Payload:
+        return DataGenerator.corpus.random_ascii(size_bytes)
 
     @staticmethod
-    def random_printable(size_bytes: int) -> str:
-        chars = string.printable.replace('\x0b', '').replace('\x0c', '')
-        return ''.join(random.choice(chars) for _ in range(size_bytes))
+    def random_printable(size_bytes: int) -> Payload:
+        return DataGenerator.corpus.random_printable(size_bytes)
 
     @staticmethod
-    def lines(count: int, line_length: int = 80, varied: bool = False) -> str:
+    def lines(count: int, line_length: int = 80, varied: bool = False) -> Payload:
         if varied:
-            lines = []
-            for i in range(count):
-                length = random.randint(20, 120) if varied else line_length
-                lines.append(''.join(random.choice(string.ascii_lowercase) for _ in range(length)))
-            return '\n'.join(lines)
-        else:
-            line = 'x' * line_length
-            return '\n'.join([line] * count)
+            return DataGenerator.corpus.varied_lines(count)
+        return DataGenerator.corpus.repeated_lines(count, b'x' * line_length)
 
     @staticmethod
-    def numbered_lines(count: int) -> str:
-        return '\n'.join(f"{i:6d}: {'x' * 70}" for i in range(1, count + 1))
+    def numbered_lines(count: int) -> Payload:
+        return DataGenerator.corpus.numbered_lines(count)
 
     # ===== Unicode Data =====
     @staticmethod
@@ -296,6 +311,7 @@ class DataGenerator:
     @staticmethod
     def ansi_truecolor() -> str:
         """24-bit RGB truecolor"""
+        rng = DataGenerator.corpus.rng("ansi_truecolor")
         result = []
         # Gradient
         for r in range(0, 256, 8):
@@ -306,7 +322,7 @@ class DataGenerator:
             result.append(f"\033[38;2;0;0;{b}m█\033[0m")
         # Random colors
         for _ in range(500):
-            r, g, b = random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
+            r, g, b = rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)
             result.append(f"\033[38;2;{r};{g};{b}m█\033[0m")
         return ''.join(result * 5)
 
@@ -337,16 +353,17 @@ class DataGenerator:
     @staticmethod
     def ansi_cursor_movements() -> str:
         """Cursor movement sequences"""
+        rng = DataGenerator.corpus.rng("ansi_cursor_movements")
         result = []
         # Move cursor up/down/left/right
         for _ in range(100):
-            result.append(f"\033[{random.randint(1,5)}A")  # Up
+            result.append(f"\033[{rng.randint(1,5)}A")  # Up
             result.append("X")
-            result.append(f"\033[{random.randint(1,5)}B")  # Down
+            result.append(f"\033[{rng.randint(1,5)}B")  # Down
             result.append("Y")
-            result.append(f"\033[{random.randint(1,10)}C")  # Right
+            result.append(f"\033[{rng.randint(1,10)}C")  # Right
             result.append("Z")
-            result.append(f"\033[{random.randint(1,10)}D")  # Left
+            result.append(f"\033[{rng.randint(1,10)}D")  # Left
             result.append("W")
         return ''.join(result)
 
@@ -410,6 +427,7 @@ class DataGenerator:
     @staticmethod
     def block_elements() -> str:
         """Block elements and shading"""
+        rng = DataGenerator.corpus.rng("block_elements")
         blocks = "▀▁▂▃▄▅▆▇█▉▊▋▌▍▎▏▐░▒▓"
         result = []
         # Gradient
@@ -417,7 +435,7 @@ class DataGenerator:
             result.append(char * 20 + "\n")
         # Pattern
         for _ in range(20):
-            result.append(''.join(random.choice(blocks) for _ in range(80)) + "\n")
+            result.append(''.join(rng.choice(blocks) for _ in range(80)) + "\n")
         return ''.join(result * 20)
 
     @staticmethod
@@ -454,6 +472,7 @@ class DataGenerator:
     @staticmethod
     def compiler_output() -> str:
         """Simulated compiler output with errors/warnings"""
+        rng = DataGenerator.corpus.rng("compiler_output")
         files = ["main.cpp", "utils.h", "config.cpp", "network.cpp", "database.h"]
         severities = [
             ("\033[31merror\033[0m", "undeclared identifier"),
@@ -464,11 +483,11 @@ class DataGenerator:
         ]
         result = []
         for i in range(500):
-            file = random.choice(files)
-            line = random.randint(1, 500)
-            col = random.randint(1, 80)
-            sev, msg = random.choice(severities)
-            result.append(f"{file}:{line}:{col}: {sev}: {msg} '{random.choice(string.ascii_lowercase)}'\n")
+            file = rng.choice(files)
+            line = rng.randint(1, 500)
+            col = rng.randint(1, 80)
+            sev, msg = rng.choice(severities)
+            result.append(f"{file}:{line}:{col}: {sev}: {msg} '{rng.choice(string.ascii_lowercase)}'\n")
             result.append(f"   {line} |     int x = undefined_var;\n")
             result.append(f"     |             ^~~~~~~~~~~~~\n")
         return ''.join(result)
@@ -476,6 +495,7 @@ class DataGenerator:
     @staticmethod
     def log_output() -> str:
         """Simulated log file output"""
+        rng = DataGenerator.corpus.rng("log_output")
         levels = [
             ("\033[37m", "DEBUG"),
             ("\033[32m", "INFO"),
@@ -498,27 +518,28 @@ class DataGenerator:
         ]
         result = []
         for i in range(1000):
-            color, level = random.choice(levels)
-            module = random.choice(modules)
-            msg = random.choice(messages)
-            ts = f"2024-01-{random.randint(1,31):02d} {random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}.{random.randint(0,999):03d}"
+            color, level = rng.choice(levels)
+            module = rng.choice(modules)
+            msg = rng.choice(messages)
+            ts = f"2024-01-{rng.randint(1,31):02d} {rng.randint(0,23):02d}:{rng.randint(0,59):02d}:{rng.randint(0,59):02d}.{rng.randint(0,999):03d}"
             result.append(f"{color}[{ts}] [{level:5}] [{module:8}] {msg}\033[0m\n")
         return ''.join(result)
 
     @staticmethod
     def git_diff_output() -> str:
         """Simulated git diff output"""
+        rng = DataGenerator.corpus.rng("git_diff_output")
         result = []
         for file_num in range(20):
             result.append(f"\033[1mdiff --git a/file{file_num}.py b/file{file_num}.py\033[0m\n")
             result.append(f"index abc1234..def5678 100644\n")
             result.append(f"--- a/file{file_num}.py\n")
             result.append(f"+++ b/file{file_num}.py\n")
-            for hunk in range(random.randint(1, 5)):
-                start = random.randint(1, 100)
+            for hunk in range(rng.randint(1, 5)):
+                start = rng.randint(1, 100)
                 result.append(f"\033[36m@@ -{start},10 +{start},12 @@\033[0m def function_{hunk}():\n")
-                for line in range(random.randint(5, 15)):
-                    change = random.choice([' ', '-', '+', ' ', ' '])
+                for line in range(rng.randint(5, 15)):
+                    change = rng.choice([' ', '-', '+', ' ', ' '])
                     if change == '-':
                         result.append(f"\033[31m-    old_code_line_{line} = value\033[0m\n")
                     elif change == '+':
@@ -543,33 +564,35 @@ class DataGenerator:
     @staticmethod
     def htop_simulation() -> str:
         """Simulated htop-like output"""
+        rng = DataGenerator.corpus.rng("htop_simulation")
         result = []
         # CPU bars
         for cpu in range(8):
-            usage = random.randint(0, 100)
+            usage = rng.randint(0, 100)
             bar_len = usage // 5
             bar = f"\033[32m{'|' * bar_len}\033[0m{' ' * (20 - bar_len)}"
             result.append(f"CPU{cpu} [{bar}] {usage:3d}%\n")
         result.append("\n")
         # Memory
-        mem_used = random.randint(4000, 12000)
+        mem_used = rng.randint(4000, 12000)
         mem_total = 16000
         result.append(f"Mem: {mem_used}M/{mem_total}M\n")
         result.append("\n")
         # Process list
         result.append(f"\033[7m{'PID':>7} {'USER':8} {'CPU%':>5} {'MEM%':>5} {'COMMAND':<40}\033[0m\n")
         for _ in range(50):
-            pid = random.randint(1000, 99999)
-            user = random.choice(["root", "user", "www-data", "postgres", "redis"])
-            cpu = random.uniform(0, 100)
-            mem = random.uniform(0, 20)
-            cmd = random.choice(["python3", "node", "java", "nginx", "postgres", "redis-server", "chrome", "code"])
+            pid = rng.randint(1000, 99999)
+            user = rng.choice(["root", "user", "www-data", "postgres", "redis"])
+            cpu = rng.uniform(0, 100)
+            mem = rng.uniform(0, 20)
+            cmd = rng.choice(["python3", "node", "java", "nginx", "postgres", "redis-server", "chrome", "code"])
             result.append(f"{pid:>7} {user:8} {cpu:>5.1f} {mem:>5.1f} {cmd:<40}\n")
         return ''.join(result * 10)
 
     @staticmethod
     def vim_screen_simulation() -> str:
         """Simulated vim-like screen with syntax highlighting"""
+        rng = DataGenerator.corpus.rng("vim_screen_simulation")
         result = []
         # Line numbers + code
         for i in range(100):
@@ -581,15 +604,16 @@ class DataGenerator:
             elif i % 10 == 9:
                 code = f"    \033[35mreturn\033[0m result"
             else:
-                code = f"    x = \033[36m{random.randint(0, 100)}\033[0m"
+                code = f"    x = \033[36m{rng.randint(0, 100)}\033[0m"
             result.append(f"{line_num}{code}\n")
         # Status line
-        result.append(f"\033[7m NORMAL | main.py | ln {random.randint(1,100)}, col {random.randint(1,80)} \033[0m\n")
+        result.append(f"\033[7m NORMAL | main.py | ln {rng.randint(1,100)}, col {rng.randint(1,80)} \033[0m\n")
         return ''.join(result * 5)
 
     @staticmethod
     def mixed_workload() -> str:
         """Mixed realistic workload"""
+        rng = DataGenerator.corpus.rng("mixed_workload")
         parts = [
             DataGenerator.compiler_output()[:2000],
             DataGenerator.log_output()[:2000],
@@ -599,7 +623,7 @@ class DataGenerator:
             DataGenerator.emoji_basic()[:500],
             DataGenerator.cjk_characters()[:500],
         ]
-        random.shuffle(parts)
+        rng.shuffle(parts)
         return '\n'.join(parts)
 
 
@@ -609,9 +633,12 @@ class BaseBenchmark:
     """Base class for benchmarks"""
     name = "base"
     category = "general"
+    # Warmup and stopping rule for every measurement; `runs` is the minimum.
+    sampling = SamplingPolicy()
 
-    def __init__(self, runs: int = 5):
+    def __init__(self, runs: int = 5, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
 
     def run(self, terminal: str) -> BenchmarkResult:
         raise NotImplementedError
@@ -625,25 +652,14 @@ class BaseBenchmark:
             runs=self.runs
         )
 
-    def _time_cat(self, data: str, runs: int = None) -> List[float]:
-        """Time cat command with data"""
-        runs = runs or self.runs
-        timings = []
+    def _measure(self, run: Callable[[], float]) -> Sample:
+        """Sample run() (ms) under the sampling policy, for at least self.runs runs"""
+        return measure(run, self.sampling, self.runs)
 
-        with tempfile.NamedTemporaryFile(delete=False, mode='w', encoding='utf-8') as f:
-            f.write(data)
-            temp_file = f.name
-
-        try:
-            for _ in range(runs):
-                start = time.perf_counter()
-                subprocess.run(['cat', temp_file], capture_output=True)
-                end = time.perf_counter()
-                timings.append((end - start) * 1000)  # ms
-        finally:
-            os.unlink(temp_file)
-
-        return timings
+    def _time_output(self, data: Union[str, Payload]) -> Sample:
+        """Time the terminal parsing data"""
+        payload = data.encode('utf-8') if isinstance(data, str) else data
+        return self._measure(lambda: self.harness.time_output(payload))
 
 
 # === Throughput Benchmarks ===
@@ -651,21 +667,19 @@ class BaseBenchmark:
 class ThroughputRawBenchmark(BaseBenchmark):
     name = "throughput_raw"
     category = "throughput"
+    # Workloads are streamed, so sizes are bounded by disk, not memory.
+    sizes_mb = [1, 5, 10, 25, 50]
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = self._create_result(terminal)
-        sizes_mb = [1, 5, 10, 25, 50]
         metrics = {}
 
-        for size in sizes_mb:
-            data = DataGenerator.random_ascii(size * 1024 * 1024).decode()
-            timings = self._time_cat(data)
-            throughput = [size / (t / 1000) for t in timings]
-
+        for size in self.sizes_mb:
+            data = DataGenerator.random_ascii(size * 1024 * 1024)
+            sample = self._time_output(data)
             metrics[f"{size}MB"] = {
-                "throughput_mbps_mean": statistics.mean(throughput),
-                "throughput_mbps_stdev": statistics.stdev(throughput) if len(throughput) > 1 else 0,
-                "time_ms_mean": statistics.mean(timings),
+                **sample.rate(size, "throughput_mbps"),
+                **sample.stats("time_ms"),
             }
 
         result.metrics = metrics
@@ -683,13 +697,10 @@ class ThroughputLinesBenchmark(BaseBenchmark):
 
         for count in line_counts:
             data = DataGenerator.lines(count)
-            timings = self._time_cat(data)
-            lines_per_sec = [count / (t / 1000) for t in timings]
-
+            sample = self._time_output(data)
             metrics[f"{count}_lines"] = {
-                "lines_per_sec_mean": statistics.mean(lines_per_sec),
-                "lines_per_sec_stdev": statistics.stdev(lines_per_sec) if len(lines_per_sec) > 1 else 0,
-                "time_ms_mean": statistics.mean(timings),
+                **sample.rate(count, "lines_per_sec"),
+                **sample.stats("time_ms"),
             }
 
         result.metrics = metrics
@@ -705,12 +716,11 @@ class ThroughputVariedBenchmark(BaseBenchmark):
 
         # Variable line lengths
         data = DataGenerator.lines(10000, varied=True)
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "varied_lines_10k": {
-                "time_ms_mean": statistics.mean(timings),
-                "time_ms_stdev": statistics.stdev(timings) if len(timings) > 1 else 0,
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -722,52 +732,27 @@ class LatencyEchoBenchmark(BaseBenchmark):
     name = "latency_echo"
     category = "latency"
 
-    def __init__(self, runs: int = 100):
-        super().__init__(runs)
+    def __init__(self, runs: int = 100, harness: Optional[TerminalHarness] = None):
+        super().__init__(runs, harness)
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = self._create_result(terminal)
 
-        # Simple echo
-        echo_times = []
-        for _ in range(self.runs):
-            start = time.perf_counter_ns()
-            subprocess.run(['echo', 'x'], capture_output=True)
-            end = time.perf_counter_ns()
-            echo_times.append((end - start) / 1_000_000)
+        # Output-to-parsed round trip for what `echo x` prints
+        result.add_timing(self._measure(lambda: self.harness.time_output(b"x\n", reset=False)), "echo")
 
         # Printf with varying sizes
-        printf_times = {}
         for size in [1, 10, 80, 200]:
-            times = []
-            for _ in range(self.runs):
-                start = time.perf_counter_ns()
-                subprocess.run(['printf', '%s', 'x' * size], capture_output=True)
-                end = time.perf_counter_ns()
-                times.append((end - start) / 1_000_000)
-            printf_times[f"printf_{size}chars"] = self._stats(times)
+            payload = b"x" * size
+            printf = self._measure(lambda: self.harness.time_output(payload, reset=False))
+            result.metrics[f"printf_{size}chars"] = {
+                **printf.stats("time_ms"),
+                "p95_ms": printf.percentile(95),
+                "p99_ms": printf.percentile(99),
+            }
 
-        result.metrics = {
-            "echo": self._stats(echo_times),
-            **printf_times
-        }
-        result.raw_data = echo_times
         return result
 
-    @staticmethod
-    def _stats(values: List[float]) -> Dict:
-        sorted_vals = sorted(values)
-        n = len(values)
-        return {
-            "min_ms": min(values),
-            "max_ms": max(values),
-            "mean_ms": statistics.mean(values),
-            "median_ms": statistics.median(values),
-            "stdev_ms": statistics.stdev(values) if n > 1 else 0,
-            "p95_ms": sorted_vals[int(n * 0.95)] if n >= 20 else max(values),
-            "p99_ms": sorted_vals[int(n * 0.99)] if n >= 100 else max(values),
-        }
-
 
 class LatencySequentialBenchmark(BaseBenchmark):
     name = "latency_sequential"
@@ -776,17 +761,11 @@ class LatencySequentialBenchmark(BaseBenchmark):
     def run(self, terminal: str) -> BenchmarkResult:
         result = self._create_result(terminal)
 
-        # Rapid sequential commands
-        times = []
-        for _ in range(self.runs):
-            start = time.perf_counter_ns()
-            for _ in range(10):
-                subprocess.run(['true'], capture_output=True)
-            end = time.perf_counter_ns()
-            times.append((end - start) / 1_000_000)
-
-        result.add_timing(times)
-        result.metadata["description"] = "10 sequential 'true' commands"
+        # Rapid sequential round trips, each waiting for the last to be parsed
+        result.add_timing(self._measure(
+            lambda: sum(self.harness.time_output(b"$ true\n", reset=False) for _ in range(10))
+        ), "sequential_10")
+        result.metadata["description"] = "10 sequential one-line outputs, each awaited"
         return result
 
 
@@ -809,13 +788,12 @@ class UnicodeEmojiBenchmark(BaseBenchmark):
 
         metrics = {}
         for name, data in tests.items():
-            timings = self._time_cat(data)
+            sample = self._time_output(data)
             metrics[name] = {
                 "chars": len(data),
                 "bytes": len(data.encode('utf-8')),
-                "time_ms_mean": statistics.mean(timings),
-                "time_ms_stdev": statistics.stdev(timings) if len(timings) > 1 else 0,
-                "chars_per_sec": len(data) / (statistics.mean(timings) / 1000),
+                **sample.stats("time_ms"),
+                **sample.rate(len(data), "chars_per_sec"),
             }
 
         result.metrics = metrics
@@ -830,14 +808,14 @@ class UnicodeCJKBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.cjk_characters()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "cjk": {
                 "chars": len(data),
                 "bytes": len(data.encode('utf-8')),
-                "time_ms_mean": statistics.mean(timings),
-                "chars_per_sec": len(data) / (statistics.mean(timings) / 1000),
+                **sample.stats("time_ms"),
+                **sample.rate(len(data), "chars_per_sec"),
             }
         }
         return result
@@ -851,14 +829,14 @@ class UnicodeSurrogateBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.surrogate_pairs()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "surrogate_pairs": {
                 "chars": len(data),
                 "bytes": len(data.encode('utf-8')),
-                "time_ms_mean": statistics.mean(timings),
-                "chars_per_sec": len(data) / (statistics.mean(timings) / 1000),
+                **sample.stats("time_ms"),
+                **sample.rate(len(data), "chars_per_sec"),
             }
         }
         return result
@@ -878,11 +856,11 @@ class UnicodeCombiningBenchmark(BaseBenchmark):
 
         metrics = {}
         for name, data in tests.items():
-            timings = self._time_cat(data)
+            sample = self._time_output(data)
             metrics[name] = {
                 "chars": len(data),
                 "bytes": len(data.encode('utf-8')),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
 
         result.metrics = metrics
@@ -906,12 +884,12 @@ class ANSIColorBenchmark(BaseBenchmark):
 
         metrics = {}
         for name, data in tests.items():
-            timings = self._time_cat(data)
+            sample = self._time_output(data)
             seq_count = data.count('\033')
             metrics[name] = {
                 "sequences": seq_count,
-                "time_ms_mean": statistics.mean(timings),
-                "sequences_per_sec": seq_count / (statistics.mean(timings) / 1000),
+                **sample.stats("time_ms"),
+                **sample.rate(seq_count, "sequences_per_sec"),
             }
 
         result.metrics = metrics
@@ -926,12 +904,12 @@ class ANSIAttributesBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.ansi_attributes()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "attributes": {
                 "sequences": data.count('\033'),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -945,12 +923,12 @@ class ANSICursorBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.ansi_cursor_movements()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "cursor_movements": {
                 "sequences": data.count('\033'),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -966,12 +944,12 @@ class BoxDrawingBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.box_drawing()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "box_drawing": {
                 "chars": len(data),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -985,12 +963,12 @@ class BlockElementsBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.block_elements()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "block_elements": {
                 "chars": len(data),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1004,12 +982,12 @@ class PowerlineBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.powerline_symbols()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "powerline": {
                 "chars": len(data),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1023,12 +1001,12 @@ class BrailleBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.braille_patterns()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "braille": {
                 "chars": len(data),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1042,12 +1020,12 @@ class MathSymbolsBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.mathematical_symbols()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "math_symbols": {
                 "chars": len(data),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1063,13 +1041,13 @@ class CompilerOutputBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.compiler_output()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "compiler_output": {
                 "lines": data.count('\n'),
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1083,13 +1061,13 @@ class LogOutputBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.log_output()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "log_output": {
                 "lines": data.count('\n'),
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1103,13 +1081,13 @@ class GitDiffBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.git_diff_output()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "git_diff": {
                 "lines": data.count('\n'),
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1123,13 +1101,13 @@ class HtopSimulationBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.htop_simulation()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "htop_simulation": {
                 "lines": data.count('\n'),
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1143,13 +1121,13 @@ class VimSimulationBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.vim_screen_simulation()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "vim_simulation": {
                 "lines": data.count('\n'),
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1163,12 +1141,12 @@ class MixedWorkloadBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         data = DataGenerator.mixed_workload()
-        timings = self._time_cat(data)
+        sample = self._time_output(data)
 
         result.metrics = {
             "mixed_workload": {
                 "bytes": len(data.encode()),
-                "time_ms_mean": statistics.mean(timings),
+                **sample.stats("time_ms"),
             }
         }
         return result
@@ -1185,6 +1163,7 @@ class MemoryBenchmark(BaseBenchmark):
 
         process_patterns = {
             "bossterm": ["java", "BossTerm"],
+            "bossterm-headless": ["java", "BossTerm"],
             "iterm2": ["iTerm2"],
             "terminal": ["Terminal"],
             "alacritty": ["alacritty"],
@@ -1222,32 +1201,22 @@ class CPUBenchmark(BaseBenchmark):
         result = self._create_result(terminal)
 
         # Measure CPU during heavy output
-        data = DataGenerator.random_ascii(10 * 1024 * 1024).decode()
+        data = DataGenerator.random_ascii(10 * 1024 * 1024)
 
-        with tempfile.NamedTemporaryFile(delete=False, mode='w') as f:
-            f.write(data)
-            temp_file = f.name
+        # Sample CPU before
+        cpu_before = psutil.cpu_percent(interval=0.5)
 
-        try:
-            # Sample CPU before
-            cpu_before = psutil.cpu_percent(interval=0.5)
-
-            # Run heavy output
-            start = time.perf_counter()
-            subprocess.run(['cat', temp_file], capture_output=True)
-            end = time.perf_counter()
+        # Run heavy output
+        output_time_ms = self.harness.time_output(data)
 
-            # Sample CPU after
-            cpu_after = psutil.cpu_percent(interval=0.5)
-
-            result.metrics = {
-                "cpu_before_percent": cpu_before,
-                "cpu_after_percent": cpu_after,
-                "output_time_ms": (end - start) * 1000,
-            }
-        finally:
-            os.unlink(temp_file)
+        # Sample CPU after
+        cpu_after = psutil.cpu_percent(interval=0.5)
 
+        result.metrics = {
+            "cpu_before_percent": cpu_before,
+            "cpu_after_percent": cpu_after,
+            "output_time_ms": output_time_ms,
+        }
         return result
 
 
@@ -1266,6 +1235,8 @@ class ReportGenerator:
             f"- **CPU:** {suite.cpu_info}",
             f"- **Memory:** {suite.memory_gb:.1f} GB",
             f"- **Date:** {suite.timestamp}",
+            f"- **Corpus seed:** {suite.seed}",
+            f"- **Sampling:** {suite.sampling}",
             f"",
         ]
 
@@ -1369,6 +1340,110 @@ class ReportGenerator:
 
         return '\n'.join(lines)
 
+    @staticmethod
+    def _headline(group: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """A metric group's rate (higher is better) or else its median time, with its interval"""
+        for key, value in group.items():
+            if f"{key}_ci_low" in group:
+                return {"name": key, "value": value, "ci_low": group[f"{key}_ci_low"],
+                        "ci_high": group[f"{key}_ci_high"], "higher_is_better": True}
+        if "time_ms_ci_low" in group:
+            return {"name": "time_ms", "value": group["time_ms_median"], "ci_low": group["time_ms_ci_low"],
+                    "ci_high": group["time_ms_ci_high"], "higher_is_better": False}
+        return None
+
+    @staticmethod
+    def _number(value: float) -> str:
+        if value == float("inf"):
+            return "∞"
+        if value >= 1e6:
+            return f"{value / 1e6:.2f}M"
+        if value >= 1e4:
+            return f"{value / 1e3:.0f}K"
+        if value >= 100:
+            return f"{value:,.0f}"
+        return f"{value:.3g}"
+
+    @staticmethod
+    def summary(suites: List[BenchmarkSuite]) -> str:
+        """Summary report: each metric's median and interval per terminal, and the winner's margin"""
+        policy = next((suite.sampling for suite in suites if suite.sampling), None)
+        lines = [
+            "# BossTerm Benchmark Summary",
+            "",
+            f"**Generated:** {datetime.now().isoformat()}",
+            f"**Terminals:** {', '.join(f'{s.terminal} ({s.os_info})' for s in suites)}",
+        ]
+        if policy:
+            lines.append(
+                f"**Sampling:** {policy['warmup']} warmup runs discarded; runs continue until the "
+                f"{policy['confidence']:.0%} bootstrap interval of the median is within "
+                f"{policy['target_width']:.0%} of it (at most {policy['max_runs']} runs or "
+                f"{policy['time_cap_sec']:g}s); outliers beyond a modified z-score of "
+                f"{policy['mad_threshold']:g} rejected"
+            )
+        lines.extend([
+            "",
+            "Cells are the median with its interval in parentheses. The margin compares the winner "
+            "with the runner-up; its bounds pair the worst case of one interval with the best case "
+            "of the other. A margin whose bounds include 0 is marked ≈: no clear winner.",
+            "",
+        ])
+        unsampled = [s.terminal for s in suites if s.sampling is None]
+        if unsampled:
+            lines.extend([f"> Results for {', '.join(unsampled)} predate sampling and have no intervals.", ""])
+
+        rows = {}
+        for suite in suites:
+            for result in suite.results:
+                for group_name, group in result.metrics.items():
+                    headline = ReportGenerator._headline(group) if isinstance(group, dict) else None
+                    if headline:
+                        key = (result.category, result.name, group_name, headline["name"])
+                        rows.setdefault(key, {})[suite.terminal] = headline
+
+        terminals = [suite.terminal for suite in suites]
+        for category in sorted({key[0] for key in rows}):
+            lines.extend([
+                f"## {category.title()}",
+                "",
+                f"| Benchmark | Metric | {' | '.join(terminals)} | Winner |",
+                f"|-----------|--------|{'|'.join(['------'] * len(terminals))}|--------|",
+            ])
+            for key in [k for k in rows if k[0] == category]:
+                _, name, group_name, metric = key
+                values = rows[key]
+                cells = []
+                for terminal in terminals:
+                    v = values.get(terminal)
+                    cells.append("N/A" if v is None else
+                                 f"{ReportGenerator._number(v['value'])} "
+                                 f"({ReportGenerator._number(v['ci_low'])}–{ReportGenerator._number(v['ci_high'])})")
+                winner = "-"
+                # A 0 ms median or bound (coarse clock, tiny workload) has no
+                # inverse and gives an infinite rate, so it can't be ranked
+                measurable = all(0 < v[k] < float("inf") for v in values.values()
+                                 for k in ("value", "ci_low", "ci_high"))
+                if len(values) > 1 and not measurable:
+                    winner = "n/a (below timer resolution)"
+                elif len(values) > 1:
+                    # Orient times so that higher is better, as margin() expects
+                    oriented = {}
+                    for terminal, v in values.items():
+                        if v["higher_is_better"]:
+                            oriented[terminal] = v
+                        else:
+                            oriented[terminal] = {"value": 1 / v["value"], "ci_low": 1 / v["ci_high"],
+                                                  "ci_high": 1 / v["ci_low"]}
+                    ranked = sorted(oriented, key=lambda t: oriented[t]["value"], reverse=True)
+                    gain, low, high = margin(oriented[ranked[0]], oriented[ranked[1]])
+                    winner = (f"{'≈ ' if low <= 0 else ''}{ranked[0]} {gain:+.0%} "
+                              f"({low:+.0%} to {high:+.0%}) vs {ranked[1]}")
+                lines.append(f"| {name} | {group_name} {metric} | {' | '.join(cells)} | {winner} |")
+            lines.append("")
+
+        return '\n'.join(lines)
+
 
 # === Main ===
 
@@ -1448,7 +1523,8 @@ def get_all_benchmarks() -> Dict[str, type]:
     }
 
 
-def run_benchmarks(terminal: str, benchmark_names: List[str], runs: int) -> BenchmarkSuite:
+def run_benchmarks(terminal: str, benchmark_names: List[str], runs: int,
+                   harness: TerminalHarness) -> BenchmarkSuite:
     """Run specified benchmarks"""
     cpu_info, memory_gb = get_system_info()
 
@@ -1458,7 +1534,9 @@ def run_benchmarks(terminal: str, benchmark_names: List[str], runs: int) -> Benc
         os_info=f"{platform.system()} {platform.release()} {platform.machine()}",
         cpu_info=cpu_info,
         memory_gb=memory_gb,
-        timestamp=datetime.now().isoformat()
+        timestamp=datetime.now().isoformat(),
+        seed=DataGenerator.corpus.seed,
+        sampling=BaseBenchmark.sampling.to_dict(),
     )
 
     all_benchmarks = get_all_benchmarks()
@@ -1467,7 +1545,7 @@ def run_benchmarks(terminal: str, benchmark_names: List[str], runs: int) -> Benc
         if name in all_benchmarks:
             print(f"  Running {name}...")
             bench_class = all_benchmarks[name]
-            bench = bench_class(runs=runs)
+            bench = bench_class(runs=runs, harness=harness)
             result = bench.run(terminal)
             suite.add_result(result)
         else:
@@ -1476,12 +1554,27 @@ def run_benchmarks(terminal: str, benchmark_names: List[str], runs: int) -> Benc
     return suite
 
 
+def load_latest_suites(output_dir: Path) -> List[BenchmarkSuite]:
+    """Newest saved JSON result of each terminal in output_dir"""
+    latest = {}
+    # Timestamps in the names sort chronologically
+    for path in sorted(output_dir.glob("*_comprehensive_*.json")):
+        try:
+            with open(path) as f:
+                suite = BenchmarkSuite.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+            continue
+        latest[suite.terminal] = suite
+    return list(latest.values())
+
+
 def clean_old_results(output_dir: Path):
     """Delete all old benchmark result files from output directory"""
     if not output_dir.exists():
         return
 
-    patterns = ["*_comprehensive_*.md", "*_comprehensive_*.json", "comparison_*.md", "BENCHMARK_SUMMARY.md"]
+    patterns = ["*_comprehensive_*.md", "*_comprehensive_*.json", "comparison_*.md"]
     deleted = 0
     for pattern in patterns:
         for f in output_dir.glob(pattern):
@@ -1497,22 +1590,47 @@ def clean_old_results(output_dir: Path):
 
 def main():
     parser = argparse.ArgumentParser(description="Comprehensive Terminal Benchmark Suite v2.0")
-    parser.add_argument("--terminal", "-t", default="all",
-                        help="Terminals to benchmark (comma-separated or 'all')")
+    parser.add_argument("--terminal", "-t", default=None,
+                        help="Name to file results under (default: detected from the environment); "
+                             "always measures the terminal this runs in")
     parser.add_argument("--benchmark", "-b", default="all",
                         help="Benchmarks to run (comma-separated, category name, or 'all')")
     parser.add_argument("--output", "-o", default="../benchmark_results",
                         help="Output directory (default: ../benchmark_results)")
     parser.add_argument("--runs", "-r", type=int, default=5,
-                        help="Number of runs per test")
+                        help="Minimum number of runs per measurement")
+    parser.add_argument("--warmup", type=int, default=SamplingPolicy.warmup,
+                        help=f"Runs discarded before each measurement (default: {SamplingPolicy.warmup})")
+    parser.add_argument("--max-runs", type=int, default=SamplingPolicy.max_runs,
+                        help=f"Most runs per measurement (default: {SamplingPolicy.max_runs})")
+    parser.add_argument("--target-ci", type=float, default=SamplingPolicy.target_width,
+                        help="Stop once the 95%% interval of the median is this fraction of it wide "
+                             f"(default: {SamplingPolicy.target_width})")
+    parser.add_argument("--time-cap", type=float, default=SamplingPolicy.time_cap_sec,
+                        help=f"Most seconds per measurement (default: {SamplingPolicy.time_cap_sec:g})")
     parser.add_argument("--json", action="store_true",
                         help="Also output JSON")
     parser.add_argument("--compare", action="store_true",
-                        help="Generate comparison report")
+                        help="Generate comparison report from each terminal's newest saved JSON "
+                             "(implies --json; use --no-clean to keep earlier terminals' results)")
     parser.add_argument("--list", action="store_true",
                         help="List available benchmarks")
     parser.add_argument("--no-clean", action="store_true",
                         help="Don't delete old benchmark results before running")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Measure a headless session of the running BossTerm daemon "
+                             "instead of this terminal (no display needed)")
+    parser.add_argument("--daemon-dir", type=Path, default=None,
+                        help="Settings directory of the daemon to use (default: ~/.bossterm)")
+    parser.add_argument("--size", default="80x24",
+                        help="Grid of the headless session, COLSxROWS (default: 80x24)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Seed for generated workloads (default: {DEFAULT_SEED})")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Cache for generated workloads (default: ~/.cache/bossterm-benchmark/corpus)")
+    parser.add_argument("--throughput-mb", default=None,
+                        help="Comma-separated throughput_raw sizes in MB, e.g. 1,50,1024 "
+                             "(default: 1,5,10,25,50)")
 
     args = parser.parse_args()
 
@@ -1533,11 +1651,21 @@ def main():
                 print(f"    - {name}")
         return
 
-    # Determine terminals
-    if args.terminal == "all":
-        terminals = detect_terminals()
-    else:
-        terminals = [t.strip() for t in args.terminal.split(",")]
+    try:
+        cols, rows = (int(n) for n in args.size.lower().split("x"))
+    except ValueError:
+        parser.error(f"--size must be COLSxROWS, got {args.size}")
+
+    # The harness can only measure the terminal it runs in
+    detected = "bossterm-headless" if args.daemon else current_terminal()
+    terminal = args.terminal or detected or "unknown"
+    if terminal == "all" or "," in terminal:
+        print(f"Error: each run measures the terminal it runs in. Run this inside each of "
+              f"{', '.join(detect_terminals()) or 'the terminals'} with --json --no-clean, "
+              f"then --compare.", file=sys.stderr)
+        sys.exit(2)
+    if detected and terminal != detected:
+        print(f"Warning: running in {detected}; results are filed under {terminal}")
 
     # Determine benchmarks
     if args.benchmark == "all":
@@ -1555,9 +1683,22 @@ def main():
             else:
                 print(f"Warning: Unknown benchmark or category: {b}")
 
-    print(f"Terminals: {terminals}")
+    DataGenerator.corpus = Corpus(args.seed, args.corpus_dir)
+    BaseBenchmark.sampling = SamplingPolicy(
+        warmup=args.warmup, max_runs=args.max_runs, target_width=args.target_ci,
+        time_cap_sec=args.time_cap, seed=args.seed,
+    )
+    if args.throughput_mb:
+        try:
+            ThroughputRawBenchmark.sizes_mb = [int(n) for n in args.throughput_mb.split(",")]
+        except ValueError:
+            parser.error(f"--throughput-mb must be comma-separated whole MB, got {args.throughput_mb}")
+
+    print(f"Terminal: {terminal}")
     print(f"Benchmarks: {len(benchmark_names)} tests")
-    print(f"Runs per test: {args.runs}")
+    print(f"Runs per measurement: {args.runs} to {max(args.runs, args.max_runs)} after {args.warmup} warmup, "
+          f"until the median's interval is within {args.target_ci:.0%}")
+    print(f"Corpus: seed {args.seed}, cached in {DataGenerator.corpus.cache_dir}")
     print()
 
     output_dir = Path(args.output)
@@ -1567,29 +1708,39 @@ def main():
     if not args.no_clean:
         clean_old_results(output_dir)
 
-    suites = []
-    for terminal in terminals:
-        print(f"\nBenchmarking {terminal}...")
-        suite = run_benchmarks(terminal, benchmark_names, args.runs)
-        suites.append(suite)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        # Save markdown
-        md_file = output_dir / f"{terminal}_comprehensive_{timestamp}.md"
-        with open(md_file, 'w') as f:
-            f.write(ReportGenerator.to_markdown(suite))
-        print(f"  Saved: {md_file}")
-
-        # Save JSON if requested
-        if args.json:
-            json_file = output_dir / f"{terminal}_comprehensive_{timestamp}.json"
-            with open(json_file, 'w') as f:
-                json.dump(suite.to_dict(), f, indent=2)
-            print(f"  Saved: {json_file}")
+    print(f"\nBenchmarking {terminal}...")
+    try:
+        if args.daemon:
+            harness = DaemonHarness(args.daemon_dir, cols=cols, rows=rows)
+        else:
+            harness = TerminalHarness()
+        with harness:
+            suite = run_benchmarks(terminal, benchmark_names, args.runs, harness)
+    except TerminalUnavailable as e:
+        hint = "Start the BossTerm daemon first" if args.daemon else "Run this inside the terminal under test"
+        print(f"Error: {e}. {hint}.", file=sys.stderr)
+        sys.exit(1)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Save markdown
+    md_file = output_dir / f"{terminal}_comprehensive_{timestamp}.md"
+    with open(md_file, 'w') as f:
+        f.write(ReportGenerator.to_markdown(suite))
+    print(f"  Saved: {md_file}")
+
+    # Save JSON if requested
+    if args.json or args.compare:
+        json_file = output_dir / f"{terminal}_comprehensive_{timestamp}.json"
+        with open(json_file, 'w') as f:
+            json.dump(suite.to_dict(), f, indent=2)
+        print(f"  Saved: {json_file}")
 
     # Generate comparison
-    if args.compare and len(suites) > 1:
+    suites = load_latest_suites(output_dir) if args.compare else []
+    if args.compare and len(suites) < 2:
+        print("\nNothing to compare yet: run this inside another terminal with --compare --no-clean")
+    if len(suites) > 1:
         print("\nGenerating comparison report...")
         comparison = ReportGenerator.compare_terminals(suites)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1597,6 +1748,11 @@ def main():
         with open(comparison_file, 'w') as f:
             f.write(comparison)
         print(f"Saved: {comparison_file}")
+        # Not BENCHMARK_SUMMARY.md: that one is written by hand
+        summary_file = output_dir / f"summary_comprehensive_{timestamp}.md"
+        with open(summary_file, 'w') as f:
+            f.write(ReportGenerator.summary(suites))
+        print(f"Saved: {summary_file}")
 
     print("\nBenchmarks complete!")
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+MCP Client Throughput Benchmark
+Measures bossterm-mcp.py against the stand-in server in mcp_fake_server.py
+
+Starts the fake server on a free port, then measures:
+
+    handshake    session open through `initialize`, per new session (ms)
+    one-shot     `bossterm-mcp.py call` per process, as `bossterm` runs it (calls/s)
+    batched      one `call-batch` process fed JSONL on stdin (calls/s)
+    persistent   one in-process session, serial and concurrent calls (calls/s)
+    payload      one large tool response over a persistent session (MB/s)
+
+Set --latency-ms to model a busy BossTerm; the default of 0 measures
+pure client and transport overhead. --transport pins the helper to
+Streamable HTTP or SSE (via $BOSSTERM_MCP_TRANSPORT) to compare the two.
+
+Usage:
+    python3 benchmark_mcp_client.py [options]
+
+Options:
+    --calls <n>          Calls per throughput measurement (default: 500)
+    --one-shot <n>       Processes for the one-shot mode (default: 20)
+    --handshakes <n>     Sessions opened for the handshake mode (default: 50)
+    --payload-mb <mb>    Size of the large-payload response (default: 8)
+    --latency-ms <ms>    Server-side delay per tool call (default: 0)
+    --tool <name>        Tool for throughput modes (default: list_tabs)
+    --transport <mode>   auto, streamable or sse (default: auto)
+    --json               Output results as JSON
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+HELPER_PATH = BENCH_DIR.parent / "cli-resources" / "bossterm-mcp.py"
+CLI_PATH = HELPER_PATH.parent / "bossterm"
+FAKE_SERVER_PATH = BENCH_DIR / "mcp_fake_server.py"
+
+
+def load_helper():
+    """Import cli-resources/bossterm-mcp.py (hyphenated, so not importable by name)."""
+    spec = importlib.util.spec_from_file_location("bossterm_mcp_helper", HELPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def helper_loader() -> str:
+    """The `python3 -c` program the bash CLI runs the helper with ($MCP_HELPER_LOADER)."""
+    match = re.search(r"^MCP_HELPER_LOADER='(.*?)'$", CLI_PATH.read_text(), re.M | re.S)
+    if match is None:
+        raise RuntimeError(f"MCP_HELPER_LOADER not found in {CLI_PATH}")
+    return match.group(1)
+
+
+def start_fake_server(latency_ms: float) -> "tuple[subprocess.Popen, int]":
+    """Run the fake server in its own process so it doesn't share our GIL."""
+    proc = subprocess.Popen(
+        [sys.executable, str(FAKE_SERVER_PATH), "--port", "0", "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"fake server failed to start: {line!r}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def helper_env() -> Dict[str, str]:
+    # Measure the direct path: a resident broker would hide the handshake.
+    return dict(os.environ, BOSSTERM_MCP_NO_BROKER="1")
+
+
+# === Modes ===
+
+def bench_handshake(helper, port: int, count: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        session = helper.McpSession(port)
+        samples.append((time.perf_counter() - start) * 1000)
+        session.close()
+    return {"p50_ms": statistics.median(samples), "p95_ms": percentile(samples, 95)}
+
+
+def bench_one_shot(port: int, count: int, tool: str) -> Dict[str, float]:
+    command = [sys.executable, "-c", helper_loader(), str(HELPER_PATH), "call", str(port), tool, "{}"]
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run(command, env=helper_env(), stdout=subprocess.DEVNULL, check=True)
+    elapsed = time.perf_counter() - start
+    return {"calls_per_sec": count / elapsed, "ms_per_call": elapsed * 1000 / count}
+
+
+def bench_batched(port: int, count: int, tool: str) -> Dict[str, float]:
+    records = "".join(json.dumps({"tool": tool, "args": {}}) + "\n" for _ in range(count))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(HELPER_PATH), "call-batch", str(port)],
+        input=records, text=True, env=helper_env(), stdout=subprocess.DEVNULL, check=True,
+    )
+    elapsed = time.perf_counter() - start
+    return {"calls_per_sec": count / elapsed, "ms_per_call": elapsed * 1000 / count}
+
+
+def bench_persistent(helper, port: int, count: int, tool: str) -> Dict[str, float]:
+    session = helper.McpSession(port)
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            session.call(tool, {})
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for future in [session.submit(tool, {}) for _ in range(count)]:
+            future.result()
+        concurrent = time.perf_counter() - start
+    finally:
+        session.close()
+    return {"serial_calls_per_sec": count / serial, "concurrent_calls_per_sec": count / concurrent}
+
+
+def bench_payload(helper, port: int, megabytes: float) -> Dict[str, float]:
+    size = int(megabytes * 1024 * 1024)
+    session = helper.McpSession(port)
+    try:
+        session.call("payload", {"bytes": 1024})  # warm the POST connection
+        start = time.perf_counter()
+        result = session.call("payload", {"bytes": size}, timeout=120)
+        elapsed = time.perf_counter() - start
+    finally:
+        session.close()
+    received = len(helper.tool_result_text(result))
+    return {"mb_per_sec": received / (1024 * 1024) / elapsed, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP Client Throughput Benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--one-shot", type=int, default=20)
+    parser.add_argument("--handshakes", type=int, default=50)
+    parser.add_argument("--payload-mb", type=float, default=8.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--tool", default="list_tabs")
+    parser.add_argument("--transport", choices=("auto", "streamable", "sse"), default="auto")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    # Read by the helper on every session open, in-process and in the
+    # subprocesses (helper_env copies os.environ).
+    os.environ["BOSSTERM_MCP_TRANSPORT"] = args.transport
+
+    helper = load_helper()
+    server, port = start_fake_server(args.latency_ms)
+    try:
+        results = {
+            "handshake": bench_handshake(helper, port, args.handshakes),
+            "one_shot": bench_one_shot(port, args.one_shot, args.tool),
+            "batched": bench_batched(port, args.calls, args.tool),
+            "persistent": bench_persistent(helper, port, args.calls, args.tool),
+            "payload": bench_payload(helper, port, args.payload_mb),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps({
+            "tool": args.tool,
+            "transport": args.transport,
+            "latency_ms": args.latency_ms,
+            "calls": args.calls,
+            "results": results,
+        }, indent=2))
+        return 0
+
+    r = results
+    print(f"Fake server on 127.0.0.1:{port}, tool={args.tool}, "
+          f"transport={args.transport}, latency={args.latency_ms:g} ms")
+    print(f"{'mode':<24} {'result':>16}")
+    print(f"{'handshake p50':<24} {r['handshake']['p50_ms']:>13.2f} ms")
+    print(f"{'handshake p95':<24} {r['handshake']['p95_ms']:>13.2f} ms")
+    print(f"{'one-shot':<24} {r['one_shot']['calls_per_sec']:>10.1f} calls/s")
+    print(f"{'batched':<24} {r['batched']['calls_per_sec']:>10.1f} calls/s")
+    print(f"{'persistent (serial)':<24} {r['persistent']['serial_calls_per_sec']:>10.1f} calls/s")
+    print(f"{'persistent (concurrent)':<24} {r['persistent']['concurrent_calls_per_sec']:>10.1f} calls/s")
+    print(f"{f'payload ({args.payload_mb:g} MB)':<24} {r['payload']['mb_per_sec']:>13.1f} MB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+MCP SSE Parser Micro-Benchmark
+Measures how fast bossterm-mcp.py turns raw SSE bytes into JSON-RPC responses
+
+Feeds a synthetic stream of `read_scrollback`-sized responses, cut into
+socket-sized chunks, through two implementations:
+
+    legacy   the line-based parser the helper used before: decode every line
+             to str, join data lines, json.loads every message to find its id
+    current  the helper's SseParser (bytes/memoryview framing) plus peek_id,
+             decoding only the messages someone is waiting for
+
+No server or network involved; this is pure CPU cost of the client.
+
+Usage:
+    python3 benchmark_mcp_sse.py [options]
+
+Options:
+    --messages <n>       Responses in the stream (default: 50)
+    --lines <n>          Scrollback lines per response (default: 20000)
+    --chunk <bytes>      Read size the stream is cut into (default: 16384)
+    --awaited <0..1>     Fraction of responses with a waiter (default: 1.0)
+    --runs <n>           Runs per measurement; the best is reported (default: 5)
+    --json               Output results as JSON
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+HELPER_PATH = Path(__file__).resolve().parent.parent / "cli-resources" / "bossterm-mcp.py"
+
+
+def load_helper():
+    """Import cli-resources/bossterm-mcp.py (hyphenated, so not importable by name)."""
+    spec = importlib.util.spec_from_file_location("bossterm_mcp_helper", HELPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# === Baseline ===
+
+class LegacySseParser:
+    """The pre-bytes parser, kept verbatim as the benchmark baseline."""
+
+    def __init__(self):
+        self._buffer = b""
+        self._event = "message"
+        self._data: List[str] = []
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str]]:
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        events = []
+        for raw in lines:
+            line = raw.rstrip(b"\r").decode("utf-8", errors="replace")
+            if line == "":
+                if self._data:
+                    events.append((self._event, "\n".join(self._data)))
+                self._event = "message"
+                self._data = []
+            elif line.startswith(":"):
+                continue
+            elif line.startswith("event:"):
+                self._event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                self._data.append(line[len("data:"):].lstrip())
+        return events
+
+
+# === Workload ===
+
+def build_stream(messages: int, lines: int) -> bytes:
+    """SSE bytes for `messages` tools/call responses carrying `lines` each."""
+    payload = json.dumps({
+        "lines": [f"{i:6d}  build step {i % 97}: compiling module_{i % 311}.kt" for i in range(lines)],
+        "totalAvailable": lines,
+    })
+    parts = [b"event: endpoint\r\ndata: /?sessionId=bench\r\n\r\n"]
+    for request_id in range(2, messages + 2):
+        message = json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": {"content": [{"type": "text", "text": payload}]},
+        })
+        parts.append(b"event: message\r\ndata: " + message.encode("utf-8") + b"\r\n\r\n")
+    return b"".join(parts)
+
+
+def chunked(stream: bytes, size: int) -> List[bytes]:
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+# === Runners ===
+
+def run_legacy(chunks: List[bytes], awaited: set, decode: bool) -> int:
+    parser = LegacySseParser()
+    delivered = 0
+    for chunk in chunks:
+        for event, data in parser.feed(chunk):
+            if not decode or event != "message":
+                continue
+            msg = json.loads(data)
+            if msg.get("id") in awaited:
+                delivered += 1
+    return delivered
+
+
+def run_current(helper, chunks: List[bytes], awaited: set, decode: bool) -> int:
+    parser = helper.SseParser()
+    delivered = 0
+    for chunk in chunks:
+        for event, data in parser.feed(chunk):
+            if not decode or event != "message":
+                continue
+            if helper.peek_id(data) in awaited:
+                json.loads(data)
+                delivered += 1
+    return delivered
+
+
+def best_of(runs: int, fn: Callable[[], int]) -> Tuple[float, int]:
+    best = float("inf")
+    delivered = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        delivered = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, delivered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP SSE Parser Micro-Benchmark")
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--chunk", type=int, default=16384)
+    parser.add_argument("--awaited", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    helper = load_helper()
+    stream = build_stream(args.messages, args.lines)
+    chunks = chunked(stream, args.chunk)
+    awaited = set(range(2, 2 + round(args.messages * args.awaited)))
+    megabytes = len(stream) / (1024 * 1024)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, runner in (
+        ("legacy", lambda decode: run_legacy(chunks, awaited, decode)),
+        ("current", lambda decode: run_current(helper, chunks, awaited, decode)),
+    ):
+        framing, _ = best_of(args.runs, lambda: runner(False))
+        total, delivered = best_of(args.runs, lambda: runner(True))
+        results[name] = {
+            "framing_mb_s": megabytes / framing,
+            "dispatch_mb_s": megabytes / total,
+            "delivered": delivered,
+        }
+
+    if args.json:
+        print(json.dumps({
+            "stream_mb": megabytes,
+            "messages": args.messages,
+            "awaited": len(awaited),
+            "results": results,
+        }, indent=2))
+        return 0
+
+    print(f"Stream: {megabytes:.1f} MB, {args.messages} responses, "
+          f"{len(awaited)} awaited, {args.chunk}-byte reads")
+    print(f"{'parser':<10} {'framing MB/s':>14} {'framing+dispatch MB/s':>24}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['framing_mb_s']:>14.1f} {r['dispatch_mb_s']:>24.1f}")
+    speedup = results["current"]["dispatch_mb_s"] / results["legacy"]["dispatch_mb_s"]
+    print(f"\nframing+dispatch speedup: {speedup:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+MCP Helper Cold-Start Benchmark
+Measures how long bossterm-mcp.py takes to start, run as the `bossterm` CLI runs it
+
+The CLI starts a fresh helper process for every command (usually `discover`
+or `ping`, then `call`) and for every <Tab> completion, so the helper's
+startup is paid several times per command. Each case below is timed as a
+whole process, launched through the CLI's bytecode-caching loader
+($MCP_HELPER_LOADER, read from cli-resources/bossterm), against the fake
+server in mcp_fake_server.py and with no broker:
+
+    complete     `complete tabs`, from a fresh completion cache
+    ping         `ping <port>`
+    discover     `discover`, with the port marker naming the fake server
+    call         `call <port> list_tabs {}`
+
+For each case it reports the median and fastest wall time, its overhead
+(what the helper itself costs: the median, over runs, of the run's time
+minus that of a bare `python3 -c pass` run just before it, in ms and as a
+multiple of the bare run), and, from a `python3 -X importtime` run, the
+import time the helper adds on top of a bare interpreter and its costliest
+top-level imports.
+
+The budget is on the overhead relative to a bare interpreter, not on wall
+time: both scale with how fast the machine is (and with how busy it is at
+the moment, which is why each run is paired with its own bare run), while
+the ratio stays put.
+
+Exit status is 1 when a case's overhead exceeds the budget, or when it
+imports a module from DEFERRED_MODULES (those are for the subcommands that
+need them, e.g. asyncio for SSE, fanout and follow).
+
+Usage:
+    python3 benchmark_startup.py [options]
+
+Options:
+    --runs <n>           Timed runs per case (default: 20)
+    --budget <x>         Largest acceptable overhead per case, as a multiple
+                         of a bare interpreter's startup (default: 2.5)
+    --json               Output results as JSON
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmark_mcp_client import HELPER_PATH, helper_loader, start_fake_server
+
+# Modules none of the cases may import: each costs milliseconds at startup.
+DEFERRED_MODULES = (
+    "asyncio", "argparse", "ssl", "concurrent.futures", "logging", "subprocess",
+    "urllib.parse", "typing",
+)
+
+
+def helper_command(loader: str, *args: str) -> List[str]:
+    return [sys.executable, "-c", loader, str(HELPER_PATH), *args]
+
+
+def timed_run(command: List[str], env: Dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def timed_runs(command: List[str], env: Dict[str, str], runs: int) -> List[float]:
+    return [timed_run(command, env) for _ in range(runs)]
+
+
+def import_times(command: List[str], env: Dict[str, str]) -> Dict[str, Tuple[float, bool]]:
+    """Per imported module: cumulative ms, and whether it was a top-level import."""
+    stderr = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    ).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        fields = line.partition("import time:")[2].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2][1:]  # one space of padding before the indent
+        modules[name.strip()] = (int(fields[1]) / 1000, not name.startswith(" "))
+    return modules
+
+
+def bench_case(command: List[str], env: Dict[str, str], runs: int, bare: List[str],
+               baseline: Dict[str, Tuple[float, bool]]) -> Dict[str, object]:
+    subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    samples, overheads, ratios = [], [], []
+    for _ in range(runs):
+        bare_ms = timed_run(bare, env)
+        samples.append(timed_run(command, env))
+        overheads.append(samples[-1] - bare_ms)
+        ratios.append(overheads[-1] / bare_ms)
+    modules = import_times(command, env)
+    added = {
+        name: ms for name, (ms, top_level) in modules.items()
+        if top_level and name not in baseline
+    }
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "overhead_ms": statistics.median(overheads),
+        "overhead_x": statistics.median(ratios),
+        "import_ms": sum(added.values()),
+        "slowest_imports": sorted(added.items(), key=lambda item: -item[1])[:5],
+        "deferred_imported": [name for name in DEFERRED_MODULES if name in modules],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP Helper Cold-Start Benchmark")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=2.5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    loader = helper_loader()
+    home = tempfile.TemporaryDirectory(prefix="bossterm-startup-")
+    env = dict(os.environ, HOME=home.name, BOSSTERM_MCP_NO_BROKER="1")
+    # The point is the cached path; a first run in each case warms it.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("BOSSTERM_MCP_PORT", None)
+    server, port = start_fake_server(0.0)
+    try:
+        os.makedirs(os.path.join(home.name, ".bossterm"))
+        with open(os.path.join(home.name, ".bossterm", "mcp.port"), "w") as f:
+            f.write(f"{port}\n")
+        bare = [sys.executable, "-c", "pass"]
+        baseline = import_times(bare, env)
+        cases = {
+            "complete": helper_command(loader, "complete", "tabs"),
+            "ping": helper_command(loader, "ping", str(port)),
+            "discover": helper_command(loader, "discover"),
+            "call": helper_command(loader, "call", str(port), "list_tabs", "{}"),
+        }
+        samples = timed_runs(bare, env, args.runs)
+        results = {"python": {"median_ms": statistics.median(samples), "min_ms": min(samples)}}
+        for name, command in cases.items():
+            if name == "complete":
+                # Fresh for its TTL, so no run starts a background refresh.
+                subprocess.run(helper_command(loader, "refresh-cache", str(port)), env=env, check=True)
+            results[name] = bench_case(command, env, args.runs, bare, baseline)
+    finally:
+        server.terminate()
+        server.wait()
+        home.cleanup()
+
+    failures = []
+    for name in cases:
+        r = results[name]
+        if r["overhead_x"] > args.budget:
+            failures.append(f"{name}: overhead {r['overhead_ms']:.1f} ms is "
+                            f"{r['overhead_x']:.1f}x a bare interpreter, over the "
+                            f"{args.budget:g}x budget")
+        if r["deferred_imported"]:
+            failures.append(f"{name}: imports {', '.join(r['deferred_imported'])} at startup")
+
+    if args.json:
+        print(json.dumps({
+            "budget_x": args.budget,
+            "runs": args.runs,
+            "results": results,
+            "failures": failures,
+        }, indent=2))
+    else:
+        print(f"Fake server on 127.0.0.1:{port}, {args.runs} runs per case, "
+              f"overhead budget {args.budget:g}x")
+        print(f"{'case':<10} {'median':>9} {'min':>9} {'overhead':>16} {'imports':>9}  slowest imports")
+        print(f"{'python':<10} {results['python']['median_ms']:>6.1f} ms "
+              f"{results['python']['min_ms']:>6.1f} ms")
+        for name in cases:
+            r = results[name]
+            slowest = ", ".join(f"{module} {ms:.1f}" for module, ms in r["slowest_imports"])
+            print(f"{name:<10} {r['median_ms']:>6.1f} ms {r['min_ms']:>6.1f} ms "
+                  f"{r['overhead_ms']:>6.1f} ms {r['overhead_x']:>4.1f}x "
+                  f"{r['import_ms']:>6.1f} ms  {slowest}")
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
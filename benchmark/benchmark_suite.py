@@ -3,33 +3,43 @@
 Terminal Emulator Benchmark Suite
 Comprehensive benchmarking for BossTerm vs iTerm2 and other terminals
 
+Workloads are written to the terminal this script runs in and timed until
+the terminal has parsed them (terminal_harness.py), so run it inside the
+terminal under test, once per terminal. Each timing is sampled adaptively,
+with warmup, outlier rejection and a bootstrap interval (sampling.py).
+
 Usage:
     python3 benchmark_suite.py [options]
 
 Options:
-    --terminal <name>    Terminal to benchmark (bossterm, iterm2, terminal, alacritty, all)
+    --terminal <name>    Name to file results under (default: detected; bossterm, iterm2, ...)
     --benchmark <name>   Specific benchmark to run (throughput, latency, unicode, rendering, all)
     --output <dir>       Output directory for results
-    --runs <n>           Number of runs per test (default: 5)
+    --runs <n>           Minimum number of runs per measurement (default: 5)
+    --warmup <n>         Runs discarded before each measurement (default: 2)
+    --max-runs <n>       Most runs per measurement (default: 30)
+    --target-ci <f>      Stop once the median's 95% interval is this fraction of it wide (default: 0.05)
+    --time-cap <sec>     Most seconds per measurement (default: 20)
     --json               Output results as JSON
-    --compare            Compare results across terminals
+    --compare            Compare each terminal's newest saved JSON result (implies --json)
 """
 
 import argparse
 import json
-import os
 import platform
 import re
 import shutil
-import statistics
 import subprocess
 import sys
-import tempfile
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from terminal_harness import TerminalHarness, TerminalUnavailable, current_terminal
+from workload_corpus import Corpus, DEFAULT_SEED, Payload
+from sampling import Sample, SamplingPolicy, measure
 
 
 # === Data Classes ===
@@ -43,29 +53,35 @@ class BenchmarkResult:
     metrics: Dict[str, Any] = field(default_factory=dict)
     raw_data: List[float] = field(default_factory=list)
 
-    def add_timing(self, values: List[float], unit: str = "ms"):
-        self.raw_data = values
-        self.metrics = {
-            "min": min(values),
-            "max": max(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "stdev": statistics.stdev(values) if len(values) > 1 else 0,
-            "p95": sorted(values)[int(len(values) * 0.95)] if len(values) >= 20 else max(values),
-            "p99": sorted(values)[int(len(values) * 0.99)] if len(values) >= 100 else max(values),
-            "unit": unit
-        }
+    def add_timing(self, sample: Sample):
+        """Record a timing in ms; percentiles the runs can't support are None, not max"""
+        self.raw_data = sample.values
+        self.metrics = timing_stats(sample)
 
     def to_dict(self) -> Dict:
         return asdict(self)
 
 
+def timing_stats(sample: Sample) -> Dict[str, Any]:
+    """Median and interval, extremes and tail percentiles of a timing in ms"""
+    return {
+        **sample.stats("time_ms"),
+        "min_ms": min(sample.values),
+        "max_ms": max(sample.values),
+        "p90_ms": sample.percentile(90),
+        "p95_ms": sample.percentile(95),
+        "p99_ms": sample.percentile(99),
+    }
+
+
 @dataclass
 class BenchmarkSuite:
     terminal: str
     host: str
     os_info: str
     timestamp: str
+    seed: Optional[int] = None  # corpus seed; None for results from before seeding
+    sampling: Optional[Dict[str, Any]] = None  # SamplingPolicy; None for fixed-run results
     results: List[BenchmarkResult] = field(default_factory=list)
 
     def add_result(self, result: BenchmarkResult):
@@ -77,21 +93,28 @@ class BenchmarkSuite:
             "host": self.host,
             "os_info": self.os_info,
             "timestamp": self.timestamp,
+            "seed": self.seed,
+            "sampling": self.sampling,
             "results": [r.to_dict() for r in self.results]
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BenchmarkSuite":
+        results = [BenchmarkResult(**r) for r in data.get("results", [])]
+        return cls(**{**data, "results": results})
+
 
 # === Test Data Generation ===
 
 class DataGenerator:
-    """Generates test data for benchmarks"""
+    """Generates test data for benchmarks, seeded and cached by `corpus`"""
+
+    corpus = Corpus()
 
     @staticmethod
-    def random_ascii(size_bytes: int) -> bytes:
+    def random_ascii(size_bytes: int) -> Payload:
         """Generate random printable ASCII"""
-        import random
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        return ''.join(random.choice(chars) for _ in range(size_bytes)).encode()
+        return DataGenerator.corpus.random_ascii(size_bytes)
 
     @staticmethod
     def lines(count: int, line_length: int = 80) -> str:
@@ -160,9 +183,9 @@ class DataGenerator:
     def ansi_truecolor() -> str:
         """ANSI escape sequences with 24-bit truecolor"""
         result = []
-        import random
+        rng = DataGenerator.corpus.rng("ansi_truecolor")
         for _ in range(1000):
-            r, g, b = random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
+            r, g, b = rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)
             result.append(f"\033[38;2;{r};{g};{b}m█\033[0m")
         return ''.join(result)
 
@@ -184,11 +207,22 @@ class DataGenerator:
 
 # === Benchmarks ===
 
-class ThroughputBenchmark:
+class BaseBenchmark:
+    """Shared sampling for the benchmarks below"""
+    # Warmup and stopping rule for every measurement; `runs` is the minimum.
+    sampling = SamplingPolicy()
+
+    def _measure(self, run: Callable[[], float]) -> Sample:
+        """Sample run() (ms) under the sampling policy, for at least self.runs runs"""
+        return measure(run, self.sampling, self.runs)
+
+
+class ThroughputBenchmark(BaseBenchmark):
     """Measures terminal throughput (MB/s)"""
 
-    def __init__(self, runs: int = 5):
+    def __init__(self, runs: int = 5, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
         self.data_sizes_mb = [1, 5, 10, 25]
 
     def run(self, terminal: str) -> BenchmarkResult:
@@ -201,39 +235,23 @@ class ThroughputBenchmark:
 
         metrics = {}
         for size_mb in self.data_sizes_mb:
-            timings = []
             data = DataGenerator.random_ascii(size_mb * 1024 * 1024)
-
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                f.write(data)
-                temp_file = f.name
-
-            try:
-                for _ in range(self.runs):
-                    start = time.perf_counter()
-                    subprocess.run(['cat', temp_file], capture_output=True)
-                    end = time.perf_counter()
-                    timings.append(end - start)
-
-                throughput_mbps = [size_mb / t for t in timings]
-                metrics[f"{size_mb}MB"] = {
-                    "throughput_mbps_mean": statistics.mean(throughput_mbps),
-                    "throughput_mbps_stdev": statistics.stdev(throughput_mbps) if len(throughput_mbps) > 1 else 0,
-                    "time_seconds_mean": statistics.mean(timings),
-                    "time_seconds_stdev": statistics.stdev(timings) if len(timings) > 1 else 0,
-                }
-            finally:
-                os.unlink(temp_file)
+            sample = self._measure(lambda: self.harness.time_output(data))
+            metrics[f"{size_mb}MB"] = {
+                **sample.rate(size_mb, "throughput_mbps"),
+                **sample.stats("time_ms"),
+            }
 
         result.metrics = metrics
         return result
 
 
-class LatencyBenchmark:
-    """Measures command execution latency"""
+class LatencyBenchmark(BaseBenchmark):
+    """Measures output latency: a short write until the terminal has parsed it"""
 
-    def __init__(self, runs: int = 100):
+    def __init__(self, runs: int = 100, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = BenchmarkResult(
@@ -243,49 +261,28 @@ class LatencyBenchmark:
             runs=self.runs
         )
 
-        # Echo latency
-        echo_latencies = []
-        for _ in range(self.runs):
-            start = time.perf_counter_ns()
-            subprocess.run(['echo', 'x'], capture_output=True)
-            end = time.perf_counter_ns()
-            echo_latencies.append((end - start) / 1_000_000)  # ns to ms
+        # Echo latency (what `echo x` prints)
+        echo = self._measure(lambda: self.harness.time_output(b"x\n", reset=False))
 
         # Printf latency (longer output)
-        printf_latencies = []
-        for _ in range(self.runs):
-            start = time.perf_counter_ns()
-            subprocess.run(['printf', '%s\n', 'x' * 80], capture_output=True)
-            end = time.perf_counter_ns()
-            printf_latencies.append((end - start) / 1_000_000)
+        line = b"x" * 80 + b"\n"
+        printf = self._measure(lambda: self.harness.time_output(line, reset=False))
 
         result.metrics = {
-            "echo": self._calc_stats(echo_latencies),
-            "printf_80chars": self._calc_stats(printf_latencies),
+            "echo": timing_stats(echo),
+            "printf_80chars": timing_stats(printf),
         }
-        result.raw_data = echo_latencies
+        result.raw_data = echo.values
 
         return result
 
-    @staticmethod
-    def _calc_stats(values: List[float]) -> Dict:
-        sorted_vals = sorted(values)
-        return {
-            "min_ms": min(values),
-            "max_ms": max(values),
-            "mean_ms": statistics.mean(values),
-            "median_ms": statistics.median(values),
-            "stdev_ms": statistics.stdev(values) if len(values) > 1 else 0,
-            "p95_ms": sorted_vals[int(len(values) * 0.95)],
-            "p99_ms": sorted_vals[int(len(values) * 0.99)],
-        }
 
-
-class UnicodeBenchmark:
+class UnicodeBenchmark(BaseBenchmark):
     """Measures Unicode/emoji rendering performance"""
 
-    def __init__(self, runs: int = 5):
+    def __init__(self, runs: int = 5, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
         self.test_cases = {
             "emoji_variation_selectors": DataGenerator.emoji_with_variation_selectors,
             "zwj_sequences": DataGenerator.zwj_sequences,
@@ -308,37 +305,25 @@ class UnicodeBenchmark:
             data = generator()
             data_bytes = data.encode('utf-8')
 
-            with tempfile.NamedTemporaryFile(delete=False, mode='wb') as f:
-                f.write(data_bytes)
-                temp_file = f.name
+            sample = self._measure(lambda: self.harness.time_output(data_bytes))
 
-            try:
-                timings = []
-                for _ in range(self.runs):
-                    start = time.perf_counter()
-                    subprocess.run(['cat', temp_file], capture_output=True)
-                    end = time.perf_counter()
-                    timings.append((end - start) * 1000)  # to ms
-
-                metrics[name] = {
-                    "chars": len(data),
-                    "bytes": len(data_bytes),
-                    "mean_ms": statistics.mean(timings),
-                    "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0,
-                    "chars_per_second": len(data) / (statistics.mean(timings) / 1000),
-                }
-            finally:
-                os.unlink(temp_file)
+            metrics[name] = {
+                "chars": len(data),
+                "bytes": len(data_bytes),
+                **sample.stats("time_ms"),
+                **sample.rate(len(data), "chars_per_second"),
+            }
 
         result.metrics = metrics
         return result
 
 
-class ANSIBenchmark:
+class ANSIBenchmark(BaseBenchmark):
     """Measures ANSI escape sequence processing"""
 
-    def __init__(self, runs: int = 5):
+    def __init__(self, runs: int = 5, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = BenchmarkResult(
@@ -357,35 +342,23 @@ class ANSIBenchmark:
         for name, data in test_cases.items():
             data_bytes = data.encode('utf-8')
 
-            with tempfile.NamedTemporaryFile(delete=False, mode='wb') as f:
-                f.write(data_bytes)
-                temp_file = f.name
+            sample = self._measure(lambda: self.harness.time_output(data_bytes))
 
-            try:
-                timings = []
-                for _ in range(self.runs):
-                    start = time.perf_counter()
-                    subprocess.run(['cat', temp_file], capture_output=True)
-                    end = time.perf_counter()
-                    timings.append((end - start) * 1000)
-
-                metrics[name] = {
-                    "sequences": data.count('\033'),
-                    "mean_ms": statistics.mean(timings),
-                    "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0,
-                }
-            finally:
-                os.unlink(temp_file)
+            metrics[name] = {
+                "sequences": data.count('\033'),
+                **sample.stats("time_ms"),
+            }
 
         result.metrics = metrics
         return result
 
 
-class ScrollbackBenchmark:
+class ScrollbackBenchmark(BaseBenchmark):
     """Measures scrollback buffer performance"""
 
-    def __init__(self, runs: int = 5):
+    def __init__(self, runs: int = 5, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
         self.line_counts = [1000, 5000, 10000, 50000]
 
     def run(self, terminal: str) -> BenchmarkResult:
@@ -398,37 +371,25 @@ class ScrollbackBenchmark:
 
         metrics = {}
         for lines in self.line_counts:
-            data = DataGenerator.lines(lines)
+            data = DataGenerator.lines(lines).encode()
 
-            with tempfile.NamedTemporaryFile(delete=False, mode='w') as f:
-                f.write(data)
-                temp_file = f.name
+            sample = self._measure(lambda: self.harness.time_output(data))
 
-            try:
-                timings = []
-                for _ in range(self.runs):
-                    start = time.perf_counter()
-                    subprocess.run(['cat', temp_file], capture_output=True)
-                    end = time.perf_counter()
-                    timings.append(end - start)
-
-                metrics[f"{lines}_lines"] = {
-                    "mean_seconds": statistics.mean(timings),
-                    "stdev_seconds": statistics.stdev(timings) if len(timings) > 1 else 0,
-                    "lines_per_second": lines / statistics.mean(timings),
-                }
-            finally:
-                os.unlink(temp_file)
+            metrics[f"{lines}_lines"] = {
+                **sample.stats("time_ms"),
+                **sample.rate(lines, "lines_per_second"),
+            }
 
         result.metrics = metrics
         return result
 
 
-class MemoryBenchmark:
+class MemoryBenchmark(BaseBenchmark):
     """Measures memory usage"""
 
-    def __init__(self, runs: int = 3):
+    def __init__(self, runs: int = 3, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = BenchmarkResult(
@@ -459,20 +420,13 @@ class MemoryBenchmark:
 
         # After generating output
         data = DataGenerator.random_ascii(10 * 1024 * 1024)  # 10MB
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            f.write(data)
-            temp_file = f.name
+        self.harness.time_output(data)
+        time.sleep(1)  # Allow terminal to settle
 
-        try:
-            subprocess.run(['cat', temp_file], capture_output=True)
-            time.sleep(1)  # Allow terminal to settle
-
-            for pattern in patterns:
-                mem = self._get_process_memory(pattern)
-                if mem:
-                    metrics["after_output"][pattern] = mem
-        finally:
-            os.unlink(temp_file)
+        for pattern in patterns:
+            mem = self._get_process_memory(pattern)
+            if mem:
+                metrics["after_output"][pattern] = mem
 
         result.metrics = metrics
         return result
@@ -513,11 +467,12 @@ class MemoryBenchmark:
             return None
 
 
-class StartupBenchmark:
+class StartupBenchmark(BaseBenchmark):
     """Measures terminal startup time"""
 
-    def __init__(self, runs: int = 3):
+    def __init__(self, runs: int = 3, harness: Optional[TerminalHarness] = None):
         self.runs = runs
+        self.harness = harness
 
     def run(self, terminal: str) -> BenchmarkResult:
         result = BenchmarkResult(
@@ -544,8 +499,7 @@ class StartupBenchmark:
             result.metrics = {"error": f"Startup benchmark not implemented for {terminal}"}
             return result
 
-        timings = []
-        for _ in range(self.runs):
+        def launch() -> float:
             start = time.perf_counter()
             try:
                 proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -553,10 +507,10 @@ class StartupBenchmark:
             except subprocess.TimeoutExpired:
                 proc.kill()
             end = time.perf_counter()
-            timings.append(end - start)
             time.sleep(1)  # Cool down
+            return (end - start) * 1000
 
-        result.add_timing(timings, "seconds")
+        result.add_timing(self._measure(launch))
         return result
 
 
@@ -574,6 +528,8 @@ class ReportGenerator:
             f"**Host:** {suite.host}",
             f"**OS:** {suite.os_info}",
             f"**Date:** {suite.timestamp}",
+            f"**Corpus seed:** {suite.seed}",
+            f"**Sampling:** {suite.sampling}",
             "",
         ]
 
@@ -673,13 +629,16 @@ def detect_terminals() -> List[str]:
     return available
 
 
-def run_benchmarks(terminal: str, benchmarks: List[str], runs: int) -> BenchmarkSuite:
+def run_benchmarks(terminal: str, benchmarks: List[str], runs: int,
+                   harness: TerminalHarness) -> BenchmarkSuite:
     """Run all specified benchmarks for a terminal"""
     suite = BenchmarkSuite(
         terminal=terminal,
         host=platform.node(),
         os_info=f"{platform.system()} {platform.release()} {platform.machine()}",
-        timestamp=datetime.now().isoformat()
+        timestamp=datetime.now().isoformat(),
+        seed=DataGenerator.corpus.seed,
+        sampling=BaseBenchmark.sampling.to_dict(),
     )
 
     benchmark_classes = {
@@ -696,7 +655,7 @@ def run_benchmarks(terminal: str, benchmarks: List[str], runs: int) -> Benchmark
         if bench_name in benchmark_classes:
             print(f"  Running {bench_name} benchmark...")
             bench_class = benchmark_classes[bench_name]
-            bench = bench_class(runs=runs)
+            bench = bench_class(runs=runs, harness=harness)
             result = bench.run(terminal)
             suite.add_result(result)
         else:
@@ -705,28 +664,65 @@ def run_benchmarks(terminal: str, benchmarks: List[str], runs: int) -> Benchmark
     return suite
 
 
+def load_latest_suites(output_dir: Path) -> List[BenchmarkSuite]:
+    """Newest saved JSON result of each terminal in output_dir"""
+    latest = {}
+    # Timestamps in the names sort chronologically
+    for path in sorted(output_dir.glob("*_*.json")):
+        if "_comprehensive_" in path.name:
+            continue
+        try:
+            with open(path) as f:
+                suite = BenchmarkSuite.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+            continue
+        latest[suite.terminal] = suite
+    return list(latest.values())
+
+
 def main():
     parser = argparse.ArgumentParser(description="Terminal Emulator Benchmark Suite")
-    parser.add_argument("--terminal", "-t", default="all",
-                        help="Terminal to benchmark (bossterm, iterm2, terminal, alacritty, all)")
+    parser.add_argument("--terminal", "-t", default=None,
+                        help="Name to file results under (default: detected from the environment); "
+                             "always measures the terminal this runs in")
     parser.add_argument("--benchmark", "-b", default="all",
                         help="Benchmarks to run (throughput, latency, unicode, ansi, scrollback, memory, startup, all)")
     parser.add_argument("--output", "-o", default="./benchmark_results",
                         help="Output directory")
     parser.add_argument("--runs", "-r", type=int, default=5,
-                        help="Number of runs per test")
+                        help="Minimum number of runs per measurement")
+    parser.add_argument("--warmup", type=int, default=SamplingPolicy.warmup,
+                        help=f"Runs discarded before each measurement (default: {SamplingPolicy.warmup})")
+    parser.add_argument("--max-runs", type=int, default=SamplingPolicy.max_runs,
+                        help=f"Most runs per measurement (default: {SamplingPolicy.max_runs})")
+    parser.add_argument("--target-ci", type=float, default=SamplingPolicy.target_width,
+                        help="Stop once the 95%% interval of the median is this fraction of it wide "
+                             f"(default: {SamplingPolicy.target_width})")
+    parser.add_argument("--time-cap", type=float, default=SamplingPolicy.time_cap_sec,
+                        help=f"Most seconds per measurement (default: {SamplingPolicy.time_cap_sec:g})")
     parser.add_argument("--json", action="store_true",
                         help="Output as JSON")
     parser.add_argument("--compare", action="store_true",
-                        help="Generate comparison report")
+                        help="Generate comparison report from each terminal's newest saved JSON "
+                             "(implies --json)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Seed for generated workloads (default: {DEFAULT_SEED})")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Cache for generated workloads (default: ~/.cache/bossterm-benchmark/corpus)")
 
     args = parser.parse_args()
 
-    # Determine terminals
-    if args.terminal == "all":
-        terminals = detect_terminals()
-    else:
-        terminals = [t.strip() for t in args.terminal.split(",")]
+    # The harness can only measure the terminal it runs in
+    detected = current_terminal()
+    terminal = args.terminal or detected or "unknown"
+    if terminal == "all" or "," in terminal:
+        print(f"Error: each run measures the terminal it runs in. Run this inside each of "
+              f"{', '.join(detect_terminals()) or 'the terminals'} with --json, then --compare.",
+              file=sys.stderr)
+        sys.exit(2)
+    if detected and terminal != detected:
+        print(f"Warning: running in {detected}; results are filed under {terminal}")
 
     # Determine benchmarks
     all_benchmarks = ["throughput", "latency", "unicode", "ansi", "scrollback", "memory"]
@@ -735,9 +731,16 @@ def main():
     else:
         benchmarks = [b.strip() for b in args.benchmark.split(",")]
 
-    print(f"Terminals: {terminals}")
+    DataGenerator.corpus = Corpus(args.seed, args.corpus_dir)
+    BaseBenchmark.sampling = SamplingPolicy(
+        warmup=args.warmup, max_runs=args.max_runs, target_width=args.target_ci,
+        time_cap_sec=args.time_cap, seed=args.seed,
+    )
+
+    print(f"Terminal: {terminal}")
     print(f"Benchmarks: {benchmarks}")
-    print(f"Runs per test: {args.runs}")
+    print(f"Runs per measurement: {args.runs} to {max(args.runs, args.max_runs)} after {args.warmup} warmup, "
+          f"until the median's interval is within {args.target_ci:.0%}")
     print()
 
     # Create output directory
@@ -745,28 +748,33 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Run benchmarks
-    suites = []
-    for terminal in terminals:
-        print(f"\nBenchmarking {terminal}...")
-        suite = run_benchmarks(terminal, benchmarks, args.runs)
-        suites.append(suite)
-
-        # Save individual results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        if args.json:
-            json_file = output_dir / f"{terminal}_{timestamp}.json"
-            with open(json_file, 'w') as f:
-                json.dump(suite.to_dict(), f, indent=2)
-            print(f"  Saved: {json_file}")
-        else:
-            md_file = output_dir / f"{terminal}_{timestamp}.md"
-            with open(md_file, 'w') as f:
-                f.write(ReportGenerator.to_markdown(suite))
-            print(f"  Saved: {md_file}")
+    print(f"\nBenchmarking {terminal}...")
+    try:
+        with TerminalHarness() as harness:
+            suite = run_benchmarks(terminal, benchmarks, args.runs, harness)
+    except TerminalUnavailable as e:
+        print(f"Error: {e}. Run this inside the terminal under test.", file=sys.stderr)
+        sys.exit(1)
+
+    # Save individual results
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    if args.json or args.compare:
+        json_file = output_dir / f"{terminal}_{timestamp}.json"
+        with open(json_file, 'w') as f:
+            json.dump(suite.to_dict(), f, indent=2)
+        print(f"  Saved: {json_file}")
+    else:
+        md_file = output_dir / f"{terminal}_{timestamp}.md"
+        with open(md_file, 'w') as f:
+            f.write(ReportGenerator.to_markdown(suite))
+        print(f"  Saved: {md_file}")
 
     # Generate comparison
-    if args.compare and len(suites) > 1:
+    suites = load_latest_suites(output_dir) if args.compare else []
+    if args.compare and len(suites) < 2:
+        print("\nNothing to compare yet: run this inside another terminal with --compare")
+    if len(suites) > 1:
         print("\nGenerating comparison report...")
         comparison = ReportGenerator.compare_terminals(suites)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Headless Daemon Timing Harness
+Times how long a headless BossTerm session takes to consume output, with no display
+
+The session daemon (DaemonMain) owns PTYs and emulators without any UI, so
+it can run on a display-less CI machine (-Djava.awt.headless=true). This
+harness drives it over its control channel: a loopback TCP socket taking
+one newline-framed `<secret> <VERB> [json-arg]` request per connection,
+found through daemon.port in the settings directory.
+
+WRITE_INPUT feeds a session's PTY *input* (the keyboard side), and each
+request is capped at 8 KB, so it can't carry a workload to the emulator.
+Instead the harness opens a session running this file in worker mode:
+
+    1. the worker connects back to the harness over loopback and opens
+       its controlling terminal (the daemon's PTY) with TerminalHarness
+    2. the harness sends a one-time token through WRITE_INPUT; the worker
+       reads it off the tty and returns it, proving the connection came
+       from inside the session
+    3. for each workload, the harness ships the bytes to the worker (or,
+       for a cached Workload, its path, which the worker streams from
+       disk), and the worker writes them to the PTY and times them with the
+       DSR sentinel, just as terminal_harness.py does in a GUI terminal
+
+The emulator's cursor-position reply is written back to the PTY by the
+session, so a timing covers the PTY, the data stream and the emulator
+parsing into the text buffer. Socket transfer is outside the clock.
+
+Usage (as a library):
+    with DaemonHarness() as harness:
+        ms = harness.time_output(b"x" * 1024 * 1024)
+
+Start a daemon for CI with its own settings directory, e.g.:
+    java -Djava.awt.headless=true -Dbossterm.settings.dir=/tmp/bt \\
+        -cp <bossterm-app classpath> ai.rever.bossterm.app.DaemonMainKt
+"""
+
+import json
+import os
+import secrets
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from terminal_harness import REPLY_TIMEOUT_SEC, TerminalHarness, TerminalUnavailable
+from workload_corpus import Payload, Workload
+
+# DaemonControlChannel.PROTOCOL_VERSION this driver speaks.
+PROTOCOL_VERSION = 1
+
+# The channel drops a request line longer than this (MAX_REQUEST_CHARS).
+MAX_REQUEST_CHARS = 8192
+# JSON escapes a control character as six chars, so this many input chars
+# always fit in one WRITE_INPUT line next to the secret and session id.
+WRITE_INPUT_CHUNK = 1024
+
+CONTROL_TIMEOUT_SEC = 5.0
+# Spawning the worker includes a Python start-up inside the session.
+WORKER_START_TIMEOUT_SEC = 15.0
+
+DEFAULT_SETTINGS_DIR = Path.home() / ".bossterm"
+
+
+class DaemonError(TerminalUnavailable):
+    """The daemon is not running, refused a request, or its session failed."""
+
+
+class DaemonControl:
+    """Client for the daemon's control channel; one connection per request."""
+
+    def __init__(self, port: int, secret: str, host: str = "127.0.0.1",
+                 timeout: float = CONTROL_TIMEOUT_SEC):
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.timeout = timeout
+
+    @classmethod
+    def discover(cls, settings_dir: Optional[Path] = None) -> "DaemonControl":
+        """Connect details from daemon.port (port, secret, version line)."""
+        path = Path(settings_dir or DEFAULT_SETTINGS_DIR) / "daemon.port"
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+            port, secret = int(lines[0].strip()), lines[1].strip()
+        except (OSError, ValueError, IndexError):
+            raise DaemonError(f"no running daemon ({path} missing or malformed)")
+        if not secret:
+            raise DaemonError(f"no running daemon ({path} has no secret)")
+        return cls(port, secret)
+
+    def request(self, verb: str, arg: str = "") -> str:
+        """Send one verb; returns the payload after OK, raises DaemonError on ERR."""
+        line = f"{self.secret} {verb} {arg}".rstrip() + "\n"
+        if len(line) > MAX_REQUEST_CHARS:
+            raise ValueError(f"{verb} request is {len(line)} chars; the daemon takes {MAX_REQUEST_CHARS}")
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+                sock.sendall(line.encode("utf-8"))
+                with sock.makefile("r", encoding="utf-8") as reader:
+                    response = reader.readline().rstrip("\n")
+        except OSError as e:
+            raise DaemonError(f"daemon on {self.host}:{self.port} unreachable: {e}")
+        if not response:
+            # A bad secret or an over-long line is dropped without a reply.
+            raise DaemonError(f"daemon closed the connection on {verb} (stale daemon.port?)")
+        status, _, payload = response.partition(" ")
+        if status == "ERR":
+            raise DaemonError(f"{verb} failed: {payload}")
+        if status not in ("OK", "PONG"):
+            raise DaemonError(f"unexpected reply to {verb}: {response}")
+        return payload
+
+    def _json(self, verb: str, arg: Any = None) -> Any:
+        payload = self.request(verb, "" if arg is None else json.dumps(arg))
+        return json.loads(payload) if payload else None
+
+    def hello(self) -> Dict[str, Any]:
+        """Handshake; refuses a daemon speaking another protocol version."""
+        fields = self.request("HELLO").split()
+        try:
+            version, protocol, pid = fields[0], int(fields[1]), int(fields[2])
+        except (IndexError, ValueError):
+            raise DaemonError(f"malformed HELLO reply: {' '.join(fields)}")
+        if protocol != PROTOCOL_VERSION:
+            raise DaemonError(f"daemon {version} speaks protocol {protocol}, "
+                              f"this harness speaks {PROTOCOL_VERSION}")
+        return {"version": version, "protocolVersion": protocol, "pid": pid}
+
+    def status(self) -> Dict[str, Any]:
+        return self._json("STATUS")
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        return self._json("LIST_SESSIONS")
+
+    def open_session(self, command: Optional[str] = None, arguments: Optional[List[str]] = None,
+                     cwd: Optional[str] = None, cols: int = 80, rows: int = 24) -> str:
+        """Open a headless session; returns its id."""
+        return self._json("OPEN_SESSION", {
+            "cwd": cwd, "command": command, "arguments": arguments or [],
+            "cols": cols, "rows": rows,
+        })["id"]
+
+    def write_input(self, session_id: str, text: str) -> None:
+        """Type text into a session, split to fit the request cap."""
+        for start in range(0, len(text), WRITE_INPUT_CHUNK):
+            self._json("WRITE_INPUT", {"id": session_id, "text": text[start:start + WRITE_INPUT_CHUNK]})
+
+    def resize_session(self, session_id: str, cols: int, rows: int) -> None:
+        self._json("RESIZE_SESSION", {"id": session_id, "cols": cols, "rows": rows})
+
+    def close_session(self, session_id: str) -> None:
+        self.request("CLOSE_SESSION", session_id)
+
+
+class DaemonHarness:
+    """TerminalHarness's interface, measuring a headless session of a running daemon."""
+
+    def __init__(self, settings_dir: Optional[Path] = None, cols: int = 80, rows: int = 24,
+                 reply_timeout: float = REPLY_TIMEOUT_SEC):
+        self.settings_dir = settings_dir
+        self.cols = cols
+        self.rows = rows
+        self.reply_timeout = reply_timeout
+        self.control: Optional[DaemonControl] = None
+        self.daemon: Dict[str, Any] = {}
+        self.session_id: Optional[str] = None
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def __enter__(self) -> "DaemonHarness":
+        self.control = DaemonControl.discover(self.settings_dir)
+        self.daemon = self.control.hello()
+        listener = socket.create_server(("127.0.0.1", 0))
+        try:
+            listener.settimeout(WORKER_START_TIMEOUT_SEC)
+            self.session_id = self.control.open_session(
+                command=sys.executable,
+                arguments=[os.path.abspath(__file__), "--worker", str(listener.getsockname()[1])],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                cols=self.cols, rows=self.rows,
+            )
+            try:
+                self._sock, _ = listener.accept()
+            except socket.timeout:
+                self.close()
+                raise DaemonError(f"worker in session {self.session_id} did not connect within "
+                                  f"{WORKER_START_TIMEOUT_SEC:g}s")
+        finally:
+            listener.close()
+        self._sock.settimeout(self.reply_timeout + CONTROL_TIMEOUT_SEC)
+        self._reader = self._sock.makefile("rb")
+        try:
+            self._expect("READY")
+            token = secrets.token_hex(16)
+            self.control.write_input(self.session_id, token + "\n")
+            if self._expect("TOKEN") != token:
+                raise DaemonError("worker connection did not come from the benchmark session")
+        except (TerminalUnavailable, OSError) as e:
+            self.close()
+            raise DaemonError(f"headless session failed to start: {e}")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.sendall(b"CLOSE\n")
+            except OSError:
+                pass
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
+        if self.session_id is not None:
+            try:
+                self.control.close_session(self.session_id)
+            except DaemonError:
+                pass  # exited with the worker already
+            self.session_id = None
+
+    def _expect(self, status: str) -> str:
+        line = self._reader.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            raise DaemonError("worker exited")
+        reply, _, payload = line.partition(" ")
+        if reply == "ERR":
+            raise TerminalUnavailable(payload)
+        if reply != status:
+            raise DaemonError(f"unexpected worker reply: {line}")
+        return payload
+
+    def sync(self, timeout: Optional[float] = None) -> float:
+        """Query and wait for the reply; returns the round trip in ms."""
+        self._sock.sendall(f"SYNC {timeout or self.reply_timeout:g}\n".encode())
+        return float(self._expect("OK"))
+
+    def time_output(self, data: Payload, reset: bool = True) -> float:
+        """Milliseconds from the first byte written until the emulator has parsed the last."""
+        if isinstance(data, Workload):
+            self._sock.sendall(f"STREAM {int(reset)} {data.size} {data.path}\n".encode())
+        else:
+            self._sock.sendall(f"OUTPUT {int(reset)} {len(data)}\n".encode())
+            self._sock.sendall(data)
+        return float(self._expect("OK"))
+
+    def resize(self, cols: int, rows: int) -> None:
+        """Resize the session's grid and PTY, for workloads at another size."""
+        self.control.resize_session(self.session_id, cols, rows)
+        self.cols, self.rows = cols, rows
+        self.sync()
+
+
+def run_worker(port: int) -> int:
+    """Worker side, run inside the headless session: time what the harness sends."""
+    with socket.create_connection(("127.0.0.1", port)) as sock, sock.makefile("rb") as reader:
+        def reply(line: str) -> None:
+            sock.sendall(line.encode("utf-8") + b"\n")
+
+        try:
+            harness = TerminalHarness().__enter__()
+        except TerminalUnavailable as e:
+            reply(f"ERR {e}")
+            return 1
+        try:
+            reply("READY")
+            reply(f"TOKEN {harness.read_line(WORKER_START_TIMEOUT_SEC)}")
+            for line in reader:
+                verb, *fields = line.decode("utf-8").rstrip("\n").split(" ", 3)
+                try:
+                    if verb == "SYNC":
+                        reply(f"OK {harness.sync(float(fields[0]))}")
+                    elif verb == "OUTPUT":
+                        data = reader.read(int(fields[1]))
+                        reply(f"OK {harness.time_output(data, reset=fields[0] == '1')}")
+                    elif verb == "STREAM":
+                        workload = Workload(Path(fields[2]), int(fields[1]))
+                        reply(f"OK {harness.time_output(workload, reset=fields[0] == '1')}")
+                    else:
+                        break
+                except TerminalUnavailable as e:
+                    reply(f"ERR {e}")
+        except TerminalUnavailable as e:
+            reply(f"ERR {e}")
+            return 1
+        finally:
+            harness.close()
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        sys.exit(run_worker(int(sys.argv[2])))
+    print(f"usage: {sys.argv[0]} --worker <port>  (started by DaemonHarness)", file=sys.stderr)
+    sys.exit(2)
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Stand-in BossTerm MCP Server
+Stdlib-only fake of the MCP transport bossterm-mcp.py talks to, for perf CI
+
+Reproduces the Kotlin MCP SDK 0.8.3 quirks the client depends on:
+
+    - the SSE stream is mounted at `/` (not `/sse`)
+    - its first event is `endpoint`, whose data is the session-scoped POST
+      URL (`/?sessionId=<id>`)
+    - POSTs to that URL answer `202 Accepted` immediately; the JSON-RPC
+      response arrives later as a `message` event on the SSE stream
+    - only loopback Host headers are accepted (DNS-rebinding defense)
+
+and the Streamable HTTP endpoint at `/mcp` (StreamableMcpSessions.kt):
+`initialize` without `mcp-session-id` mints a session, later POSTs carry
+the header and get the JSON-RPC response as their body, unknown sessions
+get 404, GET gets 405 and DELETE ends the session.
+
+Tools mirror BossTerm's names and response shapes (docs/mcp-server.md)
+closely enough for the CLI: list_tabs, get_active_tab, list_panes,
+read_scrollback, search_output, read_debug_console, send_input,
+send_signal, run_command, run_in_panel. One extra tool, `payload`, returns
+`{"data": "<N bytes>"}` for `{"bytes": N}` to measure large transfers.
+
+Usage:
+    python3 mcp_fake_server.py [options]
+
+Options:
+    --port <n>               Port on 127.0.0.1 (default: 0, any free port)
+    --latency-ms <ms>        Delay before every tools/call response (default: 0)
+    --jitter-ms <ms>         Extra uniform random delay per response (default: 0)
+    --tabs <n>               Number of tabs (default: 2)
+    --panes-per-tab <n>      Split panes reported per tab by list_panes (default: 1)
+    --scrollback-lines <n>   Synthetic scrollback lines per tab (default: 5000)
+    --line-bytes <n>         Approximate bytes per scrollback line (default: 80)
+    --buffer-max-lines <n>   Trim scrollback to this, like settings.bufferMaxLines (default: 0, no cap)
+    --debug-rate <hz>        PTY_OUTPUT debug chunks produced per second (default: 20)
+    --debug-max-chunks <n>   Debug ring size, like settings.debugMaxChunks (default: 1000)
+    --no-streamable          Serve SSE only, like builds before `/mcp` existed
+
+Prints `listening on 127.0.0.1:<port>` once bound, then serves until killed.
+"""
+
+import argparse
+import json
+import queue
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+PROTOCOL_VERSION = "2024-11-05"
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+HEARTBEAT_SEC = 5.0
+
+
+class ToolError(Exception):
+    """Raised by a tool; becomes a CallToolResult with isError=true."""
+
+
+# === Fake terminal state ===
+
+class FakeBossTerm:
+    """Tabs, scrollback and a debug-chunk ring, shaped like BossTerm's MCP tools."""
+
+    def __init__(self, tabs: int, scrollback_lines: int, line_bytes: int, debug_max_chunks: int,
+                 panes_per_tab: int = 1, buffer_max_lines: int = 0):
+        self.lock = threading.Lock()
+        self.buffer_max_lines = buffer_max_lines
+        self.panes_per_tab = max(1, panes_per_tab)
+        self.tabs = [{"id": f"tab-{i + 1}", "title": f"shell {i + 1}", "cwd": "/tmp",
+                      "pid": 40000 + i, "isActive": i == 0} for i in range(tabs)]
+        filler = "x" * max(0, line_bytes - 24)
+        self.scrollback: Dict[str, List[str]] = {
+            tab["id"]: [f"{n:8d} {tab['id']} {filler}" for n in range(scrollback_lines)]
+            for tab in self.tabs
+        }
+        self.chunks: Dict[str, deque] = {tab["id"]: deque(maxlen=debug_max_chunks) for tab in self.tabs}
+        self.total_chunks: Dict[str, int] = {tab["id"]: 0 for tab in self.tabs}
+        self.pane_locks: Dict[str, threading.Lock] = {}
+
+    def tab(self, tab_id: Optional[str]) -> Dict[str, Any]:
+        for tab in self.tabs:
+            if tab["id"] == tab_id:
+                return tab
+        raise ToolError(f"Tab not found: {tab_id}")
+
+    def record(self, tab_id: str, source: str, data: str) -> None:
+        """Append a debug chunk and, for PTY output, the lines it completes."""
+        with self.lock:
+            index = self.total_chunks[tab_id]
+            self.total_chunks[tab_id] = index + 1
+            self.chunks[tab_id].append({
+                "index": index,
+                "timestamp": int(time.time() * 1000),
+                "source": source,
+                "data": data,
+            })
+            if source == "PTY_OUTPUT":
+                buffer = self.scrollback[tab_id]
+                buffer.extend(line for line in data.replace("\r", "").split("\n") if line)
+                if 0 < self.buffer_max_lines < len(buffer):
+                    # Oldest lines drop off; every later line moves up.
+                    del buffer[:len(buffer) - self.buffer_max_lines]
+
+    # --- tools ---
+
+    def list_tabs(self, args: Dict) -> Dict:
+        fields = args.get("include_fields")
+        tabs = [{k: v for k, v in tab.items() if not fields or k in fields} for tab in self.tabs]
+        return {"tabs": tabs, "activeTabId": self.tabs[0]["id"] if self.tabs else None}
+
+    def get_active_tab(self, args: Dict) -> Optional[Dict]:
+        return self.tabs[0] if self.tabs else None
+
+    def list_panes(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        # Like BossTerm, an unsplit tab's only pane has the tab's id. Split
+        # panes share the tab's scrollback here.
+        ids = [tab["id"]] + [f"{tab['id']}.{n}" for n in range(2, self.panes_per_tab + 1)]
+        panes = [{"id": pane_id, "sessionId": pane_id, "title": tab["title"],
+                  "cwd": tab["cwd"], "isFocused": pane_id == tab["id"]} for pane_id in ids]
+        return {"panes": panes, "focusedPaneId": tab["id"]}
+
+    def read_scrollback(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        lines = max(1, int(args.get("lines", 200)))
+        start = args.get("start")
+        with self.lock:
+            buffer = self.scrollback[tab["id"]]
+            if start is None:
+                return {"lines": buffer[-lines:], "totalAvailable": len(buffer)}
+            start = max(0, int(start))
+            return {"lines": buffer[start:start + lines], "totalAvailable": len(buffer), "start": start}
+
+    def search_output(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        flags = re.IGNORECASE if args.get("ignore_case") else 0
+        pattern = re.compile(args.get("pattern", ""), flags)
+        max_matches = max(1, int(args.get("max_matches", 50)))
+        include_text = args.get("include_line_text", True)
+        with self.lock:
+            buffer = list(self.scrollback[tab["id"]])
+        height = 24
+        history = max(0, len(buffer) - height)
+        matches = []
+        truncated = False
+        for offset, line in enumerate(buffer):
+            for m in pattern.finditer(line):
+                if len(matches) == max_matches:
+                    truncated = True
+                    break
+                match = {"row": offset - history, "matchStart": m.start(), "matchEnd": m.end()}
+                if include_text:
+                    match["line"] = line
+                matches.append(match)
+            if truncated:
+                break
+        return {"matches": matches, "truncated": truncated,
+                "historyLinesCount": history, "height": height}
+
+    def read_debug_console(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        max_chunks = max(1, int(args.get("max_chunks", 100)))
+        since = args.get("since_index")
+        sources = args.get("sources")
+        wanted = {s.upper() for s in sources} if isinstance(sources, list) else None
+        with self.lock:
+            ring = list(self.chunks[tab["id"]])
+            total = self.total_chunks[tab["id"]]
+        selected = [c for c in ring
+                    if (since is None or c["index"] > max(0, int(since)))
+                    and (wanted is None or c["source"] in wanted)]
+        # Same as BossTerm: filter, then keep the newest max_chunks.
+        selected = selected[-max_chunks:]
+        if args.get("omit_data"):
+            selected = [{k: v for k, v in c.items() if k != "data"} for c in selected]
+        return {"chunks": selected, "stats": {
+            "totalChunks": total,
+            "chunksStored": len(ring),
+            "oldestIndex": ring[0]["index"] if ring else 0,
+            "newestIndex": ring[-1]["index"] if ring else -1,
+            "debugEnabled": True,
+        }}
+
+    def send_input(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        text = args.get("text", "")
+        self.record(tab["id"], "USER_INPUT", text)
+        self.record(tab["id"], "PTY_OUTPUT", text.replace("\n", "\r\n"))
+        return {"ok": True}
+
+    def send_signal(self, args: Dict) -> Dict:
+        tab = self.tab(args.get("tab_id"))
+        signal = args.get("signal")
+        if signal not in ("ctrl_c", "ctrl_d", "ctrl_z"):
+            raise ToolError(f"Unknown signal: {signal}")
+        self.record(tab["id"], "USER_INPUT", {"ctrl_c": "\x03", "ctrl_d": "\x04", "ctrl_z": "\x1a"}[signal])
+        return {"ok": True}
+
+    def run_command(self, args: Dict) -> Dict:
+        tab_id = args.get("tab_id") or self.tabs[0]["id"]
+        self.tab(tab_id)
+        pane_id = args.get("pane_id")
+        if pane_id is None:
+            # Like BossTerm, `panel` only matters when no pane is given.
+            pane_id = tab_id if args.get("panel") in (None, "current") else str(uuid.uuid4())
+        with self.lock:
+            pane_lock = self.pane_locks.setdefault(pane_id, threading.Lock())
+        timeout = int(args.get("timeout_ms", 60000)) / 1000.0
+        # Calls on the same pane run FIFO, like BossTerm's per-pane queue.
+        with pane_lock:
+            started = time.monotonic()
+            try:
+                proc = subprocess.run(
+                    ["/bin/sh", "-c", args.get("script", "")], cwd=args.get("working_dir"),
+                    capture_output=True, text=True, timeout=timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                output = e.stdout if isinstance(e.stdout, str) else ""
+                return {"ok": False, "tabId": tab_id, "paneId": pane_id,
+                        "durationMs": int((time.monotonic() - started) * 1000),
+                        "output": output, "truncated": False, "error": "timeout"}
+        output = proc.stdout + proc.stderr
+        self.record(tab_id, "PTY_OUTPUT", output.replace("\n", "\r\n"))
+        return {"ok": True, "tabId": tab_id, "paneId": pane_id, "exitCode": proc.returncode,
+                "durationMs": int((time.monotonic() - started) * 1000),
+                "output": output, "truncated": False}
+
+    def run_in_panel(self, args: Dict) -> Dict:
+        tab_id = args.get("tab_id") or self.tabs[0]["id"]
+        self.tab(tab_id)
+        panel = args.get("panel")
+        if panel not in ("new_tab", "horizontal_split", "vertical_split"):
+            raise ToolError(f"Unknown panel: '{panel}'")
+        # Splits get a pane id that run_command accepts; no shell behind it.
+        pane_id = None if panel == "new_tab" else str(uuid.uuid4())
+        return {"ok": True, "tabId": tab_id, "paneId": pane_id}
+
+    def payload(self, args: Dict) -> Dict:
+        return {"data": "x" * max(0, int(args.get("bytes", 0)))}
+
+    TOOLS = ("list_tabs", "get_active_tab", "list_panes", "read_scrollback", "search_output",
+             "read_debug_console", "send_input", "send_signal", "run_command", "run_in_panel",
+             "payload")
+
+    def produce_output(self, rate_hz: float) -> None:
+        """Background PTY output so debug-console pollers always see traffic."""
+        tick = 0
+        while rate_hz > 0:
+            time.sleep(1.0 / rate_hz)
+            for tab in self.tabs:
+                self.record(tab["id"], "PTY_OUTPUT", f"[{tick}] build step {tick % 97} ok\r\n")
+            tick += 1
+
+
+# === MCP server ===
+
+class FakeMcpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default backlog of 5 drops SYNs when a client opens a
+    # burst of pooled connections, and each retry costs a full second.
+    request_queue_size = 128
+
+    def __init__(self, port: int, terminal: FakeBossTerm, latency_ms: float, jitter_ms: float,
+                 streamable: bool = True):
+        super().__init__(("127.0.0.1", port), McpHandler)
+        self.terminal = terminal
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.streamable = streamable
+        self.sessions: Dict[str, "queue.Queue[Optional[Dict]]"] = {}
+        self.streamable_sessions: set = set()
+        self.sessions_lock = threading.Lock()
+
+    def simulate_latency(self) -> None:
+        delay = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+
+    def respond_later(self, session: "queue.Queue", message: Dict) -> None:
+        if message.get("method") == "tools/call":
+            self.simulate_latency()
+        response = self.handle_message(message)
+        if response is not None:
+            session.put(response)
+
+    def handle_message(self, message: Dict) -> Optional[Dict]:
+        if "id" not in message:
+            return None  # notification
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "initialize":
+            result: Any = {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": {"name": "bossterm-fake", "version": "0"},
+            }
+        elif method == "ping":
+            result = {}
+        elif method == "tools/list":
+            result = {"tools": [{"name": name, "inputSchema": {"type": "object"}}
+                                for name in FakeBossTerm.TOOLS]}
+        elif method == "tools/call":
+            name = params.get("name")
+            if name not in FakeBossTerm.TOOLS:
+                return {"jsonrpc": "2.0", "id": message["id"],
+                        "error": {"code": -32601, "message": f"Tool {name} not found"}}
+            try:
+                value = getattr(self.terminal, name)(params.get("arguments") or {})
+                result = {"content": [{"type": "text", "text": json.dumps(value)}]}
+            except (ToolError, ValueError, TypeError, re.error) as e:
+                result = {"content": [{"type": "text", "text": str(e)}], "isError": True}
+        else:
+            return {"jsonrpc": "2.0", "id": message["id"],
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+
+class McpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeMcpServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", content_type: str = "text/plain",
+               headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        # Headers and body in one write: a separate small body write would
+        # sit behind Nagle + delayed ACK and add ~40 ms per POST.
+        self._headers_buffer.append(b"\r\n" + body)
+        self.flush_headers()
+
+    def _loopback_host(self) -> bool:
+        host = urlsplit("//" + (self.headers.get("Host") or "")).hostname
+        if host in LOOPBACK_HOSTS:
+            return True
+        self._reply(403, b"Forbidden host")
+        return False
+
+    def do_GET(self):
+        if not self._loopback_host():
+            return
+        if urlsplit(self.path).path == "/mcp" and self.server.streamable:
+            self._reply(405, b"Method Not Allowed", headers={"Allow": "POST, DELETE"})
+            return
+        if urlsplit(self.path).path != "/":
+            self._reply(404, b"Not Found")
+            return
+        session_id = uuid.uuid4().hex
+        events: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        with self.server.sessions_lock:
+            self.server.sessions[session_id] = events
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self._send_event("endpoint", f"/?sessionId={session_id}")
+            while True:
+                try:
+                    message = events.get(timeout=HEARTBEAT_SEC)
+                except queue.Empty:
+                    self._send_chunk(b": heartbeat\n\n")  # also detects a gone client
+                    continue
+                if message is None:
+                    break
+                self._send_event("message", json.dumps(message))
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            with self.server.sessions_lock:
+                self.server.sessions.pop(session_id, None)
+            self.close_connection = True
+
+    def _send_event(self, event: str, data: str) -> None:
+        self._send_chunk(f"event: {event}\ndata: {data}\n\n".encode("utf-8"))
+
+    def _send_chunk(self, payload: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+        self.wfile.flush()
+
+    def do_POST(self):
+        if not self._loopback_host():
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        url = urlsplit(self.path)
+        if url.path == "/mcp" and self.server.streamable:
+            self._streamable_post(body)
+            return
+        session_id = parse_qs(url.query).get("sessionId", [None])[0]
+        with self.server.sessions_lock:
+            events = self.server.sessions.get(session_id) if url.path == "/" else None
+        if events is None:
+            self._reply(404, b"Session not found")
+            return
+        try:
+            message = json.loads(body)
+        except ValueError:
+            self._reply(400, b"Invalid JSON")
+            return
+        self._reply(202, b"Accepted")
+        threading.Thread(target=self.server.respond_later, args=(events, message), daemon=True).start()
+
+    def _streamable_post(self, body: bytes) -> None:
+        try:
+            message = json.loads(body)
+        except ValueError:
+            self._reply(400, b"Invalid JSON")
+            return
+        session_id = self.headers.get("mcp-session-id")
+        if session_id is None:
+            if not isinstance(message, dict) or message.get("method") != "initialize":
+                self._reply(400, b"Bad Request: server not initialized")
+                return
+            session_id = uuid.uuid4().hex
+            with self.server.sessions_lock:
+                self.server.streamable_sessions.add(session_id)
+        else:
+            with self.server.sessions_lock:
+                known = session_id in self.server.streamable_sessions
+            if not known:
+                self._reply(404, b"Session not found.")
+                return
+        if "id" not in message:
+            self._reply(202, b"")
+            return
+        if message.get("method") == "tools/call":
+            self.server.simulate_latency()
+        response = json.dumps(self.server.handle_message(message)).encode("utf-8")
+        self._reply(200, response, "application/json", {"mcp-session-id": session_id})
+
+    def do_DELETE(self):
+        if not self._loopback_host():
+            return
+        if urlsplit(self.path).path != "/mcp" or not self.server.streamable:
+            self._reply(404, b"Not Found")
+            return
+        session_id = self.headers.get("mcp-session-id")
+        if session_id is None:
+            self._reply(400, b"Missing mcp-session-id header.")
+            return
+        with self.server.sessions_lock:
+            known = session_id in self.server.streamable_sessions
+            self.server.streamable_sessions.discard(session_id)
+        self._reply(200 if known else 404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in BossTerm MCP Server")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tabs", type=int, default=2)
+    parser.add_argument("--panes-per-tab", type=int, default=1)
+    parser.add_argument("--scrollback-lines", type=int, default=5000)
+    parser.add_argument("--line-bytes", type=int, default=80)
+    parser.add_argument("--buffer-max-lines", type=int, default=0)
+    parser.add_argument("--debug-rate", type=float, default=20.0)
+    parser.add_argument("--debug-max-chunks", type=int, default=1000)
+    parser.add_argument("--no-streamable", action="store_true")
+    args = parser.parse_args()
+
+    terminal = FakeBossTerm(args.tabs, args.scrollback_lines, args.line_bytes, args.debug_max_chunks,
+                            args.panes_per_tab, args.buffer_max_lines)
+    threading.Thread(target=terminal.produce_output, args=(args.debug_rate,), daemon=True).start()
+    server = FakeMcpServer(args.port, terminal, args.latency_ms, args.jitter_ms,
+                           streamable=not args.no_streamable)
+    print(f"listening on 127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
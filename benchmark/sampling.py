@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Adaptive Sampling
+Decides how many times to time a workload, and how sure the result is
+
+A fixed number of runs with no warmup mostly measures a JIT terminal
+(BossTerm runs on the JVM) compiling its parser, and a mean and stdev over
+five runs say nothing about how far the number can be trusted. Here each
+measurement is:
+
+    1. run `warmup` times, results discarded
+    2. run at least `min_runs` times, then keep going until the bootstrap
+       confidence interval of the median is narrower than `target_width`
+       (relative to the median), or `max_runs` or `time_cap_sec` is hit
+    3. outliers rejected by median absolute deviation (modified z-score
+       above `mad_threshold`) before the median and its interval are taken
+
+The interval is a percentile bootstrap: the median of `resamples` samples
+drawn with replacement from the kept runs, and the middle `confidence` of
+those medians. Its generator is seeded, so the same runs give the same
+interval.
+
+Usage (as a library):
+    policy = SamplingPolicy(warmup=3, target_width=0.05)
+    sample = measure(lambda: harness.time_output(data), policy, min_runs=5)
+    sample.stats("time_ms")   # median, interval, mean, stdev, run counts
+"""
+
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Scales the MAD to the standard deviation of a normal distribution.
+MAD_SCALE = 0.6745
+
+
+@dataclass
+class SamplingPolicy:
+    warmup: int = 2
+    max_runs: int = 30
+    target_width: float = 0.05  # CI width / median
+    confidence: float = 0.95
+    time_cap_sec: float = 20.0  # per measurement, warmup excluded
+    mad_threshold: float = 3.5
+    resamples: int = 1000
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def reject_outliers(values: List[float], threshold: float) -> Tuple[List[float], List[float]]:
+    """(kept, rejected) by modified z-score; nothing is rejected while MAD is 0."""
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    if mad == 0:
+        return list(values), []
+    kept, rejected = [], []
+    for v in values:
+        (rejected if MAD_SCALE * abs(v - median) / mad > threshold else kept).append(v)
+    return kept, rejected
+
+
+def median_ci(values: List[float], confidence: float, resamples: int,
+              rng: random.Random) -> Tuple[float, float]:
+    """Percentile-bootstrap interval of the median."""
+    if len(values) < 2:
+        return values[0], values[0]
+    n = len(values)
+    medians = sorted(statistics.median(rng.choices(values, k=n)) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return medians[int(tail * (resamples - 1))], medians[int((1 - tail) * (resamples - 1))]
+
+
+@dataclass
+class Sample:
+    """Kept runs of one measurement, with the median's interval."""
+    values: List[float]
+    rejected: List[float] = field(default_factory=list)
+    warmup: int = 0
+    ci_low: float = 0.0
+    ci_high: float = 0.0
+    confidence: float = 0.95
+    converged: bool = False
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.values)
+
+    @property
+    def width(self) -> float:
+        """CI width relative to the median."""
+        median = self.median
+        return (self.ci_high - self.ci_low) / median if median else 0.0
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The p-th percentile, or None with too few runs to show that tail (fewer than 100/(100-p))."""
+        n = len(self.values)
+        if n < 2 or n * (100 - p) < 100:
+            return None
+        return statistics.quantiles(self.values, n=100, method="inclusive")[int(p) - 1]
+
+    def stats(self, prefix: str) -> Dict[str, Any]:
+        """Median and its interval, mean, stdev and run counts, for a timing in ms."""
+        return {
+            f"{prefix}_median": self.median,
+            f"{prefix}_ci_low": self.ci_low,
+            f"{prefix}_ci_high": self.ci_high,
+            f"{prefix}_mean": statistics.mean(self.values),
+            f"{prefix}_stdev": statistics.stdev(self.values) if len(self.values) > 1 else 0,
+            "runs": len(self.values),
+            "outliers": len(self.rejected),
+            "converged": self.converged,
+        }
+
+    def rate(self, amount: float, name: str) -> Dict[str, float]:
+        """amount per second at the median time, with the interval carried over from the times."""
+        def per_sec(ms: float) -> float:
+            return amount / (ms / 1000) if ms else float("inf")
+
+        return {
+            name: per_sec(self.median),
+            f"{name}_ci_low": per_sec(self.ci_high),
+            f"{name}_ci_high": per_sec(self.ci_low),
+        }
+
+
+def measure(run: Callable[[], float], policy: SamplingPolicy, min_runs: int) -> Sample:
+    """Time run() (which returns ms) under policy; see the module docstring."""
+    for _ in range(policy.warmup):
+        run()
+    rng = random.Random(policy.seed)
+    max_runs = max(policy.max_runs, min_runs)
+    values: List[float] = []
+    deadline = time.monotonic() + policy.time_cap_sec
+    while True:
+        values.append(run())
+        if len(values) < min_runs:
+            continue
+        kept, rejected = reject_outliers(values, policy.mad_threshold)
+        low, high = median_ci(kept, policy.confidence, policy.resamples, rng)
+        sample = Sample(kept, rejected, policy.warmup, low, high, policy.confidence)
+        sample.converged = sample.width <= policy.target_width
+        if sample.converged or len(values) >= max_runs or time.monotonic() >= deadline:
+            return sample
+
+
+def margin(best: Dict[str, float], other: Dict[str, float]) -> Tuple[float, float, float]:
+    """How much better best is than other, as a fraction, with bounds from both intervals.
+
+    Each argument holds `value`, `ci_low` and `ci_high` oriented so that higher
+    is better. The bounds pair the worst case of one with the best case of
+    the other, so they are wider than a joint interval: if they still
+    exclude 0, the difference is real at the stated confidence.
+    """
+    def ratio(a: float, b: float) -> float:
+        return a / b - 1 if b else float("inf")
+
+    return (ratio(best["value"], other["value"]),
+            ratio(best["ci_low"], other["ci_high"]),
+            ratio(best["ci_high"], other["ci_low"]))
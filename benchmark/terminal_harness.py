@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+In-Terminal Timing Harness
+Times how long the terminal this process runs in takes to consume output
+
+Timing `cat file` with its output captured measures `cat` writing into a
+pipe: the terminal never sees a byte. This harness writes each workload to
+the controlling terminal (/dev/tty) instead, followed by a Device Status
+Report cursor-position query (`ESC [ 6 n`). A terminal handles its input in
+order, so the `ESC [ row ; col R` reply only comes back on the tty once
+every byte written before the query has been parsed. One timing is:
+
+    1. reset attributes and scroll region, clear the screen, and wait for
+       a reply, so earlier output is fully consumed before the clock starts
+    2. start the clock, write the workload (blocking whenever the PTY
+       buffer is full, i.e. at the terminal's pace), then the query
+    3. stop the clock when the reply arrives
+
+While timing, the tty's input side is non-canonical with echo off, so the
+reply is readable as soon as it arrives and isn't echoed; output
+processing (`\\n` to `\\r\\n`) is left as the shell had it, as `cat` would
+get it. The original settings are restored on exit.
+
+The sentinel shows when the terminal has parsed the output, not when it has
+painted it. Terminals that render on a separate frame clock may still be
+drawing.
+
+Only the terminal running the harness can be measured, so run the
+benchmarks once inside each terminal to compare them.
+
+Usage (as a library):
+    with TerminalHarness() as harness:
+        ms = harness.time_output(b"x" * 1024 * 1024)
+        ms = harness.time_output(corpus.random_ascii(1 << 30))  # any iterable of chunks
+"""
+
+import os
+import re
+import select
+import termios
+import time
+from typing import Iterable, Optional, Union
+
+CURSOR_POSITION_QUERY = b"\x1b[6n"
+CURSOR_POSITION_REPLY = re.compile(rb"\x1b\[(\d+);(\d+)R")
+
+# SGR reset, full-screen scroll region, cursor home, clear screen.
+SCREEN_RESET = b"\x1b[0m\x1b[r\x1b[H\x1b[2J"
+
+# A terminal answers an idle query within milliseconds. A workload of tens
+# of MB can take a slow terminal a good while to parse.
+SYNC_TIMEOUT_SEC = 2.0
+REPLY_TIMEOUT_SEC = 120.0
+
+# TERM_PROGRAM values, and variables only one terminal sets, mapped to the
+# names the benchmark suites use.
+TERM_PROGRAMS = {
+    "BossTerm": "bossterm",
+    "iTerm.app": "iterm2",
+    "Apple_Terminal": "terminal",
+    "WezTerm": "wezterm",
+    "ghostty": "ghostty",
+}
+TERMINAL_ENV_MARKERS = {
+    "KITTY_WINDOW_ID": "kitty",
+    "ALACRITTY_WINDOW_ID": "alacritty",
+    "ALACRITTY_SOCKET": "alacritty",
+}
+
+
+class TerminalUnavailable(RuntimeError):
+    """No controlling terminal, or it didn't answer the cursor-position query."""
+
+
+def current_terminal() -> Optional[str]:
+    """Name of the terminal this process runs in, if it can be told from the environment."""
+    program = os.environ.get("TERM_PROGRAM")
+    if program in TERM_PROGRAMS:
+        return TERM_PROGRAMS[program]
+    for variable, name in TERMINAL_ENV_MARKERS.items():
+        if variable in os.environ:
+            return name
+    return None
+
+
+class TerminalHarness:
+    """Writes workloads to the controlling terminal and times them with a DSR sentinel."""
+
+    def __init__(self, tty_path: str = "/dev/tty", reply_timeout: float = REPLY_TIMEOUT_SEC):
+        self.tty_path = tty_path
+        self.reply_timeout = reply_timeout
+        self.fd = -1
+        self._saved = None
+        self._pending = b""
+
+    def __enter__(self) -> "TerminalHarness":
+        try:
+            self.fd = os.open(self.tty_path, os.O_RDWR | os.O_NOCTTY)
+            self._saved = termios.tcgetattr(self.fd)
+        except OSError as e:
+            if self.fd >= 0:
+                os.close(self.fd)
+                self.fd = -1
+            raise TerminalUnavailable(f"no controlling terminal ({self.tty_path}: {e.strerror})")
+        attrs = termios.tcgetattr(self.fd)
+        attrs[3] &= ~(termios.ICANON | termios.ECHO)  # lflag; ISIG stays, so Ctrl-C works
+        attrs[6][termios.VMIN] = 1
+        attrs[6][termios.VTIME] = 0
+        termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+        try:
+            self.sync(SYNC_TIMEOUT_SEC)
+        except TerminalUnavailable:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.fd < 0:
+            return
+        try:
+            self._write(SCREEN_RESET)
+            # Drain (and discard) anything typed meanwhile before restoring.
+            termios.tcsetattr(self.fd, termios.TCSAFLUSH, self._saved)
+        finally:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+
+    def _await_reply(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            match = CURSOR_POSITION_REPLY.search(self._pending)
+            if match:
+                # Keystrokes typed around the reply are dropped with it.
+                self._pending = self._pending[match.end():]
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                raise TerminalUnavailable(
+                    f"no cursor-position reply from the terminal within {timeout:g}s"
+                )
+            self._pending += os.read(self.fd, 4096)
+
+    def read_line(self, timeout: float) -> str:
+        """A line typed into the terminal (echo is off), without its newline."""
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                raise TerminalUnavailable(f"no input line on the terminal within {timeout:g}s")
+            self._pending += os.read(self.fd, 4096)
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line.decode("utf-8", "replace").rstrip("\r")
+
+    def sync(self, timeout: float = SYNC_TIMEOUT_SEC) -> float:
+        """Query and wait for the reply; returns the round trip in ms."""
+        start = time.perf_counter()
+        self._write(CURSOR_POSITION_QUERY)
+        self._await_reply(timeout)
+        return (time.perf_counter() - start) * 1000
+
+    def time_output(self, data: Union[bytes, Iterable[bytes]], reset: bool = True) -> float:
+        """Milliseconds from the first byte written until the terminal has parsed the last.
+
+        data is bytes, or chunks to write one after another (a Workload from
+        workload_corpus.py), so a large workload never has to be in memory.
+        """
+        chunks = [data] if isinstance(data, (bytes, bytearray, memoryview)) else data
+        if reset:
+            self._write(SCREEN_RESET)
+        self.sync(self.reply_timeout)
+        self._pending = b""
+        start = time.perf_counter()
+        for chunk in chunks:
+            self._write(chunk)
+        self._write(CURSOR_POSITION_QUERY)
+        self._await_reply(self.reply_timeout)
+        return (time.perf_counter() - start) * 1000
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Seeded, Cached Workload Corpus
+Bulk random workloads for the benchmark suites, reproducible, built once, streamed
+
+Picking one character at a time with `random.choice` takes longer to make
+a 50 MB workload than the terminal takes to print it, and gives every run
+different content. Here a workload is drawn in bulk instead: random bytes
+from `random.Random(...).randbytes`, mapped onto the alphabet with one
+`bytes.translate` (bytes past the last whole multiple of the alphabet are
+dropped, so every character stays equally likely).
+
+Each workload gets its own generator, seeded from the corpus seed, its name
+and its parameters, so its content doesn't depend on what was generated
+before it. The same triple is the cache key: the first run writes the
+workload under the cache directory, later runs reuse the file.
+
+Nothing holds a whole workload in memory. Generators yield CHUNK_SIZE
+pieces straight into the cache file, and a Workload streams the file back
+through one reused CHUNK_SIZE buffer, so the benchmark's own footprint is
+the same for 1 MB and for 1 GB.
+
+    CACHE_VERSION   bump when a generator's output changes, so stale files
+                    are not reused
+
+Usage (as a library):
+    corpus = Corpus(seed=1)
+    workload = corpus.random_ascii(1024 * 1024 * 1024)
+    for chunk in workload:          # memoryviews of one buffer; use each before the next
+        sink.write(chunk)
+    rng = corpus.rng("log_output")  # for small, uncached workloads
+"""
+
+import hashlib
+import json
+import os
+import random
+import string
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+CACHE_VERSION = 2
+DEFAULT_SEED = 0
+
+# Size of each generated piece and of the read buffer.
+CHUNK_SIZE = 1024 * 1024
+
+ALPHANUMERIC = (string.ascii_letters + string.digits).encode()
+PRINTABLE = string.printable.replace("\x0b", "").replace("\x0c", "").encode()
+LOWERCASE = string.ascii_lowercase.encode()
+
+# Oversampling per pass, so rejected bytes rarely cost a second draw.
+_OVERDRAW = 1 / 16
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "bossterm-benchmark" / "corpus"
+
+
+class Workload:
+    """A cached workload, iterated as CHUNK_SIZE memoryviews of one reused buffer."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = Path(path)
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        buffer = bytearray(CHUNK_SIZE)
+        view = memoryview(buffer)
+        with open(self.path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    return
+                yield view[:n]
+
+
+# A workload as handed to a harness: small ones as bytes, bulk ones streamed.
+Payload = Union[bytes, Workload]
+
+
+class Corpus:
+    """Workload generators keyed by (name, parameters, seed), cached on disk."""
+
+    def __init__(self, seed: int = DEFAULT_SEED, cache_dir: Optional[Path] = None):
+        self.seed = seed
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+
+    def rng(self, name: str, params: Optional[Dict[str, Any]] = None) -> random.Random:
+        """A generator seeded for this workload alone."""
+        return random.Random(self._key(name, params))
+
+    def _key(self, name: str, params: Optional[Dict[str, Any]]) -> str:
+        spec = json.dumps([CACHE_VERSION, self.seed, name, params or {}], sort_keys=True)
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    @staticmethod
+    def random_bytes(rng: random.Random, alphabet: bytes, size: int) -> bytes:
+        """size bytes drawn uniformly from alphabet."""
+        usable = 256 - 256 % len(alphabet)
+        table = bytes(alphabet[i % len(alphabet)] for i in range(256))
+        rejected = bytes(range(usable, 256))
+        out = bytearray()
+        while len(out) < size:
+            missing = size - len(out)
+            out += rng.randbytes(missing + int(missing * _OVERDRAW) + 64).translate(table, rejected)
+        del out[size:]
+        return bytes(out)
+
+    def cached(self, name: str, params: Dict[str, Any],
+               build: Callable[[random.Random], Iterable[bytes]]) -> Workload:
+        """The workload from the cache, or streamed from its own generator into it."""
+        key = self._key(name, params)
+        path = self.cache_dir / f"{name}-{key[:16]}.bin"
+        try:
+            return Workload(path, path.stat().st_size)
+        except FileNotFoundError:
+            pass
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed in, so a concurrent or interrupted run
+        # never reads a half-written file.
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{name}-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in build(random.Random(key)):
+                    f.write(chunk)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return Workload(path, size)
+
+    # ===== Bulk workloads =====
+
+    def _random_chunks(self, rng: random.Random, alphabet: bytes, size: int) -> Iterator[bytes]:
+        for start in range(0, size, CHUNK_SIZE):
+            yield self.random_bytes(rng, alphabet, min(CHUNK_SIZE, size - start))
+
+    def random_ascii(self, size_bytes: int) -> Workload:
+        return self.cached("random_ascii", {"size": size_bytes},
+                           lambda rng: self._random_chunks(rng, ALPHANUMERIC, size_bytes))
+
+    def random_printable(self, size_bytes: int) -> Workload:
+        return self.cached("random_printable", {"size": size_bytes},
+                           lambda rng: self._random_chunks(rng, PRINTABLE, size_bytes))
+
+    def repeated_lines(self, count: int, line: bytes) -> Workload:
+        """count copies of line, newline-separated."""
+        def build(rng: random.Random) -> Iterator[bytes]:
+            per_chunk = max(1, CHUNK_SIZE // (len(line) + 1))
+            for start in range(0, count, per_chunk):
+                n = min(per_chunk, count - start)
+                yield (b"\n" if start else b"") + b"\n".join([line] * n)
+
+        return self.cached("repeated_lines", {"count": count, "line": line.decode()}, build)
+
+    def varied_lines(self, count: int, min_length: int = 20,
+                     max_length: int = 120) -> Workload:
+        """count lines of random lowercase, each min_length..max_length long."""
+        def build(rng: random.Random) -> Iterator[bytes]:
+            per_chunk = max(1, CHUNK_SIZE // (max_length + 1))
+            for start in range(0, count, per_chunk):
+                lengths = [rng.randint(min_length, max_length)
+                           for _ in range(min(per_chunk, count - start))]
+                text = self.random_bytes(rng, LOWERCASE, sum(lengths))
+                lines, offset = [], 0
+                for length in lengths:
+                    lines.append(text[offset:offset + length])
+                    offset += length
+                yield (b"\n" if start else b"") + b"\n".join(lines)
+
+        return self.cached("varied_lines",
+                           {"count": count, "min": min_length, "max": max_length}, build)
+
+    def numbered_lines(self, count: int) -> Workload:
+        """count lines of a right-aligned line number and 70 x's."""
+        def build(rng: random.Random) -> Iterator[bytes]:
+            per_chunk = CHUNK_SIZE // 80
+            filler = "x" * 70
+            for start in range(1, count + 1, per_chunk):
+                end = min(start + per_chunk, count + 1)
+                yield (b"\n" if start > 1 else b"") + "\n".join(
+                    f"{i:6d}: {filler}" for i in range(start, end)).encode()
+
+        return self.cached("numbered_lines", {"count": count}, build)
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """
-Tiny MCP client used by the `bossterm` CLI. Speaks the SSE-based transport
-used by the Kotlin MCP SDK 0.8.3 that BossTerm currently ships with.
+Tiny MCP client used by the `bossterm` CLI. Speaks the Streamable HTTP
+endpoint BossTerm mounts at `/mcp`, and falls back to the SSE-based
+transport of the Kotlin MCP SDK 0.8.3 when a build doesn't have it.
 
 Stdlib only — must run on whatever Python 3 ships with macOS / a typical
 Linux. Don't add dependencies here.
 
-Subcommands:
+Subcommands (<port> may be `auto`: find the server the way `discover` does,
+or use `$BOSSTERM_MCP_PORT` when set, and run the command on the session the
+discovery handshake already opened — one process, one handshake):
   bossterm-mcp.py call <port> <tool_name> <args_json>
       One-shot tool call. Prints the first TextContent.text from the result
       to stdout. Exit non-zero on error (and prints the error to stderr).
@@ -15,7 +18,118 @@ Subcommands:
       Returns 0 if a BossTerm MCP server appears to be reachable on that
       port (initialize handshake completes), 1 otherwise.
 
-Transport summary (SDK 0.8.3 quirk):
+  bossterm-mcp.py discover [base_port] [--window N]
+      Prints the first port in base_port .. base_port+N-1 (default: the
+      configured settings.mcpPort and a 10-port window) that answers the
+      MCP handshake, trying the `~/.bossterm/mcp.port` marker first. All
+      candidates are connected to and handshaken with concurrently on one
+      event loop. Exit 1 if none answers.
+
+  bossterm-mcp.py call-batch <port> [--ordered] [--call-timeout SEC]
+                             [--deadline SEC] [--jobs N] [--stats]
+      Reads JSONL `{"tool": ..., "args": {...}[, "timeout": SEC]}` records
+      from stdin and pipelines them over one session with unique request
+      ids. Writes one JSONL result per record (`index`, `tool`, `ok`, then
+      `result` or `error`) in completion order, or input order with
+      `--ordered`. `--stats` prints the connection pool's counters to
+      stderr afterwards. Exit 1 if any call failed.
+
+  bossterm-mcp.py fanout <port> <tool_name> [args_json] [--tabs] [--jobs N]
+                         [--call-timeout SEC]
+      Lists tabs (and, unless `--tabs`, every tab's panes) once, then calls
+      the tool on each target concurrently over one session, at most N at
+      a time (default 16). `args_json` is a template; `tab_id` and
+      `pane_id` are filled in per target. Writes one JSONL line per call
+      as it completes (`tab_id`, `pane_id`, `ok`, then `result` or
+      `error`). Exit 1 if any call failed.
+
+  bossterm-mcp.py xargs <port> [-P N] [-a FILE] [--tab ID] [--pane ID]...
+                        [--panel MODE] [--working-dir DIR] [--timeout-ms MS]
+                        [--split-ratio R] [--no-output] [--summary]
+      Runs shell commands, one per line of stdin (or FILE), through
+      run_command in N panes at once (default 4): the --pane ones, the
+      tab's run_command scratch pane, then new splits (or, with
+      `--panel new_tab`, new tabs), where they can be watched. Each pane
+      takes the next command as soon as it's idle. Writes one JSONL line
+      per command as it finishes (`index`, `command`, `tab_id`, `pane_id`,
+      `started_ms`, `ok`, `exit_code`, `duration_ms`, `output`), then the
+      makespan and each pane's utilization on stderr (or as a last
+      `{"summary": ...}` line). Exit 123 if any command failed, like xargs.
+
+  bossterm-mcp.py wait-for <port> <tab_id> <regex> [--timeout SEC] [-i]
+                           [--max-interval SEC]
+      Blocks until a line of PTY output produced from now on in the tab
+      matches the regex, then prints that line (escape sequences
+      stripped). Polls read_debug_console incrementally (`since_index`,
+      PTY_OUTPUT only), every 5 ms while output flows and backing off to
+      `--max-interval` (default 0.25 s) while the tab is idle. Exit 1 on
+      timeout, 2 on an invalid regex.
+
+  bossterm-mcp.py follow <port> <tab_id> [--since INDEX] [--lines N] [--plain]
+                         [--json] [--source NAME]... [--max-interval SEC]
+      Streams the tab's PTY output to stdout as it is produced, like
+      `tail -f`, until interrupted; `--lines N` first prints the last N
+      lines of scrollback. Polls like `wait-for`, reading only
+      chunks after the last index seen, so memory stays flat. When the
+      debug ring buffer drops chunks before they are read, it reports
+      the lost index range on stderr (and as a `{"gap": ...}` line with
+      `--json`) and carries on from the oldest chunk still held.
+
+  bossterm-mcp.py export <port> <tab_id> <file> [--pane ID] [--restart]
+                         [--compress auto|none|gzip|xz] [--page-lines N]
+      Writes the tab's whole scrollback to <file>, oldest line first,
+      paging through read_scrollback (`start`) so memory stays flat.
+      Compresses by suffix (.gz, .xz) unless told otherwise. Checkpoints
+      to <file>.export-state as it goes; rerun the same command after an
+      interruption to resume, or pass --restart to start over.
+
+  bossterm-mcp.py grep <port> <tab_id> [PATTERN] [-e PATTERN]... [-f FILE]
+                       [-FiwxvncqH] [-m NUM] [--pane ID] [--jobs N] [--no-cache]
+      Searches the pane's scrollback with grep's options and output and
+      exit status (0 match, 1 none, 2 error); patterns are Python regexes,
+      and a line is selected if any matches. Keeps a copy of the settled
+      history under ~/.bossterm/cache/scrollback and only fetches lines
+      added since the previous run, so running many searches over one
+      busy pane costs one download, not one server-side scan each.
+
+  bossterm-mcp.py complete <tabs|panes|tools> [tab_id] [--describe]
+      Prints cached tab ids, pane ids (of one tab, or all) or tool names,
+      one per line, for shell completion. Never touches the network: it
+      reads ~/.bossterm/cache/completion.json, trusted only while the port
+      marker still names the server that wrote it, and when that is over
+      10 s old (or another server's) starts `refresh-cache auto` in the
+      background for the next keystroke.
+
+  bossterm-mcp.py refresh-cache <port>
+      Fetches list_tabs, list_panes for every tab, and tools/list on one
+      session and rewrites the completion cache.
+
+  bossterm-mcp.py serve [--idle-timeout SEC]
+      Resident broker. Listens on a Unix-domain socket
+      (`~/.bossterm/mcp-broker.sock`) and keeps one initialized session per
+      port alive, reconnecting when the server restarts. While it runs,
+      `call` and `ping` route through it and skip the SSE handshake; when it
+      isn't running they fall back to the one-shot path. Set
+      `BOSSTERM_MCP_NO_BROKER=1` to force the one-shot path.
+
+Library use: `import bossterm_mcp` (cli-resources/bossterm_mcp.py loads
+this file under that name) gives `Client` and `AsyncClient`, which hold one
+session and have typed methods for the built-in tools. See "Library API"
+below.
+
+Every subcommand but `serve` also takes `--trace` (per-phase timings as one
+JSON line on stderr) or `--trace-file FILE` (append the line to FILE);
+`$BOSSTERM_MCP_TRACE` turns tracing on without flags. See "Tracing" below.
+
+Transport negotiation: every session first POSTs `initialize` to `/mcp`.
+A 200 with an `mcp-session-id` header means Streamable HTTP (JSON-response
+mode): each request is one POST carrying that header, whose response body
+is the JSON-RPC response, and closing the session sends a DELETE. Any other
+answer (404 on builds without `/mcp`) falls back to SSE below.
+`$BOSSTERM_MCP_TRANSPORT` pins the choice: `streamable`, `sse` or `auto`
+(the default).
+
+SSE transport summary (SDK 0.8.3 quirk):
   - GET / with Accept: text/event-stream → server emits an `endpoint`
     SSE event whose data line is the session-scoped POST URL. (The Kotlin
     MCP SDK 0.8.3 mounts the SSE endpoint at the application root, not
@@ -25,284 +139,4012 @@ Transport summary (SDK 0.8.3 quirk):
   - POST `notifications/initialized` (no response expected).
   - POST `tools/call` with `{name, arguments}` → response on SSE stream.
 
-DNS-rebinding defense in the server only accepts loopback Host headers, so
-every request sets `Host: 127.0.0.1` explicitly.
-"""
+DNS-rebinding defense in the server only accepts loopback Host headers, so
+every request sets `Host: 127.0.0.1` explicitly.
+
+The transport is asyncio all the way down: a minimal HTTP/1.1 client on
+`asyncio.open_connection`, an incremental SSE parser, and a pool of
+keep-alive connections (keyed by host:port) that every POST in the process
+shares. One process-wide event loop (in a daemon thread) drives every
+session, and `McpSession` is the blocking facade the
+subcommands and the broker use.
+
+Startup matters more than throughput for most invocations: the bash CLI
+starts a helper process per command and per completion. So `call`, `ping`
+and `discover` first try `BlockingMcpSession` (Streamable HTTP on a plain
+socket), asyncio is only imported by the commands that reach the event
+loop, and the positional-only invocations the CLI makes skip argparse.
+The CLI also runs this file through `$MCP_HELPER_LOADER`, which caches its
+bytecode. benchmark/benchmark_startup.py holds this to a budget.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import weakref
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from concurrent.futures import Future
+    from queue import Queue
+    from typing import Callable
+
+
+class _DeferredModule:
+    """Stands in for a module global; the first attribute access imports the
+    module and puts it in the global's place.
+
+    Every CLI invocation pays for what is imported at the top of this file,
+    and asyncio (with the ssl, concurrent.futures and logging it pulls in)
+    is several times the cost of the rest put together. The commands the
+    bash CLI runs on every invocation don't touch it: the broker, the
+    completion cache and BlockingMcpSession are plain sockets and files.
+    Other stdlib modules a single command needs are imported where used.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        __import__(self._name)  # under the import lock: safe from any thread
+        module = sys.modules[self._name]
+        globals()[self._name] = module
+        return getattr(module, attr)
+
+
+asyncio = _DeferredModule("asyncio")
+
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+CLIENT_NAME = "bossterm-cli"
+CLIENT_VERSION = "1.0"
+
+# Per-call connect/read budget. Keep tight — the CLI is human-facing.
+SSE_OPEN_TIMEOUT_SEC = 3.0
+RPC_RESPONSE_TIMEOUT_SEC = 10.0
+
+# Resident broker (`serve`). The socket lives next to settings.json; the
+# client side treats "socket missing / refused" as "no broker" and falls
+# back to the one-shot path.
+BROKER_SOCKET_PATH = os.path.join(
+    os.path.expanduser("~"), ".bossterm", "mcp-broker.sock"
+)
+BROKER_CONNECT_TIMEOUT_SEC = 0.5
+
+# Port discovery (`discover`). Mirrors BossTermMcpManager: the server binds
+# settings.mcpPort (default 7676) or, if busy, the next free port in a
+# 10-port window, and publishes the bound port in ~/.bossterm/mcp.port
+# (only while mcpRunCommandPreferredShell is on).
+BOSSTERM_DIR = os.path.join(os.path.expanduser("~"), ".bossterm")
+SETTINGS_PATH = os.path.join(BOSSTERM_DIR, "settings.json")
+PORT_MARKER_PATH = os.path.join(BOSSTERM_DIR, "mcp.port")
+DEFAULT_MCP_PORT = 7676
+PORT_WINDOW = 10
+TCP_PROBE_TIMEOUT_SEC = 0.25
+
+
+# ---------------------------------------------------------------------------
+# HTTP/1.1 over asyncio streams
+# ---------------------------------------------------------------------------
+#
+# Just enough HTTP for a loopback MCP server: a request line and headers
+# out; a status line, headers and a Content-Length / chunked / read-to-EOF
+# body back. No TLS, proxies or redirects. Hand-rolled so one event loop
+# can hold many SSE streams and keep-alive POST connections open at once
+# without a thread per stream.
+
+
+class PostNotDelivered(ConnectionError):
+    """A POST never reached a live session (refused, or rejected with 4xx/5xx).
+
+    The server didn't run the request, so retrying it on a fresh session
+    is safe even for tools that aren't idempotent.
+    """
+
+
+class HttpConnection:
+    """One HTTP/1.1 connection to 127.0.0.1:<port>, reusable while keep-alive."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.keep_alive = False
+        # False from send() until the first byte of the response arrives: a
+        # failure in that window on a reused connection means the server
+        # closed it while idle, not that it choked on the request.
+        self.response_started = False
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def reusable(self) -> bool:
+        """Connected, kept alive by the last response, and not closed by the peer since."""
+        return (
+            self.keep_alive
+            and self._writer is not None
+            and not self._writer.is_closing()
+            and not self._reader.at_eof()
+        )
+
+    async def connect(self, timeout: float) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection("127.0.0.1", self.port), timeout
+        )
+
+    async def send(self, method: str, target: str, headers: dict, body: bytes = b"") -> None:
+        self.response_started = False
+        self._writer.write(_request_head(method, target, headers, body) + body)
+        await self._writer.drain()
+
+    async def read_head(self) -> tuple[int, dict[str, str]]:
+        """Status code and lower-cased headers of the next response."""
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed before a response arrived")
+        self.response_started = True
+        version, status = _status_line(line)
+        headers: dict[str, str] = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            _add_header(headers, line)
+        self.keep_alive = _keeps_alive(version, status, headers)
+        return status, headers
+
+    async def body(self, status: int, headers: dict[str, str]):
+        """Yield the response body as it arrives, chunked encoding removed."""
+        if status in (204, 304) or 100 <= status < 200:
+            return
+        if _is_chunked(headers):
+            while True:
+                size_line = await self._reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    return
+                yield await self._reader.readexactly(size)
+                await self._reader.readexactly(2)  # CRLF after the chunk
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length:
+                yield await self._reader.readexactly(length)
+        else:
+            while True:
+                chunk = await self._reader.read(65536)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def request(
+        self, method: str, target: str, headers: dict, body: bytes = b""
+    ) -> tuple[int, dict[str, str], bytes]:
+        await self.send(method, target, headers, body)
+        status, response_headers = await self.read_head()
+        data = b"".join([chunk async for chunk in self.body(status, response_headers)])
+        return status, response_headers, data
+
+    def close(self) -> None:
+        self.keep_alive = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _request_head(method: str, target: str, headers: dict, body: bytes) -> bytes:
+    lines = [f"{method} {target} HTTP/1.1", "Host: 127.0.0.1"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    if body or method == "POST":
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _status_line(line: bytes) -> tuple[str, int]:
+    parts = line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ConnectionError(f"malformed status line: {line[:80]!r}")
+    return parts[0], int(parts[1])
+
+
+def _add_header(headers: dict[str, str], line: bytes) -> None:
+    name, _, value = line.decode("latin-1").partition(":")
+    headers[name.strip().lower()] = value.strip()
+
+
+def _keeps_alive(version: str, status: int, headers: dict[str, str]) -> bool:
+    framed = "content-length" in headers or _is_chunked(headers)
+    return (
+        version == "HTTP/1.1"
+        and headers.get("connection", "").lower() != "close"
+        and (framed or status in (204, 304))
+    )
+
+
+def _is_chunked(headers: dict[str, str]) -> bool:
+    return "chunked" in headers.get("transfer-encoding", "").lower()
+
+
+class SseParser:
+    """Incremental SSE framer: feed body bytes, get complete (event, data) pairs.
+
+    Works on one bytearray without decoding lines. Line ends are found
+    with `find`, resuming where the previous chunk's scan stopped, so a
+    multi-megabyte `data:` line arriving in many chunks is scanned once.
+    Each data line is copied out of the buffer exactly once (through a
+    memoryview), and `data` is returned as bytes; only the short event
+    name is decoded.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scan = 0  # buffer offset the next newline search starts from
+        self._event = "message"
+        self._data: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> list[tuple[str, bytes]]:
+        buffer = self._buffer
+        buffer += chunk
+        events = []
+        pos = 0  # start of the current line
+        with memoryview(buffer) as view:
+            while True:
+                end = buffer.find(b"\n", max(pos, self._scan))
+                if end < 0:
+                    break
+                line_end = end - 1 if end > pos and buffer[end - 1] == 0x0D else end
+                if line_end == pos:
+                    if self._data:
+                        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+                        events.append((self._event, data))
+                    self._event = "message"
+                    self._data = []
+                elif buffer.startswith(b"data:", pos):
+                    start = pos + 5
+                    if buffer.startswith(b" ", start):
+                        start += 1
+                    self._data.append(bytes(view[start:line_end]))
+                elif buffer.startswith(b"event:", pos):
+                    self._event = bytes(view[pos + 6:line_end]).decode("utf-8", "replace").strip()
+                # Ignore comments (`:`) and id:/retry: for our purposes.
+                pos = end + 1
+        self._scan = len(buffer) - pos
+        del buffer[:pos]
+        return events
+
+
+# JSON-RPC ids, peeked at without decoding the message. The Kotlin SDK
+# writes `id` either first (optionally after `jsonrpc`) or last; matching
+# only those anchored positions can't pick up an `id` key nested inside
+# `result`, and ids inside string values are escaped (`\"id\"`) anyway.
+_ID_VALUE = rb'(-?\d+|"(?:[^"\\]|\\.)*")'
+_LEADING_ID = re.compile(
+    rb'\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?"id"\s*:\s*' + _ID_VALUE
+)
+_TRAILING_ID = re.compile(
+    rb',\s*"id"\s*:\s*' + _ID_VALUE + rb'\s*(?:,\s*"jsonrpc"\s*:\s*"2\.0"\s*)?\}\s*$'
+)
+# How far from the end the trailing `id` can start, generously.
+_TRAILING_ID_WINDOW = 256
+
+
+def peek_id(data: bytes) -> int | str | None:
+    """The top-level JSON-RPC id of an encoded message, or None if not cheaply found."""
+    match = _LEADING_ID.match(data)
+    if match is None:
+        match = _TRAILING_ID.search(data, max(0, len(data) - _TRAILING_ID_WINDOW))
+    if match is None:
+        return None
+    return json.loads(match.group(1))
+
+
+# ---------------------------------------------------------------------------
+# Keep-alive connection pool
+# ---------------------------------------------------------------------------
+
+# Connections the pool keeps open per host:port at once. Requests beyond
+# this queue for a free connection. Over SSE a POST only waits for the 202,
+# so a few connections keep many calls in flight; over Streamable HTTP a
+# connection is held for the whole call, so this also caps calls in flight.
+POOL_MAX_PER_HOST = 8
+# An idle connection older than this is closed at checkout instead of
+# reused, well inside the idle timeouts HTTP servers typically apply.
+POOL_IDLE_TIMEOUT_SEC = 15.0
+
+
+class ConnectionPool:
+    """Keep-alive HttpConnections keyed by host:port, shared by every session on a loop.
+
+    A session's POST URL never changes, so after the first POST every
+    request to that server (from any session in the process) reuses an
+    idle connection instead of paying a TCP connect and teardown. Counters
+    record connections opened vs reused, stale ones dropped at checkout,
+    and requests retried after a stale connection slipped through.
+    """
+
+    def __init__(self, max_per_host: int = POOL_MAX_PER_HOST):
+        self.max_per_host = max_per_host
+        self.opened = 0
+        self.reused = 0
+        self.stale = 0
+        self.retried = 0
+        self._idle: dict[tuple[str, int], list[tuple[HttpConnection, float]]] = {}
+        self._count: dict[tuple[str, int], int] = {}
+        self._waiters: dict[tuple[str, int], list[asyncio.Future]] = {}
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "opened": self.opened,
+            "reused": self.reused,
+            "stale": self.stale,
+            "retried": self.retried,
+        }
+
+    async def _checkout(self, port: int) -> tuple[HttpConnection, bool]:
+        """An idle connection if a live one exists, else a new one. Second value: reused."""
+        key = ("127.0.0.1", port)
+        while True:
+            idle = self._idle.setdefault(key, [])
+            now = time.monotonic()
+            while idle:
+                conn, since = idle.pop()
+                if conn.reusable and now - since < POOL_IDLE_TIMEOUT_SEC:
+                    self.reused += 1
+                    return conn, True
+                # The server closed it while it sat idle, or it sat too long.
+                self.stale += 1
+                self._discard(key, conn)
+            if self._count.get(key, 0) < self.max_per_host:
+                self._count[key] = self._count.get(key, 0) + 1
+                conn = HttpConnection(port)
+                try:
+                    await conn.connect(SSE_OPEN_TIMEOUT_SEC)
+                except BaseException as e:
+                    self._discard(key, conn)
+                    if isinstance(e, (OSError, asyncio.TimeoutError)):
+                        reason = e or "connect timed out"
+                        raise PostNotDelivered(f"connect to 127.0.0.1:{port} failed: {reason}")
+                    raise
+                self.opened += 1
+                return conn, False
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(key, []).append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters[key]:
+                    self._waiters[key].remove(waiter)
+
+    def _checkin(self, conn: HttpConnection) -> None:
+        key = ("127.0.0.1", conn.port)
+        if conn.reusable:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            self._wake(key)
+        else:
+            self._discard(key, conn)
+
+    def _discard(self, key: tuple[str, int], conn: HttpConnection) -> None:
+        conn.close()
+        self._count[key] -= 1
+        self._wake(key)
+
+    def _wake(self, key: tuple[str, int]) -> None:
+        for waiter in self._waiters.get(key, []):
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def request(
+        self, port: int, method: str, target: str, headers: dict, body: bytes = b"",
+        idempotent: bool = False,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """One request over a pooled connection.
+
+        If a reused connection dies before any response byte arrives, the
+        server most likely closed it while idle. Idempotent requests are
+        retried once on a fresh connection. Anything else raises, because
+        the server may have acted on it.
+        """
+        while True:
+            conn, reused = await self._checkout(port)
+            try:
+                response = await conn.request(method, target, headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self._discard(("127.0.0.1", port), conn)
+                if reused and idempotent and not conn.response_started:
+                    self.retried += 1
+                    continue
+                raise
+            except BaseException:
+                # Cancelled or failed mid-request: the connection state is unknown.
+                self._discard(("127.0.0.1", port), conn)
+                raise
+            self._checkin(conn)
+            return response
+
+
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def connection_pool(loop: asyncio.AbstractEventLoop | None = None) -> ConnectionPool:
+    """The ConnectionPool for `loop` (default: the running loop)."""
+    loop = loop or asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = ConnectionPool()
+    return pool
+
+
+# ---------------------------------------------------------------------------
+# MCP session (asyncio core)
+# ---------------------------------------------------------------------------
+
+
+# Streamable HTTP endpoint (StreamableMcpSessions.kt). JSON-response mode:
+# each POST's response body is the JSON-RPC response.
+STREAMABLE_PATH = "/mcp"
+# Budget for the DELETE that ends a Streamable HTTP session on close.
+STREAMABLE_DELETE_TIMEOUT_SEC = 0.5
+
+POST_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+}
+
+# Tools that only read state. A POST for one of these may be retried after
+# a keep-alive connection dies under it; write tools never are.
+READ_ONLY_TOOLS = frozenset({
+    "list_tabs", "get_active_tab", "list_panes", "read_scrollback",
+    "search_output", "get_last_command", "read_debug_console",
+})
+
+
+def streamable_headers(session_id: str | None, protocol_version: str) -> dict:
+    headers = dict(POST_HEADERS)
+    if session_id is not None:
+        headers["mcp-session-id"] = session_id
+        headers["mcp-protocol-version"] = protocol_version
+    return headers
+
+
+def streamable_response(request_id: int, headers: dict[str, str], payload: bytes) -> dict | None:
+    """Pick our response out of a JSON body, a JSON batch, or an SSE body."""
+    if headers.get("content-type", "").startswith("text/event-stream"):
+        parser = SseParser()
+        messages = [data for _, data in parser.feed(payload + b"\n\n")]
+    else:
+        messages = [payload]
+    for data in messages:
+        try:
+            decoded = json.loads(data)
+        except ValueError:
+            continue
+        for msg in decoded if isinstance(decoded, list) else [decoded]:
+            if isinstance(msg, dict) and msg.get("id") == request_id:
+                return msg
+    return None
+
+
+class McpError(RuntimeError):
+    """The server answered a request with a JSON-RPC error."""
+
+    def __init__(self, message: str, code: object = None):
+        super().__init__(message)
+        self.code = code
+
+
+def unwrap_response(msg: dict) -> dict:
+    """Return a JSON-RPC response's result, raising McpError on an error response."""
+    if "error" in msg:
+        err = msg["error"]
+        raise McpError(
+            f"JSON-RPC error {err.get('code', '?')}: {err.get('message', '')}",
+            err.get("code"),
+        )
+    return msg.get("result", {})
+
+
+class AsyncMcpSession:
+    """One initialized MCP session over SSE, driven entirely by the event loop.
+
+    A stream task reads the SSE body and resolves the Future registered
+    for each response id; POSTs go out over a few keep-alive connections.
+    Everything else on the stream (notifications, server-initiated
+    requests) goes to `notifications`, followed by `None` once the stream
+    ends. Create with `await AsyncMcpSession.open(port)`, and only touch
+    it from the loop it was opened on.
+    """
+
+    transport = "sse"
+
+    def __init__(self, port: int):
+        self.port = port
+        self.post_url = ""
+        self.notifications: asyncio.Queue = asyncio.Queue()
+        self.error: str | None = None
+        self._post_target = ""
+        self._endpoint = asyncio.get_running_loop().create_future()
+        self._pending: dict[object, asyncio.Future] = {}
+        self._next_id = 1
+        self._stream: HttpConnection | None = None
+        self._stream_task: asyncio.Task | None = None
+        # perf_counter() at each step of opening: open, connected,
+        # stream_head, endpoint, initialized, ready. Read by `--trace`.
+        self.marks: dict[str, float] = {"open": time.perf_counter()}
+
+    @classmethod
+    async def open(
+        cls, port: int, connect_timeout: float = SSE_OPEN_TIMEOUT_SEC
+    ) -> AsyncMcpSession:
+        """Open the SSE stream, then run the initialize handshake."""
+        session = cls(port)
+        try:
+            try:
+                await asyncio.wait_for(session._open_stream(connect_timeout), SSE_OPEN_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                raise TimeoutError("timed out waiting for SSE endpoint event")
+            await session.initialize()
+        except BaseException:
+            session.close()
+            raise
+        return session
+
+    async def _open_stream(self, connect_timeout: float) -> None:
+        conn = HttpConnection(self.port)
+        self._stream = conn
+        try:
+            await conn.connect(connect_timeout)
+            self.marks["connected"] = time.perf_counter()
+            # SDK 0.8.3 mounts the SSE endpoint at root, not /sse.
+            await conn.send("GET", "/", {
+                "Accept": "text/event-stream",
+                "Cache-Control": "no-cache",
+            })
+            status, headers = await conn.read_head()
+            self.marks["stream_head"] = time.perf_counter()
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise ConnectionError(f"failed to open SSE stream: {e}")
+        if status != 200 or not headers.get("content-type", "").startswith("text/event-stream"):
+            raise ConnectionError(f"failed to open SSE stream: HTTP {status}, not an SSE endpoint")
+        self._stream_task = asyncio.ensure_future(self._read_stream(conn, status, headers))
+        data = await asyncio.shield(self._endpoint)
+        self.marks["endpoint"] = time.perf_counter()
+        # The endpoint event's data is the session-scoped URL (often a
+        # relative path like `/?sessionId=abc`). Make it absolute against
+        # the server, and keep the path+query for the request line.
+        from urllib.parse import urljoin, urlsplit
+
+        self.post_url = urljoin(f"http://127.0.0.1:{self.port}/", data)
+        parsed = urlsplit(self.post_url)
+        self._post_target = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    async def _read_stream(self, conn: HttpConnection, status: int, headers: dict) -> None:
+        parser = SseParser()
+        try:
+            async for chunk in conn.body(status, headers):
+                for event, data in parser.feed(chunk):
+                    self._dispatch(event, data)
+        except asyncio.CancelledError:
+            self._fail("SSE session closed")
+            raise
+        except Exception as e:
+            self._fail(f"SSE read failed: {e}")
+            return
+        finally:
+            conn.close()
+        # Server closed the stream (app quit, MCP toggled off). Wake every
+        # waiter now instead of letting them run out their timeouts.
+        self._fail("SSE stream closed by server")
+
+    def _dispatch(self, event: str, data: bytes) -> None:
+        if event == "endpoint":
+            if not self._endpoint.done():
+                self._endpoint.set_result(data.decode("utf-8", "replace"))
+            return  # a late endpoint event after the first is ignored
+        # Only decode what someone will read. A response whose id nobody is
+        # waiting for (it timed out) can be a multi-megabyte scrollback, so
+        # it's dropped undecoded. Server-initiated requests carry an id too,
+        # but also a "method" key; text inside a tool result has its quotes
+        # escaped, so the substring test only ever errs toward decoding.
+        request_id = peek_id(data)
+        if request_id is not None and request_id not in self._pending and b'"method"' not in data:
+            return
+        try:
+            msg = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(msg, dict):
+            return
+        if "id" in msg and ("result" in msg or "error" in msg):
+            future = self._pending.pop(msg["id"], None)
+            if future is not None and not future.done():
+                future.set_result(msg)
+            return  # else: nobody waiting any more (timed out) — discard
+        self.notifications.put_nowait(msg)
+
+    def _fail(self, error: str) -> None:
+        if self.error is not None:
+            return
+        self.error = error
+        if not self._endpoint.done():
+            self._endpoint.set_exception(ConnectionError(error))
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(error))
+        self.notifications.put_nowait(None)
+
+    @property
+    def alive(self) -> bool:
+        return self.error is None and self._stream_task is not None and not self._stream_task.done()
+
+    def next_id(self) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def expect(self, request_id: object) -> asyncio.Future:
+        """Register interest in a response. Call before POSTing the request."""
+        future = self._pending.get(request_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            if self.error is not None:
+                future.set_exception(ConnectionError(self.error))
+            else:
+                self._pending[request_id] = future
+        return future
+
+    def forget(self, request_id: object) -> None:
+        """Drop a registration (e.g. after a timeout). Late responses are discarded."""
+        self._pending.pop(request_id, None)
+
+    async def post(self, body: dict, idempotent: bool = False) -> None:
+        """POST one JSON-RPC message. The real response comes back on SSE."""
+        status, _, _ = await connection_pool().request(
+            self.port, "POST", self._post_target, POST_HEADERS,
+            json.dumps(body).encode("utf-8"), idempotent=idempotent,
+        )
+        # The SDK returns an immediate 202 Accepted (response goes via
+        # SSE). Surface non-2xx so callers can fail loudly.
+        if status >= 400:
+            raise PostNotDelivered(f"POST {self.post_url} returned HTTP {status}")
+
+    async def request(
+        self, method: str, params: dict,
+        timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC, idempotent: bool = False,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        """POST a JSON-RPC request and wait for its response on SSE.
+
+        With `marks`, records perf_counter() once the POST is accepted
+        ("posted") and once the response arrives ("responded").
+        """
+        request_id = self.next_id()
+        future = self.expect(request_id)
+
+        async def exchange() -> dict:
+            await self.post({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params,
+            }, idempotent)
+            if marks is not None:
+                marks["posted"] = time.perf_counter()
+            msg = await future
+            if marks is not None:
+                marks["responded"] = time.perf_counter()
+            return msg
+
+        try:
+            msg = await asyncio.wait_for(exchange(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"timed out waiting for response id={request_id}")
+        finally:
+            self.forget(request_id)
+        return unwrap_response(msg)
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
+        body = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            body["params"] = params
+        await self.post(body)
+
+    async def initialize(self) -> None:
+        await self.request("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": CLIENT_NAME, "version": CLIENT_VERSION},
+        }, idempotent=True)
+        self.marks["initialized"] = time.perf_counter()
+        await self.notify("notifications/initialized")
+        self.marks["ready"] = time.perf_counter()
+
+    async def call(
+        self, name: str, args: dict, timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        return await self.request(
+            "tools/call", {"name": name, "arguments": args}, timeout,
+            idempotent=name in READ_ONLY_TOOLS, marks=marks,
+        )
+
+    def close(self) -> None:
+        # Cancel rather than fail a pending endpoint: nobody awaits it once
+        # opening has given up, and a failed Future nobody reads is logged.
+        self._endpoint.cancel()
+        self._fail("SSE session closed")
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+        if self._stream is not None:
+            self._stream.close()
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+class StreamableUnavailable(ConnectionError):
+    """The server answered, but not with a Streamable HTTP `initialize`."""
+
+
+class StreamableMcpSession:
+    """One MCP session over Streamable HTTP (`/mcp`, JSON-response mode).
+
+    Every request is a plain POST whose HTTP response carries the JSON-RPC
+    response, so there is no stream to open and no reader task: a call is
+    one round trip on a pooled keep-alive connection. The server mints the
+    session id on `initialize` (`mcp-session-id`); every later request
+    carries it, and `aclose()` ends the session with a DELETE. Same
+    interface as AsyncMcpSession; only touch it from its loop.
+    """
+
+    transport = "streamable"
+
+    def __init__(self, port: int):
+        self.port = port
+        self.post_url = f"http://127.0.0.1:{port}{STREAMABLE_PATH}"
+        # Never fed: JSON-response mode has no server-initiated stream.
+        self.notifications: asyncio.Queue = asyncio.Queue()
+        self.error: str | None = None
+        self.session_id: str | None = None
+        self.protocol_version = MCP_PROTOCOL_VERSION
+        self._next_id = 1
+        self._closing: asyncio.Task | None = None
+        # perf_counter() at open, initialized and ready. Read by `--trace`.
+        self.marks: dict[str, float] = {"open": time.perf_counter()}
+
+    @classmethod
+    async def open(
+        cls, port: int, connect_timeout: float = SSE_OPEN_TIMEOUT_SEC
+    ) -> StreamableMcpSession:
+        """Run the initialize handshake. StreamableUnavailable: fall back to SSE."""
+        session = cls(port)
+        try:
+            try:
+                await asyncio.wait_for(session.initialize(), connect_timeout + RPC_RESPONSE_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                raise TimeoutError("timed out waiting for initialize response")
+        except BaseException:
+            session.close()
+            raise
+        return session
+
+    @property
+    def alive(self) -> bool:
+        return self.error is None and self._closing is None
+
+    def next_id(self) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def _headers(self) -> dict:
+        return streamable_headers(self.session_id, self.protocol_version)
+
+    async def post(self, body: dict, idempotent: bool = False) -> tuple[int, dict[str, str], bytes]:
+        if self.error is not None:
+            raise ConnectionError(self.error)
+        status, headers, payload = await connection_pool().request(
+            self.port, "POST", STREAMABLE_PATH, self._headers(),
+            json.dumps(body).encode("utf-8"), idempotent=idempotent,
+        )
+        if status == 404 and self.session_id is not None:
+            # Evicted (idle sweep, session cap) or the app restarted: the
+            # request never ran, and this session id is gone for good.
+            self.error = f"session {self.session_id} expired"
+            raise PostNotDelivered(f"POST {self.post_url} returned HTTP 404")
+        if status >= 400:
+            raise PostNotDelivered(f"POST {self.post_url} returned HTTP {status}")
+        return status, headers, payload
+
+    async def request(
+        self, method: str, params: dict,
+        timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC, idempotent: bool = False,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        """POST a JSON-RPC request; its response is the HTTP response body.
+
+        With `marks`, records perf_counter() once the response is in
+        ("responded").
+        """
+        request_id = self.next_id()
+        body = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        try:
+            status, headers, payload = await asyncio.wait_for(self.post(body, idempotent), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"timed out waiting for response id={request_id}")
+        if marks is not None:
+            marks["responded"] = time.perf_counter()
+        msg = streamable_response(request_id, headers, payload)
+        if msg is None:
+            raise ConnectionError(f"HTTP {status} carried no response for id={request_id}")
+        return unwrap_response(msg)
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
+        body = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            body["params"] = params
+        await self.post(body)
+
+    async def initialize(self) -> None:
+        body = {
+            "jsonrpc": "2.0",
+            "id": self.next_id(),
+            "method": "initialize",
+            "params": {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": CLIENT_NAME, "version": CLIENT_VERSION},
+            },
+        }
+        # Not self.post(): a refused connect must propagate as-is (nothing
+        # listens, so SSE would fail too); only an HTTP answer that isn't a
+        # Streamable HTTP session means "fall back". Older builds have no
+        # /mcp route at all and answer 404.
+        status, headers, payload = await connection_pool().request(
+            self.port, "POST", STREAMABLE_PATH, self._headers(),
+            json.dumps(body).encode("utf-8"), idempotent=True,
+        )
+        msg = streamable_response(body["id"], headers, payload) if status < 400 else None
+        session_id = headers.get("mcp-session-id")
+        if msg is None or not session_id:
+            raise StreamableUnavailable(f"POST {self.post_url}: HTTP {status} is not an MCP initialize response")
+        result = unwrap_response(msg)
+        self.session_id = session_id
+        self.protocol_version = result.get("protocolVersion") or MCP_PROTOCOL_VERSION
+        self.marks["initialized"] = time.perf_counter()
+        await self.notify("notifications/initialized")
+        self.marks["ready"] = time.perf_counter()
+
+    async def call(
+        self, name: str, args: dict, timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        return await self.request(
+            "tools/call", {"name": name, "arguments": args}, timeout,
+            idempotent=name in READ_ONLY_TOOLS, marks=marks,
+        )
+
+    async def aclose(self) -> None:
+        """End the session with a DELETE, so the server drops it right away."""
+        session_id, self.session_id = self.session_id, None
+        if self.error is None:
+            self.error = "session closed"
+        if session_id is None:
+            return
+        try:
+            await asyncio.wait_for(connection_pool().request(
+                self.port, "DELETE", STREAMABLE_PATH, {"mcp-session-id": session_id},
+            ), STREAMABLE_DELETE_TIMEOUT_SEC)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass  # the server's idle sweep reclaims it instead
+
+    def close(self) -> None:
+        """Non-blocking close: the DELETE goes out on the loop."""
+        if self._closing is None:
+            self._closing = asyncio.ensure_future(self.aclose())
+
+
+async def open_session(
+    port: int, connect_timeout: float = SSE_OPEN_TIMEOUT_SEC
+) -> AsyncMcpSession | StreamableMcpSession:
+    """An initialized session on `port`, over the transport `$BOSSTERM_MCP_TRANSPORT` picks.
+
+    `auto` (the default) tries Streamable HTTP first and falls back to SSE
+    when the server has no `/mcp` endpoint. A refused connection is not
+    retried over SSE: nothing is listening, so SSE would fail too.
+    """
+    mode = os.environ.get("BOSSTERM_MCP_TRANSPORT", "auto").lower()
+    if mode == "sse":
+        return await AsyncMcpSession.open(port, connect_timeout)
+    probe = time.perf_counter()
+    try:
+        return await StreamableMcpSession.open(port, connect_timeout)
+    except StreamableUnavailable:
+        if mode == "streamable":
+            raise
+    session = await AsyncMcpSession.open(port, connect_timeout)
+    session.marks["probe"] = probe
+    return session
+
+
+# ---------------------------------------------------------------------------
+# Sync facade
+# ---------------------------------------------------------------------------
+#
+# The CLI entrypoints and the broker's handler threads are plain blocking
+# code. They hand coroutines to one process-wide event loop running in a
+# daemon thread, so every session in the process shares that loop.
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop, started on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="bossterm-mcp-loop", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coro) -> Future:
+    """Schedule a coroutine on the shared loop; returns a concurrent Future."""
+    return asyncio.run_coroutine_threadsafe(coro, event_loop())
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared loop and block for its result."""
+    return submit(coro).result()
+
+
+class McpSession:
+    """Blocking handle on an async session, safe to share across threads.
+
+    Request ids come from the session's counter (1 is `initialize`), and
+    responses are matched by id (SSE) or come back on their own POST
+    (Streamable HTTP), so concurrent calls need no locking.
+    """
+
+    def __init__(self, port: int, aio: AsyncMcpSession | StreamableMcpSession | None = None):
+        self.port = port
+        self.aio = aio if aio is not None else run_sync(open_session(port))
+
+    @property
+    def transport(self) -> str:
+        return self.aio.transport
+
+    @property
+    def alive(self) -> bool:
+        return self.aio.alive
+
+    @property
+    def marks(self) -> dict[str, float]:
+        return self.aio.marks
+
+    def submit(
+        self, name: str, args: dict, timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC,
+        marks: dict[str, float] | None = None,
+    ) -> Future:
+        """Start a tool call without waiting; the Future yields its result."""
+        return submit(self.aio.call(name, args, timeout, marks))
+
+    def call(
+        self, name: str, args: dict, timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        return self.submit(name, args, timeout, marks).result()
+
+    def close(self) -> None:
+        # Waits (briefly) for a Streamable HTTP session's DELETE, so a
+        # one-shot process doesn't exit before it goes out.
+        try:
+            submit(self.aio.aclose()).result(STREAMABLE_DELETE_TIMEOUT_SEC + 0.5)
+        except Exception:
+            pass
+
+
+class BlockingMcpSession:
+    """A Streamable HTTP session on one blocking socket, for one-shot commands.
+
+    `call`, `ping` and `discover` without a broker open a session, make at
+    most one call and exit. That needs neither the event loop nor its
+    thread: initialize, the initialized notification, the call and the
+    closing DELETE go out in turn on one keep-alive connection, and asyncio
+    is never imported. Raises StreamableUnavailable like
+    StreamableMcpSession.open, so callers fall back to McpSession (and SSE).
+    Same call()/close() as McpSession, from one thread only.
+    """
+
+    transport = "streamable"
+
+    def __init__(self, port: int, connect_timeout: float = SSE_OPEN_TIMEOUT_SEC):
+        self.port = port
+        self.session_id: str | None = None
+        self.protocol_version = MCP_PROTOCOL_VERSION
+        self.marks: dict[str, float] = {"open": time.perf_counter()}
+        self._connect_timeout = connect_timeout
+        self._sock: socket.socket | None = None
+        self._next_id = 1
+        try:
+            self._initialize()
+        except BaseException:
+            self._disconnect()
+            raise
+
+    def _exchange(
+        self, method: str, headers: dict, body: bytes, timeout: float | None
+    ) -> tuple[int, dict[str, str], bytes]:
+        """One request and its whole response; reconnects if the last response closed."""
+        if self._sock is None:
+            # Not create_connection(): its getaddrinfo() imports the idna
+            # codec just to encode "127.0.0.1".
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(self._connect_timeout)
+                sock.connect(("127.0.0.1", self.port))
+            except BaseException:
+                sock.close()
+                raise
+            self._sock, self._reader = sock, sock.makefile("rb")
+        self._sock.settimeout(timeout)
+        self._sock.sendall(_request_head(method, STREAMABLE_PATH, headers, body) + body)
+        reader = self._reader
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("connection closed before a response arrived")
+        version, status = _status_line(line)
+        response_headers: dict[str, str] = {}
+        while True:
+            line = reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            _add_header(response_headers, line)
+        if status in (204, 304) or 100 <= status < 200:
+            payload = b""
+        elif _is_chunked(response_headers):
+            chunks = []
+            while True:
+                size = int(reader.readline().split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                chunks.append(reader.read(size))
+                reader.read(2)  # CRLF after the chunk
+            payload = b"".join(chunks)
+        elif "content-length" in response_headers:
+            payload = reader.read(int(response_headers["content-length"]))
+        else:
+            payload = reader.read()
+        if not _keeps_alive(version, status, response_headers):
+            self._disconnect()
+        return status, response_headers, payload
+
+    def _post(self, body: dict, timeout: float | None) -> tuple[int, dict[str, str], bytes]:
+        headers = streamable_headers(self.session_id, self.protocol_version)
+        try:
+            return self._exchange("POST", headers, json.dumps(body).encode("utf-8"), timeout)
+        except socket.timeout:
+            raise TimeoutError(f"timed out waiting for response id={body.get('id')}")
+
+    def _initialize(self) -> None:
+        body = {
+            "jsonrpc": "2.0",
+            "id": self._take_id(),
+            "method": "initialize",
+            "params": {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": CLIENT_NAME, "version": CLIENT_VERSION},
+            },
+        }
+        status, headers, payload = self._post(body, self._connect_timeout + RPC_RESPONSE_TIMEOUT_SEC)
+        msg = streamable_response(body["id"], headers, payload) if status < 400 else None
+        session_id = headers.get("mcp-session-id")
+        if msg is None or not session_id:
+            raise StreamableUnavailable(
+                f"POST http://127.0.0.1:{self.port}{STREAMABLE_PATH}: "
+                f"HTTP {status} is not an MCP initialize response"
+            )
+        result = unwrap_response(msg)
+        self.session_id = session_id
+        self.protocol_version = result.get("protocolVersion") or MCP_PROTOCOL_VERSION
+        self.marks["initialized"] = time.perf_counter()
+        status, _, _ = self._post(
+            {"jsonrpc": "2.0", "method": "notifications/initialized"}, RPC_RESPONSE_TIMEOUT_SEC
+        )
+        if status >= 400:
+            raise PostNotDelivered(f"notifications/initialized returned HTTP {status}")
+        self.marks["ready"] = time.perf_counter()
+
+    def _take_id(self) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def call(
+        self, name: str, args: dict, timeout: float | None = RPC_RESPONSE_TIMEOUT_SEC,
+        marks: dict[str, float] | None = None,
+    ) -> dict:
+        request_id = self._take_id()
+        body = {
+            "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": args},
+        }
+        status, headers, payload = self._post(body, timeout)
+        if marks is not None:
+            marks["responded"] = time.perf_counter()
+        if status >= 400:
+            raise PostNotDelivered(f"POST {STREAMABLE_PATH} returned HTTP {status}")
+        msg = streamable_response(request_id, headers, payload)
+        if msg is None:
+            raise ConnectionError(f"HTTP {status} carried no response for id={request_id}")
+        return unwrap_response(msg)
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+
+    def close(self) -> None:
+        """End the session with a DELETE (best effort, briefly) and disconnect."""
+        session_id, self.session_id = self.session_id, None
+        if session_id is not None:
+            try:
+                self._exchange(
+                    "DELETE", {"mcp-session-id": session_id}, b"", STREAMABLE_DELETE_TIMEOUT_SEC
+                )
+            except OSError:
+                pass  # the server's idle sweep reclaims it instead
+        self._disconnect()
+
+
+# ---------------------------------------------------------------------------
+# Port discovery
+# ---------------------------------------------------------------------------
+
+
+def configured_port() -> int:
+    """settings.mcpPort, or the default when unset/unreadable."""
+    try:
+        with open(SETTINGS_PATH) as f:
+            port = json.load(f).get("mcpPort")
+        return int(port) if port else DEFAULT_MCP_PORT
+    except (OSError, ValueError, TypeError, AttributeError):
+        return DEFAULT_MCP_PORT
+
+
+def marker_port() -> int | None:
+    """The bound port from ~/.bossterm/mcp.port, if the marker exists."""
+    try:
+        with open(PORT_MARKER_PATH) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def discovery_candidates(base: int, window: int = PORT_WINDOW) -> list[int]:
+    """The marker's port first (as a hint), then base .. base+window-1."""
+    candidates = list(range(base, base + window))
+    hint = marker_port()
+    if hint is not None:
+        if hint in candidates:
+            candidates.remove(hint)
+        candidates.insert(0, hint)
+    return candidates
+
+
+async def discover_async(
+    base: int, window: int = PORT_WINDOW
+) -> AsyncMcpSession | StreamableMcpSession | None:
+    """Find the live BossTerm MCP port and return an initialized session on it.
+
+    Preference order matches the old serial walk, but every candidate's
+    connect and handshake run concurrently on the loop; a closed port is
+    refused in well under TCP_PROBE_TIMEOUT_SEC. Returns None if nothing
+    answers.
+    """
+    attempts = [
+        asyncio.ensure_future(open_session(port, connect_timeout=TCP_PROBE_TIMEOUT_SEC))
+        for port in discovery_candidates(base, window)
+    ]
+    found = None
+    for attempt in attempts:
+        try:
+            found = await attempt
+            break
+        except Exception:
+            continue  # not BossTerm (or not MCP) — try the next one
+    # Close every other session that completed its handshake, now or
+    # later, so a losing port doesn't keep a stream or server session open.
+    for attempt in attempts:
+        attempt.add_done_callback(_close_unless(found))
+    return found
+
+
+def _close_unless(keep: AsyncMcpSession | StreamableMcpSession | None):
+    def callback(attempt: asyncio.Future) -> None:
+        if attempt.cancelled() or attempt.exception() is not None:
+            return
+        if attempt.result() is not keep:
+            attempt.result().close()
+    return callback
+
+
+def discover(base: int, window: int = PORT_WINDOW) -> McpSession | None:
+    """Blocking `discover_async`; the session comes wrapped for sync callers."""
+    aio = run_sync(discover_async(base, window))
+    return McpSession(aio.port, aio) if aio is not None else None
+
+
+class ServerNotFound(RuntimeError):
+    """`auto` port resolution found no live BossTerm MCP server."""
+
+    def __init__(self):
+        super().__init__(
+            "BossTerm MCP server is not reachable. Is the app running with MCP enabled?"
+        )
+
+
+def port_arg(value: str) -> int | str:
+    """argparse type for <port>: a number, or `auto` to discover it."""
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        import argparse
+
+        raise argparse.ArgumentTypeError(f"expected a port number or 'auto', got {value!r}")
+
+
+def resolve_port_spec(port: int | str) -> int | str:
+    """Apply the `$BOSSTERM_MCP_PORT` override to an `auto` port.
+
+    Same contract as the bash CLI: when the variable is set only that port
+    is considered, so it's used as-is instead of being discovered.
+    """
+    override = os.environ.get("BOSSTERM_MCP_PORT")
+    if port == "auto" and override:
+        try:
+            return int(override)
+        except ValueError:
+            pass
+    return port
+
+
+def connect(port: int | str) -> McpSession:
+    """Initialized session on `port`, or on the discovered port for `auto`.
+
+    For `auto` the session discovery handshook with is the one returned, so
+    resolving the port costs no extra round trips. An `auto` that
+    `$BOSSTERM_MCP_PORT` pinned to a port nothing answers on is
+    ServerNotFound too, as it would be had discovery come up empty.
+    """
+    resolved = resolve_port_spec(port)
+    if resolved != "auto":
+        try:
+            return McpSession(resolved)
+        except OSError:
+            if port != "auto":
+                raise
+            raise ServerNotFound() from None
+    session = discover(configured_port())
+    if session is None:
+        raise ServerNotFound()
+    return session
+
+
+def open_blocking(port: int, guess: bool = False) -> BlockingMcpSession | None:
+    """A BlockingMcpSession on `port`, or None where only McpSession will do.
+
+    None when the transport is pinned to SSE, when the server has no
+    Streamable HTTP endpoint, and, with `guess` (a port taken from the
+    marker rather than asked for), when nothing answers there either, so
+    that discovery can look further.
+    """
+    if os.environ.get("BOSSTERM_MCP_TRANSPORT", "auto").lower() == "sse":
+        return None
+    try:
+        return BlockingMcpSession(port, TCP_PROBE_TIMEOUT_SEC if guess else SSE_OPEN_TIMEOUT_SEC)
+    except StreamableUnavailable:
+        return None
+    except (OSError, McpError):
+        if guess:
+            return None
+        raise
+
+
+def connect_oneshot(port: int | str) -> BlockingMcpSession | McpSession:
+    """`connect` for a command that makes at most one call, skipping the event loop when it can."""
+    resolved = resolve_port_spec(port)
+    if resolved != "auto":
+        try:
+            session = open_blocking(resolved)
+        except OSError:
+            if port != "auto":
+                raise
+            raise ServerNotFound() from None
+    else:
+        hint = marker_port()
+        session = open_blocking(hint, guess=True) if hint is not None else None
+    return session if session is not None else connect(port)
+
+
+# ---------------------------------------------------------------------------
+# Output watching (`wait-for`, `follow`)
+# ---------------------------------------------------------------------------
+#
+# Built on read_debug_console's incremental polling: `since_index` returns
+# only chunks newer than the last one seen and `sources` keeps it to PTY
+# output, so an idle poll is a near-empty response and no scrollback is
+# ever rescanned. The interval snaps to WAIT_POLL_MIN_SEC whenever output
+# arrives and stretches by WAIT_POLL_BACKOFF per empty poll up to the cap,
+# so bursts are followed within a few ms and an idle tab costs ~4 tiny
+# requests a second.
+
+WAIT_POLL_MIN_SEC = 0.005
+WAIT_POLL_MAX_SEC = 0.25
+WAIT_POLL_BACKOFF = 1.5
+# Chunks per poll; the server clamps it to settings.debugMaxChunks.
+WAIT_MAX_CHUNKS = 1000
+# An unterminated line longer than this (a progress bar that never prints
+# a newline) is matched and then dropped rather than grown forever.
+WAIT_MAX_PARTIAL_CHARS = 65536
+
+_ANSI_ESCAPE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+
+
+def visible_text(line: str) -> str:
+    """A raw PTY line as displayed: escapes stripped, text after the last CR."""
+    return _ANSI_ESCAPE.sub("", line).rstrip("\r").rsplit("\r", 1)[-1]
+
+
+class OutputMatcher:
+    """Matches a regex against PTY output, one line at a time, fed in chunks.
+
+    Lines split across chunks are reassembled. The unterminated tail is
+    matched too, so a prompt like `Ready? ` is seen before its newline.
+    """
+
+    def __init__(self, pattern: re.Pattern):
+        self.pattern = pattern
+        self._partial = ""
+
+    def feed(self, data: str) -> str | None:
+        *lines, self._partial = (self._partial + data).split("\n")
+        for line in lines + [self._partial]:
+            text = visible_text(line)
+            if self.pattern.search(text):
+                return text
+        if len(self._partial) > WAIT_MAX_PARTIAL_CHARS:
+            self._partial = ""
+        return None
+
+
+class DebugConsoleTail:
+    """Adaptive `since_index` poller over one tab's debug console.
+
+    `poll()` is one request for the chunks after `since`. It also reports
+    the range of indexes lost before them: evicted from the ring buffer
+    (`oldestIndex` moved past `since`) or, with no `sources` filter, cut
+    by the server's takeLast(max_chunks). Filtering by source hides the
+    latter, since indexes are shared across sources. Holds no chunks
+    itself: memory stays flat however long it runs.
+    """
+
+    def __init__(
+        self, aio: AsyncMcpSession | StreamableMcpSession, tab_id: str,
+        sources: list[str] | None = None, max_interval: float = WAIT_POLL_MAX_SEC,
+        call_timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+    ):
+        self.aio = aio
+        self.tab_id = tab_id
+        self.sources = sources
+        self.max_interval = max(WAIT_POLL_MIN_SEC, max_interval)
+        self.call_timeout = call_timeout
+        # Last index seen; -1 means nothing yet (every chunk is new).
+        self.since = -1
+        self.polls = 0
+        self.debug_enabled = True
+        self._max_chunks = WAIT_MAX_CHUNKS
+        self._interval = WAIT_POLL_MIN_SEC
+
+    async def _read(self, args: dict) -> dict:
+        self.polls += 1
+        page = decode_tool_result(
+            "read_debug_console",
+            await self.aio.call("read_debug_console", {"tab_id": self.tab_id, **args}, self.call_timeout),
+        )
+        self.debug_enabled = page.get("stats", {}).get("debugEnabled", True)
+        return page
+
+    async def seek_newest(self) -> None:
+        """Skip everything recorded so far: only output from now on is read."""
+        page = await self._read({"max_chunks": 1, "omit_data": True})
+        self.since = page["stats"]["newestIndex"]
+
+    async def poll(self) -> tuple[list[dict], tuple[int, int] | None]:
+        """New chunks (oldest first), and the (first, last) indexes lost before them."""
+        while True:
+            args: dict = {"max_chunks": self._max_chunks}
+            if self.sources is not None:
+                args["sources"] = self.sources
+            if self.since >= 0:
+                args["since_index"] = self.since
+            page = await self._read(args)
+            chunks, stats = page["chunks"], page["stats"]
+            if chunks and "data" not in chunks[0] and self._max_chunks > 1:
+                # Over mcpMaxAnswerChars the server drops the data and
+                # returns metadata only; ask for fewer chunks at a time.
+                self._max_chunks = max(1, self._max_chunks // 2)
+                continue
+            break
+        if stats["newestIndex"] < self.since:
+            # The buffer restarted (tab recreated, app restarted): indexes
+            # begin again at 0, so everything it holds is new. Report it as
+            # an open-ended gap (last = -1) and re-read from the start.
+            restarted_after = self.since
+            self.since = -1
+            chunks, _ = await self.poll()
+            return chunks, (restarted_after + 1, -1)
+        gap = None
+        if self.since >= 0:
+            lost_to = stats["oldestIndex"] - 1
+            if chunks and self.sources is None:
+                lost_to = chunks[0]["index"] - 1
+            if lost_to > self.since:
+                gap = (self.since + 1, lost_to)
+        if chunks:
+            self.since = chunks[-1]["index"]
+            self._max_chunks = WAIT_MAX_CHUNKS
+            self._interval = WAIT_POLL_MIN_SEC
+        else:
+            self._interval = min(self.max_interval, self._interval * WAIT_POLL_BACKOFF)
+        return chunks, gap
+
+    @property
+    def interval(self) -> float:
+        """How long to sleep before the next poll."""
+        return self._interval
+
+
+class OutputWaiter:
+    """Polls one tab's debug console until new PTY output matches a regex."""
+
+    def __init__(
+        self, aio: AsyncMcpSession | StreamableMcpSession, tab_id: str, pattern: re.Pattern,
+        max_interval: float = WAIT_POLL_MAX_SEC, call_timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+    ):
+        self.tail = DebugConsoleTail(aio, tab_id, ["PTY_OUTPUT"], max_interval, call_timeout)
+        self.matcher = OutputMatcher(pattern)
+
+    @property
+    def polls(self) -> int:
+        return self.tail.polls
+
+    @property
+    def debug_enabled(self) -> bool:
+        return self.tail.debug_enabled
+
+    async def wait(self, timeout: float | None = None) -> str | None:
+        """The first matching line of output produced from now on; None on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        await self.tail.seek_newest()
+        while True:
+            chunks, _ = await self.tail.poll()
+            for chunk in chunks:
+                line = self.matcher.feed(chunk.get("data", ""))
+                if line is not None:
+                    return line
+            interval = self.tail.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                interval = min(interval, remaining)
+            await asyncio.sleep(interval)
+
+
+async def follow_output(
+    tail: DebugConsoleTail, emit: Callable[[dict], None],
+    on_gap: Callable[[tuple[int, int]], None], sources: frozenset = frozenset({"PTY_OUTPUT"}),
+) -> None:
+    """Stream new chunks of the given sources to `emit` until cancelled.
+
+    Polls with no source filter so index continuity exposes every gap,
+    then filters here. `emit` runs on the loop; a slow consumer (a blocked
+    stdout pipe) just delays the next poll rather than buffering.
+    """
+    while True:
+        chunks, gap = await tail.poll()
+        if gap is not None:
+            on_gap(gap)
+        for chunk in chunks:
+            if chunk["source"] in sources:
+                emit(chunk)
+        await asyncio.sleep(tail.interval)
+
+
+# ---------------------------------------------------------------------------
+# Scrollback paging (`export`, `grep`)
+# ---------------------------------------------------------------------------
+#
+# Pages through read_scrollback with `start` (oldest line first) and writes
+# each page straight to the file, so the client holds one page however long
+# the history is. Every EXPORT_CHECKPOINT_LINES the compressed member is
+# closed (gzip and xz both read concatenated members as one stream) and the
+# file length, next line and the last few lines written go to
+# `<file>.export-state`. Rerunning the same export truncates the file to
+# that length and carries on from there.
+#
+# Line numbers aren't stable: once history reaches bufferMaxLines, every new
+# line drops the oldest and shifts the rest up. So each page is requested
+# with the last EXPORT_ANCHOR_LINES lines already written in front of it,
+# and when they're not where they were, they're searched for further up.
+
+EXPORT_PAGE_LINES = 1000
+EXPORT_CHECKPOINT_LINES = 50_000
+EXPORT_ANCHOR_LINES = 8
+EXPORT_STATE_SUFFIX = ".export-state"
+EXPORT_COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "xz", ".lzma": "xz"}
+
+
+class ScrollbackError(RuntimeError):
+    """Paging through scrollback can't go on: a mismatched checkpoint or an older server."""
+
+
+def export_compression(path: str, requested: str = "auto") -> str:
+    """`requested`, or with "auto" the compression the file name implies."""
+    if requested != "auto":
+        return requested
+    return EXPORT_COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1].lower(), "none")
+
+
+def _open_member(raw, compression: str):
+    # Imported here: most invocations never export, and zlib/lzma are
+    # noticeable at startup.
+    if compression == "gzip":
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+    if compression == "xz":
+        import lzma
+        return lzma.LZMAFile(raw, mode="wb", preset=6)
+    return None
+
+
+def _write_json_atomic(path: str, obj) -> None:
+    """Replace `path` with `obj` as JSON, so a crash leaves the old or the new."""
+    tmp = path + ".tmp"
+    with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _ScrollbackPager:
+    """Paged read_scrollback (`start`) for one tab or pane, with re-anchoring."""
+
+    def __init__(
+        self, aio: AsyncMcpSession | StreamableMcpSession, tab_id: str, pane_id: str | None,
+        page_lines: int, call_timeout: float,
+    ):
+        self.aio = aio
+        self.tab_id = tab_id
+        self.pane_id = pane_id
+        self.page_lines = max(1, page_lines)
+        self.call_timeout = call_timeout
+        self.pages = 0
+
+    async def _page(self, start: int, count: int) -> dict:
+        while True:
+            self.pages += 1
+            page = decode_tool_result("read_scrollback", await self.aio.call(
+                "read_scrollback",
+                _tool_args(tab_id=self.tab_id, pane_id=self.pane_id, start=start, lines=count),
+                self.call_timeout,
+            ))
+            if "lines" not in page:
+                # Over mcpMaxAnswerChars a page read comes back as totals
+                # only; long lines, so smaller pages from here on.
+                if count == 1:
+                    raise ScrollbackError(f"line {start} alone exceeds the server's mcpMaxAnswerChars")
+                count = max(1, count // 2)
+                self.page_lines = min(self.page_lines, count)
+                continue
+            if page.get("start") != start:
+                raise ScrollbackError(
+                    "this BossTerm's read_scrollback can't page (no `start` argument); update BossTerm"
+                )
+            return page
+
+    async def _resync(self, anchor: list[str], next_line: int) -> int | None:
+        """Where the line after `anchor` is now, or None if it scrolled out."""
+        # Lines only ever move up (toward 0), so search upward from the old
+        # spot a page at a time, overlapping so the anchor can't straddle.
+        window_end = next_line
+        while True:
+            window_start = max(0, window_end - len(anchor) - self.page_lines)
+            lines = (await self._page(window_start, window_end - window_start))["lines"]
+            for i in range(len(lines) - len(anchor), -1, -1):
+                if lines[i:i + len(anchor)] == anchor:
+                    return window_start + i + len(anchor)
+            if window_start == 0:
+                return None
+            window_end = window_start + len(anchor) - 1
+
+
+class ScrollbackExporter(_ScrollbackPager):
+    """Writes one tab's (or pane's) scrollback to a file, resumably.
+
+    `run()` exports from where the last checkpoint left off (or line 0) to
+    the end of the buffer as it was when the export started, shifted along
+    with any lines trimmed from the top meanwhile. `gaps` counts the times
+    history scrolled past the export point, losing the lines in between;
+    the export then takes in everything the buffer holds at that moment.
+    """
+
+    def __init__(
+        self, aio: AsyncMcpSession | StreamableMcpSession, tab_id: str, path: str,
+        pane_id: str | None = None, compression: str = "auto",
+        page_lines: int = EXPORT_PAGE_LINES, checkpoint_lines: int = EXPORT_CHECKPOINT_LINES,
+        call_timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+    ):
+        super().__init__(aio, tab_id, pane_id, page_lines, call_timeout)
+        self.path = path
+        self.state_path = path + EXPORT_STATE_SUFFIX
+        self.compression = export_compression(path, compression)
+        self.checkpoint_lines = max(1, checkpoint_lines)
+        self.resumed_at: int | None = None
+        self.written = 0
+        self.gaps = 0
+
+    def _load_state(self) -> dict | None:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        expected = {"tab_id": self.tab_id, "pane_id": self.pane_id, "compression": self.compression}
+        for key, value in expected.items():
+            if state.get(key) != value:
+                raise ScrollbackError(
+                    f"{self.state_path} is for {key}={state.get(key)!r}, not {value!r}; "
+                    "pass --restart to start over"
+                )
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        _write_json_atomic(self.state_path, state)
+
+    async def run(self, restart: bool = False) -> None:
+        state = None if restart else self._load_state()
+        if state is None:
+            first = await self._page(0, 1)
+            state = {
+                "tab_id": self.tab_id, "pane_id": self.pane_id, "compression": self.compression,
+                "end": first["totalAvailable"], "next": 0, "bytes": 0, "anchor": [],
+            }
+            self._save_state(state)
+            mode = "wb"
+        elif not os.path.exists(self.path):
+            raise ScrollbackError(f"{self.path} is gone but {self.state_path} is not; pass --restart")
+        else:
+            self.resumed_at = state["next"]
+            mode = "r+b"
+        with open(self.path, mode) as raw:
+            raw.truncate(state["bytes"])
+            raw.seek(state["bytes"])
+            member = _open_member(raw, self.compression)
+            out = member if member is not None else raw
+            since_checkpoint = 0
+            try:
+                while state["next"] < state["end"]:
+                    anchor = state["anchor"]
+                    start = state["next"] - len(anchor)
+                    count = min(self.page_lines, state["end"] - state["next"]) + len(anchor)
+                    page = await self._page(start, count)
+                    lines = page["lines"]
+                    if lines[:len(anchor)] != anchor:
+                        moved_to = await self._resync(anchor, state["next"])
+                        if moved_to is None:
+                            # The anchor scrolled out of history, and some
+                            # unread lines with it (how many is unknowable).
+                            # Carry on from the oldest line left.
+                            self.gaps += 1
+                            state["end"] = page["totalAvailable"]
+                            state["next"] = 0
+                            state["anchor"] = []
+                        else:
+                            state["end"] -= state["next"] - moved_to
+                            state["next"] = moved_to
+                        continue
+                    fresh = lines[len(anchor):]
+                    if not fresh:
+                        # The buffer shrank (cleared) under us: nothing more to read.
+                        break
+                    out.write(("\n".join(fresh) + "\n").encode("utf-8"))
+                    state["next"] += len(fresh)
+                    state["anchor"] = lines[-EXPORT_ANCHOR_LINES:]
+                    self.written += len(fresh)
+                    since_checkpoint += len(fresh)
+                    if since_checkpoint >= self.checkpoint_lines:
+                        if member is not None:
+                            member.close()
+                        raw.flush()
+                        os.fsync(raw.fileno())
+                        state["bytes"] = raw.tell()
+                        self._save_state(state)
+                        member = _open_member(raw, self.compression)
+                        out = member if member is not None else raw
+                        since_checkpoint = 0
+            finally:
+                # On an interruption too: the member is still well-formed,
+                # and the checkpoint's length drops the part after it.
+                if member is not None:
+                    member.close()
+        try:
+            os.unlink(self.state_path)
+        except FileNotFoundError:
+            pass
+
+
+# `grep` keeps a local copy of each pane's settled scrollback under
+# GREP_CACHE_DIR, extended by the same anchored paging as `export`, so a
+# rerun reads only the lines added since the last one. The last
+# GREP_FRESH_LINES lines (the screen and just above it, which programs still
+# redraw) are never cached: they're read again on every run. Patterns are
+# combined into one alternation and matched in a single pass over the
+# cache; past GREP_PARALLEL_MIN_BYTES the file is split by byte range
+# across worker processes.
+
+GREP_CACHE_DIR = os.path.join(BOSSTERM_DIR, "cache", "scrollback")
+GREP_FRESH_LINES = 256
+# Caches not refreshed for this long (closed tabs, mostly) are removed.
+GREP_CACHE_MAX_AGE_SEC = 7 * 24 * 3600
+GREP_PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+GREP_MAX_JOBS = 8
+GREP_BLOCK_BYTES = 1024 * 1024
+
+
+class ScrollbackCache(_ScrollbackPager):
+    """A pane's scrollback on disk, refreshed incrementally.
+
+    After `refresh()`, the cache file holds the settled lines and `fresh`
+    the unsettled tail. Cache line k is buffer line `base + k`: `base`
+    goes negative as BossTerm trims history, and those leading lines are
+    no longer part of the pane (see `skip`) until the file is compacted.
+    """
+
+    def __init__(
+        self, aio: AsyncMcpSession | StreamableMcpSession, port: int, tab_id: str,
+        pane_id: str | None = None, cache_dir: str = GREP_CACHE_DIR,
+        page_lines: int = EXPORT_PAGE_LINES, call_timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+    ):
+        super().__init__(aio, tab_id, pane_id, page_lines, call_timeout)
+        key = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{port}-{tab_id}-{pane_id or 'focused'}")
+        self.cache_dir = cache_dir
+        self.lines_path = os.path.join(cache_dir, key + ".lines")
+        self.meta_path = os.path.join(cache_dir, key + ".json")
+        self.lock_path = os.path.join(cache_dir, key + ".lock")
+        self.meta: dict = {}
+        self.fresh: list[str] = []
+        self.fetched = 0
+        self.rebuilt = False
+
+    @property
+    def base(self) -> int:
+        return self.meta["base"]
+
+    @property
+    def skip(self) -> int:
+        """Leading cache lines BossTerm has since trimmed from history."""
+        return max(0, -self.meta["base"])
+
+    def _empty(self) -> dict:
+        return {"tab_id": self.tab_id, "pane_id": self.pane_id,
+                "base": 0, "next": 0, "lines": 0, "bytes": 0, "anchor": []}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if os.path.getsize(self.lines_path) >= meta["bytes"]:
+                return meta
+        except (OSError, ValueError, KeyError):
+            pass
+        return self._empty()
+
+    async def refresh(self) -> None:
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        with _locked(self.lock_path):
+            await self._refresh()
+        self._prune()
+
+    async def _refresh(self) -> None:
+        meta = self._load()
+        fd = os.open(self.lines_path, os.O_RDWR | os.O_CREAT, 0o600)
+        with open(fd, "r+b") as f:
+            f.truncate(meta["bytes"])
+            f.seek(meta["bytes"])
+            while True:
+                anchor, nxt = meta["anchor"], meta["next"]
+                page = await self._page(nxt - len(anchor), self.page_lines + len(anchor))
+                lines = page["lines"]
+                if lines[:len(anchor)] != anchor:
+                    moved_to = await self._resync(anchor, nxt)
+                    if moved_to is None:
+                        # Cleared, or trimmed past everything cached: not
+                        # the same history any more.
+                        meta = self._empty()
+                        f.seek(0)
+                        f.truncate()
+                        self.rebuilt = True
+                    else:
+                        meta["base"] -= nxt - moved_to
+                        meta["next"] = moved_to
+                    continue
+                total = page["totalAvailable"]
+                new = lines[len(anchor):]
+                settled = new[:max(0, total - GREP_FRESH_LINES - nxt)]
+                if settled:
+                    f.write(("\n".join(settled) + "\n").encode("utf-8"))
+                    meta["next"] += len(settled)
+                    meta["lines"] += len(settled)
+                    cut = len(anchor) + len(settled)
+                    meta["anchor"] = lines[max(0, cut - EXPORT_ANCHOR_LINES):cut]
+                    self.fetched += len(settled)
+                if len(settled) < len(new) or not new or meta["next"] >= total:
+                    break
+            meta["bytes"] = f.tell()
+            # The unsettled tail: kept in memory only.
+            self.fresh = lines[len(anchor) + len(settled):]
+            pos = meta["next"] + len(self.fresh)
+            while pos < total:
+                more = (await self._page(pos, min(self.page_lines, total - pos)))["lines"]
+                if not more:
+                    break
+                self.fresh.extend(more)
+                pos += len(more)
+            self.fetched += len(self.fresh)
+            if meta["base"] < 0 and -meta["base"] * 2 > meta["lines"]:
+                meta = self._compact(f, meta)
+            f.flush()
+            self.meta = meta
+            _write_json_atomic(self.meta_path, meta)
+
+    def _compact(self, f, meta: dict) -> dict:
+        """Drop the trimmed lines from the front of the file (more than half of it)."""
+        f.seek(0)
+        for _ in range(-meta["base"]):
+            f.readline()
+        tmp = self.lines_path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as out:
+            while True:
+                block = f.read(1 << 20)
+                if not block:
+                    break
+                out.write(block)
+            size = out.tell()
+        os.replace(tmp, self.lines_path)
+        return dict(meta, lines=meta["lines"] + meta["base"], base=0, bytes=size)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - GREP_CACHE_MAX_AGE_SEC
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+            except OSError:
+                pass
+
+
+class _locked:
+    """Exclusive flock on `path` for the duration of a `with` block.
+
+    Two `grep`s refreshing one pane's cache would interleave appends.
+    fcntl is POSIX-only, like the `bossterm` CLI; elsewhere this is a no-op.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: int | None = None
+
+    def __enter__(self):
+        try:
+            import fcntl
+        except ImportError:
+            return self
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            os.close(self.fd)  # releases the lock
+            self.fd = None
+
+
+def grep_pattern(
+    patterns: list[str], fixed: bool = False, ignore_case: bool = False,
+    word: bool = False, whole_line: bool = False,
+) -> re.Pattern:
+    """One regex matching any of `patterns`, with grep's -F/-i/-w/-x meanings.
+
+    With -w or -x, the same call without them makes a `grep_lines`
+    prefilter: the lookarounds and anchors defeat re's literal scan.
+    """
+    parts = [re.escape(p) if fixed else p for p in patterns]
+    combined = "|".join(f"(?:{p})" for p in parts)
+    if word:
+        combined = rf"(?<!\w)(?:{combined})(?!\w)"
+    if whole_line:
+        combined = rf"^(?:{combined})$"
+    return re.compile(combined, re.IGNORECASE if ignore_case else 0)
+
+
+def _grep_range(
+    path: str, begin: int, end: int, source: str, flags: int, invert: bool,
+    prefilter: str | None = None, skip: int = 0, limit: int | None = None,
+) -> tuple[int, list[tuple[int, str]]]:
+    """Lines of `path` starting in [begin, end): their count, and the selected
+    ones as (index within the range, text), ignoring the first `skip` and
+    stopping after `limit`. Runs in worker processes too."""
+    regex = re.compile(source, flags)
+    # Most blocks of a large scrollback hold no match at all; one C-level
+    # search over the block rules that out before splitting it into lines.
+    # `prefilter` (matching a superset of lines) stands in for a pattern
+    # that search would be slow with. MULTILINE keeps ^ and $ at line
+    # boundaries; \A and \Z would move.
+    block_regex = None
+    prefilter = prefilter or source
+    if not invert and "\\A" not in prefilter and "\\Z" not in prefilter:
+        block_regex = re.compile(prefilter, flags | re.MULTILINE)
+    count = 0
+    selected: list[tuple[int, str]] = []
+    with open(path, "rb") as f:
+        if begin:
+            # A line starting before `begin` belongs to the previous range.
+            f.seek(begin - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            block = f.read(min(GREP_BLOCK_BYTES, end - pos))
+            if not block:
+                break
+            if not block.endswith(b"\n"):
+                block += f.readline()
+            pos += len(block)
+            text = block.decode("utf-8", "replace")
+            lines = text.split("\n")
+            lines.pop()  # after the final newline
+            if block_regex is not None and (count + len(lines) <= skip or not block_regex.search(text)):
+                count += len(lines)
+                continue
+            for line in lines:
+                if count >= skip and (regex.search(line) is not None) != invert:
+                    selected.append((count, line))
+                    if limit is not None and len(selected) >= limit:
+                        return count + 1, selected
+                count += 1
+    return count, selected
+
+
+def grep_lines(
+    cache: ScrollbackCache, regex: re.Pattern, invert: bool = False, jobs: int | None = None,
+    limit: int | None = None, prefilter: re.Pattern | None = None,
+):
+    """Yield (buffer line number, 0-based, and text) for the selected lines,
+    cache first, then the fresh tail; at most `limit` from the cache.
+    `prefilter` must match every line `regex` does (and may match more)."""
+    size = cache.meta["bytes"]
+    if jobs is None:
+        jobs = min(GREP_MAX_JOBS, os.cpu_count() or 1) if size >= GREP_PARALLEL_MIN_BYTES else 1
+    args = (regex.pattern, regex.flags, invert, prefilter.pattern if prefilter else None)
+    if jobs > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        bounds = [size * i // jobs for i in range(jobs + 1)]
+        # spawn, not fork: this process has the event-loop thread running.
+        with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+            ranges = list(pool.map(
+                _grep_range, [cache.lines_path] * jobs, bounds[:-1], bounds[1:],
+                *([a] * jobs for a in args),
+            ))
+    else:
+        ranges = [_grep_range(cache.lines_path, 0, size, *args, skip=cache.skip, limit=limit)]
+    offset = 0
+    for count, selected in ranges:
+        for index, line in selected:
+            if offset + index >= cache.skip:
+                yield cache.base + offset + index, line
+        offset += count
+    for index, line in enumerate(cache.fresh):
+        if (regex.search(line) is not None) != invert:
+            yield cache.meta["next"] + index, line
+
+
+# ---------------------------------------------------------------------------
+# Library API
+# ---------------------------------------------------------------------------
+#
+# For Python automation that would otherwise shell out to `call` once per
+# action. Import it as `bossterm_mcp` (cli-resources/bossterm_mcp.py loads
+# this file under that name):
+#
+#     with bossterm_mcp.Client() as bt:
+#         tab = bt.get_active_tab()["id"]
+#         bt.send_input(tab, "make test\n")
+#         print(bt.search_output(tab, "FAILED|passed")["matches"])
+#
+# Every method is one request on the same session. Tool methods return the
+# tool's decoded JSON and raise ToolError when the tool reports isError.
+
+
+class ToolError(McpError):
+    """A tool ran and reported failure (`isError`); the message is its text."""
+
+    def __init__(self, tool: str, text: str):
+        super().__init__(f"{tool}: {text}")
+        self.tool = tool
+        self.text = text
+
+
+def _tool_args(**kwargs) -> dict:
+    """Tool arguments without the unset (None) ones, so server defaults apply."""
+    return {k: v for k, v in kwargs.items() if v is not None}
+
+
+def decode_tool_result(tool: str, result: dict):
+    """A CallToolResult's text as JSON (or the raw text); ToolError on isError."""
+    text = tool_result_text(result)
+    if result.get("isError"):
+        raise ToolError(tool, text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _run_command_timeout(timeout_ms: int | None) -> float:
+    # run_command blocks until the command exits (server default 120 s),
+    # far past the usual response budget.
+    return (timeout_ms if timeout_ms is not None else 120_000) / 1000 + RPC_RESPONSE_TIMEOUT_SEC
+
+
+class _Tools:
+    """Typed wrappers for BossTerm's built-in tools (docs/mcp-server.md).
+
+    Each one is `self.call_tool(name, args)`: a value on Client, an
+    awaitable on AsyncClient. The mixin defines no call_tool of its own;
+    Client and AsyncClient provide it. Optional arguments left as None are
+    not sent.
+    """
+
+    def list_tabs(self, include_fields: list[str] | None = None):
+        return self.call_tool("list_tabs", _tool_args(include_fields=include_fields))
+
+    def get_active_tab(self, include_fields: list[str] | None = None):
+        return self.call_tool("get_active_tab", _tool_args(include_fields=include_fields))
+
+    def list_panes(self, tab_id: str):
+        return self.call_tool("list_panes", {"tab_id": tab_id})
+
+    def read_scrollback(
+        self, tab_id: str, lines: int | None = None, pane_id: str | None = None,
+        start: int | None = None,
+    ):
+        return self.call_tool("read_scrollback", _tool_args(
+            tab_id=tab_id, lines=lines, pane_id=pane_id, start=start,
+        ))
+
+    def search_output(
+        self, tab_id: str, pattern: str, max_matches: int | None = None,
+        ignore_case: bool | None = None, pane_id: str | None = None,
+        include_line_text: bool | None = None,
+    ):
+        return self.call_tool("search_output", _tool_args(
+            tab_id=tab_id, pattern=pattern, max_matches=max_matches, ignore_case=ignore_case,
+            pane_id=pane_id, include_line_text=include_line_text,
+        ))
+
+    def get_last_command(self, tab_id: str):
+        return self.call_tool("get_last_command", {"tab_id": tab_id})
+
+    def read_debug_console(
+        self, tab_id: str, max_chunks: int | None = None, since_index: int | None = None,
+        sources: list[str] | None = None, omit_data: bool | None = None,
+    ):
+        return self.call_tool("read_debug_console", _tool_args(
+            tab_id=tab_id, max_chunks=max_chunks, since_index=since_index,
+            sources=sources, omit_data=omit_data,
+        ))
+
+    def send_input(self, tab_id: str, text: str, pane_id: str | None = None):
+        return self.call_tool("send_input", _tool_args(tab_id=tab_id, text=text, pane_id=pane_id))
+
+    def send_signal(self, tab_id: str, signal: str, pane_id: str | None = None):
+        return self.call_tool("send_signal", _tool_args(tab_id=tab_id, signal=signal, pane_id=pane_id))
+
+    def run_in_panel(
+        self, panel: str, script: str, tab_id: str | None = None,
+        working_dir: str | None = None, split_ratio: float | None = None,
+    ):
+        return self.call_tool("run_in_panel", _tool_args(
+            panel=panel, script=script, tab_id=tab_id, working_dir=working_dir,
+            split_ratio=split_ratio,
+        ))
+
+    def run_command(
+        self, script: str, tab_id: str | None = None, pane_id: str | None = None,
+        panel: str | None = None, split_ratio: float | None = None,
+        working_dir: str | None = None, timeout_ms: int | None = None,
+    ):
+        return self.call_tool("run_command", _tool_args(
+            script=script, tab_id=tab_id, pane_id=pane_id, panel=panel,
+            split_ratio=split_ratio, working_dir=working_dir, timeout_ms=timeout_ms,
+        ), timeout=_run_command_timeout(timeout_ms))
+
+
+class Client(_Tools):
+    """Blocking client holding one MCP session; use as a context manager.
+
+    `port` is a port number or `auto` (discovery, honouring
+    `$BOSSTERM_MCP_PORT`). `tool_prefix` is the embedder's toolNamePrefix,
+    if any. Safe to share across threads: calls from several threads run
+    concurrently on the one session. If the server restarts, the next
+    call reopens the session and retries once, as the broker does.
+    """
+
+    def __init__(
+        self, port: int | str = "auto", timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+        tool_prefix: str = "",
+    ):
+        self.timeout = timeout
+        self.tool_prefix = tool_prefix
+        self._session = connect(port)
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self._session.port
+
+    @property
+    def transport(self) -> str:
+        return self._session.transport
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _reopen(self, dead: McpSession) -> McpSession:
+        with self._lock:
+            if self._session is dead:
+                dead.close()
+                self._session = McpSession(dead.port)
+            return self._session
+
+    def request(self, method: str, params: dict | None = None, timeout: float | None = None) -> dict:
+        """Any JSON-RPC request (e.g. `tools/list`); returns the raw result."""
+        session = self._session
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return run_sync(session.aio.request(method, params or {}, timeout))
+        except PostNotDelivered:
+            return run_sync(self._reopen(session).aio.request(method, params or {}, timeout))
+
+    def call_tool(self, name: str, args: dict | None = None, timeout: float | None = None):
+        """Call a tool by its unprefixed name; returns its decoded JSON result."""
+        session = self._session
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            result = session.call(self.tool_prefix + name, args or {}, timeout)
+        except PostNotDelivered:
+            # The POST never landed, so the tool didn't run: safe to retry.
+            result = self._reopen(session).call(self.tool_prefix + name, args or {}, timeout)
+        return decode_tool_result(name, result)
+
+    def list_tools(self) -> list[dict]:
+        return self.request("tools/list").get("tools", [])
+
+    def wait_for(
+        self, tab_id: str, regex: str, timeout: float | None = None, ignore_case: bool = False,
+    ) -> str | None:
+        """Block until new output in `tab_id` matches; the matching line, or None on timeout."""
+        pattern = re.compile(regex, re.IGNORECASE if ignore_case else 0)
+        return run_sync(OutputWaiter(self._session.aio, tab_id, pattern).wait(timeout))
+
+
+class AsyncClient(_Tools):
+    """Asyncio counterpart of Client, running on the caller's own event loop.
+
+    Open with `async with AsyncClient() as bt:` (or `await
+    AsyncClient.connect()`), then `await bt.list_tabs()`; gather calls to
+    run them concurrently on the one session.
+    """
+
+    def __init__(
+        self, port: int | str = "auto", timeout: float = RPC_RESPONSE_TIMEOUT_SEC,
+        tool_prefix: str = "",
+    ):
+        self.port_spec = port
+        self.timeout = timeout
+        self.tool_prefix = tool_prefix
+        self._session: AsyncMcpSession | StreamableMcpSession | None = None
+
+    @classmethod
+    async def connect(cls, port: int | str = "auto", **kwargs) -> AsyncClient:
+        client = cls(port, **kwargs)
+        await client.open()
+        return client
+
+    async def open(self) -> None:
+        port = resolve_port_spec(self.port_spec)
+        if port == "auto":
+            self._session = await discover_async(configured_port())
+            if self._session is None:
+                raise ServerNotFound()
+            return
+        try:
+            self._session = await open_session(port)
+        except OSError:
+            if self.port_spec != "auto":
+                raise
+            raise ServerNotFound() from None
+
+    @property
+    def port(self) -> int:
+        return self._session.port
+
+    @property
+    def transport(self) -> str:
+        return self._session.transport
+
+    async def __aenter__(self) -> AsyncClient:
+        if self._session is None:
+            await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.aclose()
+
+    async def _retry(self, dead, method: str, params: dict, timeout: float | None, **kwargs):
+        if self._session is dead:
+            dead.close()
+            self._session = await open_session(dead.port)
+        return await self._session.request(method, params, timeout, **kwargs)
+
+    async def request(self, method: str, params: dict | None = None, timeout: float | None = None) -> dict:
+        """Any JSON-RPC request (e.g. `tools/list`); returns the raw result."""
+        session = self._session
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await session.request(method, params or {}, timeout)
+        except PostNotDelivered:
+            return await self._retry(session, method, params or {}, timeout)
+
+    async def call_tool(self, name: str, args: dict | None = None, timeout: float | None = None):
+        """Call a tool by its unprefixed name; returns its decoded JSON result."""
+        session = self._session
+        timeout = self.timeout if timeout is None else timeout
+        params = {"name": self.tool_prefix + name, "arguments": args or {}}
+        idempotent = name in READ_ONLY_TOOLS
+        try:
+            result = await session.request("tools/call", params, timeout, idempotent=idempotent)
+        except PostNotDelivered:
+            result = await self._retry(session, "tools/call", params, timeout, idempotent=idempotent)
+        return decode_tool_result(name, result)
+
+    async def list_tools(self) -> list[dict]:
+        return (await self.request("tools/list")).get("tools", [])
+
+    async def wait_for(
+        self, tab_id: str, regex: str, timeout: float | None = None, ignore_case: bool = False,
+    ) -> str | None:
+        """Wait until new output in `tab_id` matches; the matching line, or None on timeout."""
+        pattern = re.compile(regex, re.IGNORECASE if ignore_case else 0)
+        return await OutputWaiter(self._session, tab_id, pattern).wait(timeout)
+
+
+# ---------------------------------------------------------------------------
+# Completion cache (`complete`, `refresh-cache`)
+# ---------------------------------------------------------------------------
+#
+# Shell completion runs on every <Tab>; a session per keystroke (connect,
+# initialize, a call) is visible lag. So completions come from
+# COMPLETION_CACHE_PATH, read without any network: tab ids, each tab's
+# pane ids, and tool names. An entry is only trusted for the server that
+# wrote it, identified by the port marker (its port and mtime: the server
+# rewrites it whenever it binds), and is fresh for COMPLETION_CACHE_TTL_SEC.
+# Reading a stale or foreign cache starts `refresh-cache` in the background
+# for the next <Tab>; a stale entry from the same server is still served.
+
+COMPLETION_CACHE_PATH = os.path.join(BOSSTERM_DIR, "cache", "completion.json")
+COMPLETION_CACHE_TTL_SEC = 10.0
+# One background refresh per this long, however fast the keystrokes come.
+COMPLETION_REFRESH_BACKOFF_SEC = 2.0
+
+
+def server_stamp() -> list | None:
+    """The running server's identity, from the port marker alone: [port, mtime_ns]."""
+    try:
+        mtime = os.stat(PORT_MARKER_PATH).st_mtime_ns
+    except OSError:
+        return None
+    return [marker_port(), mtime]
+
+
+async def collect_completions(bt: AsyncClient) -> dict:
+    """Everything completion offers, fetched concurrently on one session."""
+    tabs, tools = await asyncio.gather(bt.list_tabs(["id", "title"]), bt.list_tools())
+    tab_list = tabs.get("tabs", [])
+    panes = await asyncio.gather(
+        *(bt.list_panes(tab["id"]) for tab in tab_list), return_exceptions=True,
+    )
+    return {
+        "active": tabs.get("activeTabId"),
+        "tabs": [[tab["id"], tab.get("title", "")] for tab in tab_list],
+        "panes": {
+            tab["id"]: [[pane["id"], pane.get("title", "")] for pane in result.get("panes", [])]
+            for tab, result in zip(tab_list, panes) if isinstance(result, dict)
+        },
+        "tools": [[tool["name"], tool.get("description", "").split("\n", 1)[0]] for tool in tools],
+    }
+
+
+def read_completion_cache(now: float | None = None) -> tuple[dict | None, bool]:
+    """The cache if it's this server's, and whether it's still fresh."""
+    try:
+        with open(COMPLETION_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None, False
+    override = os.environ.get("BOSSTERM_MCP_PORT")
+    if override and str(cache.get("port")) != override:
+        return None, False
+    if cache.get("stamp") != server_stamp():
+        return None, False
+    now = time.time() if now is None else now
+    return cache, now - cache.get("written", 0) < COMPLETION_CACHE_TTL_SEC
+
+
+def refresh_completions_in_background() -> None:
+    """Start a detached `refresh-cache auto`, unless one started just now."""
+    guard = COMPLETION_CACHE_PATH + ".refreshing"
+    try:
+        if time.time() - os.path.getmtime(guard) < COMPLETION_REFRESH_BACKOFF_SEC:
+            return
+    except OSError:
+        pass
+    try:
+        os.makedirs(os.path.dirname(guard), mode=0o700, exist_ok=True)
+        with open(guard, "w"):
+            pass
+        import subprocess
+
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "refresh-cache", "auto"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Resident broker
+# ---------------------------------------------------------------------------
+#
+# Wire format: newline-delimited JSON over the Unix socket, one response
+# line per request line. Requests are `{"op": "ping", "port": N}` or
+# `{"op": "call", "port": N, "tool": "...", "args": {...}}`, where N may also
+# be "auto"; responses are `{"ok": true, "result": {...}}` or
+# `{"ok": false, "error": "..."}`, plus `"unreachable": true` when `auto`
+# found no server and `"connect_failed": true` when the port didn't answer.
+
+
+class SessionOpenFailed(ConnectionError):
+    """The broker couldn't open a session on the port: nothing answered there."""
+
+
+class Broker:
+    """Keeps one initialized McpSession per port, reconnecting on demand."""
+
+    def __init__(self):
+        self._sessions: dict[int, McpSession] = {}
+        self._lock = threading.Lock()
+        self.last_activity = 0.0
+
+    def _session(self, port: int, fresh: bool = False) -> McpSession:
+        with self._lock:
+            session = self._sessions.get(port)
+            if session is not None and (fresh or not session.alive):
+                session.close()
+                del self._sessions[port]
+                session = None
+            if session is None:
+                try:
+                    session = McpSession(port)
+                except OSError as e:
+                    raise SessionOpenFailed(str(e)) from e
+                self._sessions[port] = session
+            return session
+
+    def _drop(self, port: int, session: McpSession) -> None:
+        with self._lock:
+            if self._sessions.get(port) is session:
+                del self._sessions[port]
+        session.close()
+
+    def resolve(self, port: int | str, cached: bool = True) -> int:
+        """Map `auto` to a port, preferring one that already has a session.
+
+        With `cached=False` the port is always discovered afresh.
+        """
+        if port != "auto":
+            return int(port)
+        base = configured_port()
+        with self._lock:
+            for candidate in discovery_candidates(base) if cached else ():
+                session = self._sessions.get(candidate)
+                if session is not None and session.alive:
+                    return candidate
+        session = discover(base)
+        if session is None:
+            raise ServerNotFound()
+        with self._lock:
+            stale = self._sessions.get(session.port)
+            self._sessions[session.port] = session
+        if stale is not None:
+            stale.close()
+        return session.port
+
+    def ping(self, port: int) -> None:
+        session = self._session(port)
+        if session.transport != "streamable":
+            # A live SSE stream on an initialized session already proves the
+            # server is up; only a dead/missing session costs a handshake.
+            return
+        # A Streamable session holds nothing open between requests, so
+        # `alive` only means no request has failed yet: ask the server.
+        try:
+            submit(session.aio.request("ping", {}, idempotent=True)).result()
+        except McpError:
+            pass  # it answered
+        except Exception:
+            self._drop(port, session)
+            self._session(port, fresh=True)
+
+    def call(self, port: int, tool: str, args: dict) -> dict:
+        session = self._session(port)
+        try:
+            return session.call(tool, args)
+        except PostNotDelivered:
+            # The POST never landed (server restarted, session id gone), so
+            # the tool didn't run and one retry on a fresh session is safe.
+            self._drop(port, session)
+            return self._session(port, fresh=True).call(tool, args)
+        except TimeoutError:
+            # The POST was accepted; the tool may still be running. Don't
+            # retry (write tools aren't idempotent), just retire the session.
+            self._drop(port, session)
+            raise
+
+    def _run(self, port: int, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            self.ping(port)
+            return {"ok": True}
+        if op == "call":
+            args = request.get("args") or {}
+            return {"ok": True, "result": self.call(port, request["tool"], args)}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    def handle(self, request: dict) -> dict:
+        self.last_activity = time.monotonic()
+        try:
+            port = self.resolve(request["port"])
+            try:
+                return self._run(port, request)
+            except SessionOpenFailed:
+                if request["port"] != "auto":
+                    raise
+                # The server behind the cached session is gone (the app quit,
+                # or restarted on another port). Its session has been dropped;
+                # discover again and retry once there.
+                return self._run(self.resolve("auto", cached=False), request)
+        except ServerNotFound as e:
+            return {"ok": False, "error": str(e), "unreachable": True}
+        except SessionOpenFailed as e:
+            return {"ok": False, "error": str(e), "connect_failed": True}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+
+def broker_request(request: dict) -> dict | None:
+    """Send one request to the resident broker. None if no broker is running."""
+    if os.environ.get("BOSSTERM_MCP_NO_BROKER") or not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(BROKER_CONNECT_TIMEOUT_SEC)
+        try:
+            sock.connect(BROKER_SOCKET_PATH)
+        except OSError:
+            return None
+        # The broker may have to (re)do the handshake before answering.
+        sock.settimeout(SSE_OPEN_TIMEOUT_SEC + 2 * RPC_RESPONSE_TIMEOUT_SEC)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def cmd_serve(idle_timeout: float | None) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        print("serve requires Unix-domain socket support", file=sys.stderr)
+        return 2
+    path = BROKER_SOCKET_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # stale socket from a broker that died
+        else:
+            print(f"broker already running on {path}", file=sys.stderr)
+            return 1
+        finally:
+            probe.close()
+
+    import socketserver
+
+    class BrokerHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {"ok": False, "error": f"invalid request: {e}"}
+                else:
+                    response = self.server.broker.handle(request)
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    broker = Broker()
+    old_umask = os.umask(0o077)  # socket is owner-only
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, BrokerHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    server.broker = broker
+    if idle_timeout:
+        broker.last_activity = time.monotonic()
+
+        def watch_idle() -> None:
+            while time.monotonic() - broker.last_activity < idle_timeout:
+                time.sleep(1.0)
+            server.shutdown()
+
+        threading.Thread(target=watch_idle, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Tracing (`--trace`)
+# ---------------------------------------------------------------------------
+#
+# `--trace` prints one JSON line per invocation on stderr; `--trace-file
+# FILE`, or $BOSSTERM_MCP_TRACE set to a path, appends it to FILE instead
+# ($BOSSTERM_MCP_TRACE=1 means stderr). The line is built to be aggregated
+# (p50/p99 per phase) across many runs:
+#
+#   {"ts": <epoch>, "cmd": "call", "tool": "list_tabs", "port": 7676,
+#    "rc": 0, "phases": {"startup": 41.2, "broker_probe": 0.1,
+#    "sse_connect": 0.4, "endpoint": 1.9, "initialize": 2.3, ...}}
+#
+# Phases are durations in milliseconds, present only when they happened:
+#
+#   startup       launcher → main(); needs $BOSSTERM_MCP_T0 (epoch seconds,
+#                 set by the bash CLI just before it runs python3)
+#   startup_cpu   CPU time spent before main() (interpreter + imports)
+#   broker        round trip through the resident broker
+#   broker_probe  failed attempt to reach a broker (none running)
+#   connect       connect()/discovery as a whole, including the phases below
+#   negotiate     Streamable HTTP attempt the server turned down (SSE fallback)
+#   sse_connect   TCP connect for the SSE stream
+#   sse_open      GET / until the response head arrives
+#   endpoint      response head until the `endpoint` event
+#   initialize    `initialize` round trip
+#   initialized   POST of `notifications/initialized`
+#   tool_post     tools/call POST until the 202
+#   tool_response 202 until the response arrives on SSE
+#   tool_call     tools/call round trip (Streamable HTTP)
+#   targets       `fanout`: listing tabs and panes
+#   wait          `wait-for`: until the match (or timeout); "polls" counts requests
+#   fanout        `fanout`: listing plus every per-target call
+#   panes         `xargs`: finding or opening the panes, and readying them
+#   xargs         `xargs`: first command sent → last one done; "commands"
+#                 and "panes" count them
+#   follow        `follow`: until interrupted; "polls" counts requests
+#   export        `export`: the whole export; "pages" counts read_scrollback calls
+#   refresh       `grep`: bringing the scrollback cache up to date ("pages",
+#                 and "fetched" lines, including the uncached tail);
+#                 `refresh-cache`: fetching everything completion offers
+#   search        `grep`: matching and printing
+#   total         main() → trace emitted
+#
+# The line also records which transport the session used ("transport":
+# "streamable" or "sse").
+
+
+class Trace:
+    """Collects phase durations for one invocation; a no-op unless enabled."""
+
+    def __init__(self, target: str | None = None, started: float | None = None):
+        # None: disabled. "-": stderr. Anything else: a file to append to.
+        self.target = target
+        self.started = time.perf_counter() if started is None else started
+        self.fields: dict = {"ts": round(time.time(), 3)}
+        self.phases: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.target is not None
+
+    def phase(self, name: str, start: float, end: float | None = None) -> None:
+        if self.enabled:
+            end = time.perf_counter() if end is None else end
+            self.phases[name] = round((end - start) * 1000, 3)
+
+    def session(self, session: McpSession | BlockingMcpSession) -> None:
+        """Record the opening steps of the session a command actually used."""
+        marks = session.marks
+        self.fields["transport"] = session.transport
+        if "probe" in marks:
+            self.phase("negotiate", marks["probe"], marks["open"])
+        if session.transport == "streamable":
+            steps = ("open", "initialized", "ready")
+            names = ("initialize", "initialized")
+        else:
+            steps = ("open", "connected", "stream_head", "endpoint", "initialized", "ready")
+            names = ("sse_connect", "sse_open", "endpoint", "initialize", "initialized")
+        for name, start, end in zip(names, steps, steps[1:]):
+            if start in marks and end in marks:
+                self.phase(name, marks[start], marks[end])
+
+    def call(self, start: float, marks: dict[str, float]) -> None:
+        if "posted" in marks:
+            self.phase("tool_post", start, marks["posted"])
+            if "responded" in marks:
+                self.phase("tool_response", marks["posted"], marks["responded"])
+        elif "responded" in marks:
+            self.phase("tool_call", start, marks["responded"])
+
+    def emit(self, rc: int) -> None:
+        if not self.enabled:
+            return
+        launched = os.environ.get("BOSSTERM_MCP_T0", "").replace(",", ".")
+        if launched:
+            try:
+                # perf_counter and the wall clock drift apart only by NTP slew.
+                since_launch = time.time() - float(launched)
+                self.phases["startup"] = round(
+                    (since_launch - (time.perf_counter() - self.started)) * 1000, 3
+                )
+            except ValueError:
+                pass
+        self.phase("total", self.started)
+        line = json.dumps({**self.fields, "rc": rc, "phases": self.phases})
+        if self.target == "-":
+            print(line, file=sys.stderr)
+            return
+        try:
+            with open(self.target, "a") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"trace: cannot append to {self.target}: {e}", file=sys.stderr)
+
+
+TRACE = Trace()
+
+
+def trace_target(flag: str | None) -> str | None:
+    """`--trace`/`--trace-file` win over $BOSSTERM_MCP_TRACE ("1"/"-" mean stderr)."""
+    value = flag if flag is not None else os.environ.get("BOSSTERM_MCP_TRACE", "")
+    if not value or value == "0":
+        return None
+    return "-" if value in ("1", "-") else value
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoints
+# ---------------------------------------------------------------------------
+
+
+def report_unreachable(message: str) -> int:
+    # Matches the bash CLI's mcp_resolve_port_or_die wording and exit code.
+    print(f"Error: {message}", file=sys.stderr)
+    print("  Hint: 'bossterm mcp status' to check, 'bossterm mcp on' to enable.", file=sys.stderr)
+    return 2
+
+
+def traced_broker_request(request: dict) -> dict | None:
+    started = time.perf_counter()
+    response = broker_request(request)
+    TRACE.phase("broker" if response is not None else "broker_probe", started)
+    return response
+
+
+def traced_connect(port: int | str, oneshot: bool = False) -> McpSession | BlockingMcpSession:
+    started = time.perf_counter()
+    session = connect_oneshot(port) if oneshot else connect(port)
+    TRACE.phase("connect", started)
+    TRACE.session(session)
+    TRACE.fields["port"] = session.port
+    return session
+
+
+def cmd_ping(port: int | str) -> int:
+    spec, port = port, resolve_port_spec(port)
+    brokered = traced_broker_request({"op": "ping", "port": port})
+    if brokered is not None:
+        if brokered.get("ok"):
+            return 0
+        if brokered.get("connect_failed") and spec == "auto":
+            brokered["error"] = str(ServerNotFound())
+        print(f"ping failed: {brokered.get('error', '')}", file=sys.stderr)
+        return 1
+    try:
+        session = traced_connect(spec, oneshot=True)
+    except Exception as e:
+        print(f"ping failed: {e}", file=sys.stderr)
+        return 1
+    session.close()
+    return 0
+
+
+def cmd_discover(base: int | None, window: int) -> int:
+    started = time.perf_counter()
+    # The marker's port is discovery's first choice anyway; when it answers,
+    # the window needn't be probed at all.
+    hint = marker_port()
+    session = open_blocking(hint, guess=True) if hint is not None else None
+    if session is None:
+        session = discover(configured_port() if base is None else base, window)
+    TRACE.phase("connect", started)
+    if session is None:
+        print("no BossTerm MCP server found", file=sys.stderr)
+        return 1
+    TRACE.session(session)
+    TRACE.fields["port"] = session.port
+    session.close()
+    print(session.port)
+    return 0
+
+
+def cmd_call(port: int | str, tool: str, args_json: str) -> int:
+    try:
+        args = json.loads(args_json)
+    except Exception as e:
+        print(f"invalid args JSON: {e}", file=sys.stderr)
+        return 2
+    if not isinstance(args, dict):
+        print("args JSON must be an object", file=sys.stderr)
+        return 2
+    spec, port = port, resolve_port_spec(port)
+    brokered = traced_broker_request({"op": "call", "port": port, "tool": tool, "args": args})
+    if brokered is not None:
+        if brokered.get("unreachable"):
+            return report_unreachable(brokered["error"])
+        if brokered.get("connect_failed"):
+            if spec == "auto":
+                # `auto` pinned by $BOSSTERM_MCP_PORT to a dead port: the
+                # same "not reachable" as when discovery finds nothing.
+                return report_unreachable(str(ServerNotFound()))
+            print(f"connect failed: {brokered['error']}", file=sys.stderr)
+            return 1
+        if not brokered.get("ok"):
+            print(f"tool call failed: {brokered.get('error', '')}", file=sys.stderr)
+            return 1
+        return print_tool_result(brokered["result"])
+    try:
+        session = traced_connect(spec, oneshot=True)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
+    except Exception as e:
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
+    marks: dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        result = session.call(tool, args, marks=marks)
+        TRACE.call(started, marks)
+    except Exception as e:
+        print(f"tool call failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    return print_tool_result(result)
+
 
-from __future__ import annotations
+def tool_result_text(result: dict) -> str:
+    # BossTerm tool results are CallToolResult { content: [TextContent{text}] }.
+    # The text is itself a JSON string we want to surface to the caller.
+    content = result.get("content") or []
+    for chunk in content:
+        if chunk.get("type") == "text" and "text" in chunk:
+            return chunk["text"]
+    # No text content; surface the structured result as a courtesy.
+    return json.dumps(result)
 
-import argparse
-import json
-import sys
-import threading
-import urllib.parse
-import urllib.request
-from queue import Empty, Queue
 
+def print_tool_result(result: dict) -> int:
+    print(tool_result_text(result))
+    if result.get("isError"):
+        return 1
+    return 0
 
-MCP_PROTOCOL_VERSION = "2024-11-05"
-CLIENT_NAME = "bossterm-cli"
-CLIENT_VERSION = "1.0"
 
-# Per-call connect/read budget. Keep tight — the CLI is human-facing.
-SSE_OPEN_TIMEOUT_SEC = 3.0
-RPC_RESPONSE_TIMEOUT_SEC = 10.0
+def _read_batch(stream) -> list[tuple[str, dict, float | None]]:
+    """Parse `{tool, args[, timeout]}` JSONL records. Raises ValueError."""
+    records = []
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: invalid JSON: {e}")
+        if not isinstance(rec, dict) or not isinstance(rec.get("tool"), str):
+            raise ValueError(f"line {lineno}: expected an object with a string 'tool'")
+        args = rec.get("args") or {}
+        if not isinstance(args, dict):
+            raise ValueError(f"line {lineno}: 'args' must be an object")
+        timeout = rec.get("timeout")
+        if timeout is not None and not isinstance(timeout, (int, float)):
+            raise ValueError(f"line {lineno}: 'timeout' must be a number")
+        records.append((rec["tool"], args, timeout))
+    return records
 
 
-# ---------------------------------------------------------------------------
-# SSE reader
-# ---------------------------------------------------------------------------
+def cmd_call_batch(
+    port: int | str,
+    ordered: bool,
+    call_timeout: float,
+    deadline: float | None,
+    jobs: int,
+    stats: bool = False,
+) -> int:
+    """Pipeline many tool calls over one session; JSONL in, JSONL out.
 
+    Each output line is `{"index", "tool", "ok", "result"|"error"}`, where
+    `result` is the tool's text payload (decoded when it's JSON) and
+    `index` is the record's 0-based position in the input.
+    """
+    from queue import Empty, Queue
 
-class SseReader(threading.Thread):
-    """Drains an SSE stream into a queue of (event, data) pairs."""
+    try:
+        records = _read_batch(sys.stdin)
+    except ValueError as e:
+        print(f"invalid batch input: {e}", file=sys.stderr)
+        return 2
+    if not records:
+        return 0
+    try:
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
+    except Exception as e:
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
 
-    def __init__(self, url: str):
-        super().__init__(daemon=True)
-        self.url = url
-        self.queue: Queue = Queue()
-        self._stop = threading.Event()
-        self._resp = None
-        self.error: str | None = None
+    batch_end = time.monotonic() + deadline if deadline else None
+    completed: Queue = Queue()
+    buffered: dict[int, dict] = {}
+    emitted: set[int] = set()
+    next_out = 0
+    failures = 0
 
-    def run(self) -> None:
-        req = urllib.request.Request(
-            self.url,
-            headers={
-                "Host": "127.0.0.1",
-                "Accept": "text/event-stream",
-                "Cache-Control": "no-cache",
-            },
-        )
-        try:
-            self._resp = urllib.request.urlopen(req, timeout=SSE_OPEN_TIMEOUT_SEC)
-        except Exception as e:  # urlopen, timeout, connection refused
-            self.error = f"failed to open SSE stream: {e}"
-            self.queue.put(("__error__", self.error))
+    def emit(index: int, payload: dict) -> None:
+        nonlocal next_out, failures
+        emitted.add(index)
+        if not payload["ok"]:
+            failures += 1
+        line = {"index": index, "tool": records[index][0], **payload}
+        if not ordered:
+            print(json.dumps(line), flush=True)
             return
+        buffered[index] = line
+        while next_out in buffered:
+            print(json.dumps(buffered.pop(next_out)), flush=True)
+            next_out += 1
 
-        event = "message"
-        data_lines: list[str] = []
+    def outcome(future: Future) -> dict:
         try:
-            for raw in self._resp:
-                if self._stop.is_set():
-                    break
-                line = raw.decode("utf-8", errors="replace").rstrip("\n").rstrip("\r")
-                if line == "":
-                    if data_lines:
-                        self.queue.put((event, "\n".join(data_lines)))
-                    event = "message"
-                    data_lines = []
-                    continue
-                if line.startswith(":"):
-                    continue  # SSE comment
-                if line.startswith("event:"):
-                    event = line[len("event:"):].strip()
-                elif line.startswith("data:"):
-                    data_lines.append(line[len("data:"):].lstrip())
-                # Ignore id:/retry: for our purposes.
+            result = future.result()
         except Exception as e:
-            self.error = f"SSE read failed: {e}"
-            self.queue.put(("__error__", self.error))
+            return {"ok": False, "error": str(e)}
+        text = tool_result_text(result)
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text
+        if result.get("isError"):
+            return {"ok": False, "error": value}
+        return {"ok": True, "result": value}
 
-    def close(self) -> None:
-        # Only flip the stop flag. Closing the urllib HTTPResponse from a
-        # different thread isn't documented as safe — on CPython it tends
-        # to work because of the GIL, but the standard library makes no
-        # promise. The reader thread is daemonic and will be torn down at
-        # process exit; for one-shot CLI invocations the cleanup latency
-        # is bounded by the bash script's own exit.
-        self._stop.set()
+    # Every call is a coroutine on the shared loop. Each one times itself
+    # out, and they all share `--jobs` keep-alive POST connections; the
+    # responses arrive on SSE independently of the POST order.
+    connection_pool(event_loop()).max_per_host = max(1, jobs)
+    futures: list[Future] = []
+    for index, (tool, args, timeout) in enumerate(records):
+        future = session.submit(tool, args, timeout if timeout is not None else call_timeout)
+        future.add_done_callback(lambda _f, index=index: completed.put(index))
+        futures.append(future)
+    try:
+        while len(emitted) < len(records):
+            remaining = None if batch_end is None else batch_end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                index = completed.get(timeout=remaining)
+            except Empty:
+                break
+            emit(index, outcome(futures[index]))
+    finally:
+        for future in futures:
+            future.cancel()
+        session.close()
+    if stats:
+        counters = connection_pool(event_loop()).stats()
+        print("pool: " + " ".join(f"{k}={v}" for k, v in counters.items()), file=sys.stderr)
 
+    # Deadline hit: account for everything unanswered, whether it was in
+    # flight or never got sent.
+    for index in range(len(records)):
+        if index not in emitted:
+            emit(index, {"ok": False, "error": "batch deadline exceeded"})
+    return 1 if failures else 0
 
-# ---------------------------------------------------------------------------
-# JSON-RPC over POST
-# ---------------------------------------------------------------------------
 
+async def fanout_targets(
+    aio: AsyncMcpSession | StreamableMcpSession, scope: str, timeout: float
+) -> list[tuple[str, str | None]]:
+    """(tab_id, pane_id) for every tab, or every pane of every tab.
 
-def post_json(url: str, body: dict) -> None:
-    """Fire-and-(mostly)-forget POST. The real response comes back on SSE."""
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        method="POST",
-        headers={
-            "Host": "127.0.0.1",
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
-        },
+    The `list_panes` calls run concurrently. A tab whose panes can't be
+    listed (closed meanwhile) is still targeted, as its focused pane.
+    """
+    listing = decode_tool_result("list_tabs", await aio.call("list_tabs", {"include_fields": ["id"]}, timeout))
+    tab_ids = [tab["id"] for tab in listing.get("tabs", [])]
+    if scope == "tabs":
+        return [(tab_id, None) for tab_id in tab_ids]
+    panes = await asyncio.gather(
+        *(aio.call("list_panes", {"tab_id": tab_id}, timeout) for tab_id in tab_ids),
+        return_exceptions=True,
     )
-    # The SDK returns an immediate 202 Accepted (response goes via SSE).
-    # Surface non-2xx as an exception so callers can fail loudly.
-    with urllib.request.urlopen(req, timeout=RPC_RESPONSE_TIMEOUT_SEC) as resp:
-        if resp.status >= 400:
-            raise RuntimeError(f"POST {url} returned HTTP {resp.status}")
+    targets: list[tuple[str, str | None]] = []
+    for tab_id, result in zip(tab_ids, panes):
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            pane_ids = [pane["id"] for pane in decode_tool_result("list_panes", result)["panes"]]
+        except Exception:
+            pane_ids = [None]
+        targets.extend((tab_id, pane_id) for pane_id in pane_ids)
+    return targets
+
+
+# How often `fanout` and `xargs` check that the event loop is still alive
+# while they wait for results.
+FANOUT_POLL_SEC = 0.5
+
 
+def drain_results(run: Future, done, what: str):
+    """Yield what `run` puts on the `done` queue until it ends, however it ends.
 
-def wait_for_response(
-    reader: SseReader, request_id: int, deadline_sec: float
-) -> dict:
-    """Block until a JSON-RPC message with the given id arrives on SSE."""
-    import time
-    end = time.monotonic() + deadline_sec
+    A done-callback posts a sentinel after the run's last result (even when
+    it was cancelled before starting), so a failed run can't leave the
+    caller waiting; `run.result()` then raises its exception. A loop that
+    died mid-run completes nothing, so that is polled for.
+    """
+    from queue import Empty
+
+    run.add_done_callback(lambda _: done.put(None))
     while True:
-        remaining = end - time.monotonic()
-        if remaining <= 0:
-            raise TimeoutError(f"timed out waiting for response id={request_id}")
         try:
-            event, data = reader.queue.get(timeout=remaining)
+            item = done.get(timeout=FANOUT_POLL_SEC)
         except Empty:
-            raise TimeoutError(f"timed out waiting for response id={request_id}")
-        if event == "__error__":
-            raise RuntimeError(data)
-        if event == "endpoint":
-            # Late endpoint event after initial — ignore.
+            if not event_loop().is_running():
+                raise RuntimeError(f"event loop stopped during {what}")
             continue
+        if item is None:
+            return
+        yield item
+
+
+async def fanout_async(
+    aio: AsyncMcpSession | StreamableMcpSession, tool: str, template: dict,
+    targets: list[tuple[str, str | None]], jobs: int, timeout: float, done: Queue,
+) -> None:
+    """Call `tool` once per target, at most `jobs` at a time.
+
+    Puts `(index, {"ok", "result"|"error"})` on `done` as each call finishes.
+    """
+    semaphore = asyncio.Semaphore(max(1, jobs))
+
+    async def one(index: int, tab_id: str, pane_id: str | None) -> None:
+        args = {**template, "tab_id": tab_id}
+        if pane_id is not None:
+            args["pane_id"] = pane_id
+        async with semaphore:
+            try:
+                payload = {"ok": True, "result": decode_tool_result(tool, await aio.call(tool, args, timeout))}
+            except ToolError as e:
+                payload = {"ok": False, "error": e.text}
+            except Exception as e:
+                payload = {"ok": False, "error": str(e)}
+        done.put((index, payload))
+
+    await asyncio.gather(*(one(index, *target) for index, target in enumerate(targets)))
+
+
+def cmd_fanout(
+    port: int | str, tool: str, args_json: str, scope: str, jobs: int, call_timeout: float,
+) -> int:
+    """Run one tool against every pane (or tab) concurrently on one session.
+
+    Each output line is `{"tab_id", "pane_id", "ok", "result"|"error"}`, in
+    completion order; `pane_id` is null when targeting tabs.
+    """
+    from queue import Queue
+
+    try:
+        template = json.loads(args_json)
+    except ValueError as e:
+        print(f"invalid args JSON: {e}", file=sys.stderr)
+        return 2
+    if not isinstance(template, dict):
+        print("args JSON must be an object", file=sys.stderr)
+        return 2
+    try:
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
+    except Exception as e:
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
+
+    failures = 0
+    try:
+        started = time.perf_counter()
         try:
-            msg = json.loads(data)
-        except Exception:
+            targets = run_sync(fanout_targets(session.aio, scope, call_timeout))
+        except Exception as e:
+            print(f"listing {scope} failed: {e}", file=sys.stderr)
+            return 1
+        TRACE.phase("targets", started)
+        TRACE.fields["targets"] = len(targets)
+        # Over Streamable HTTP each call holds a pooled connection, so the
+        # pool must be as wide as the fan-out.
+        pool = connection_pool(event_loop())
+        pool.max_per_host = max(pool.max_per_host, jobs)
+        done: Queue = Queue()
+        run = submit(fanout_async(session.aio, tool, template, targets, jobs, call_timeout, done))
+        for index, payload in drain_results(run, done, "fanout"):
+            tab_id, pane_id = targets[index]
+            if not payload["ok"]:
+                failures += 1
+            print(json.dumps({"tab_id": tab_id, "pane_id": pane_id, **payload}), flush=True)
+        run.result()
+        TRACE.phase("fanout", started)
+    finally:
+        session.close()
+    return 1 if failures else 0
+
+
+# `xargs` runs shell commands through run_command in N panes at once, like
+# `xargs -P N`. BossTerm queues run_command calls per pane (FIFO), so
+# parallelism needs distinct panes: the ones given with --pane, then the
+# tab's run_command scratch pane (created by the first run_command without
+# a pane_id, or reused), then new splits from run_in_panel with an empty
+# script (no initial command whose prompt marks could be mistaken for the
+# first job's). With `--panel new_tab` each run_command without a pane_id
+# opens its own tab instead. Each worker then pins its pane by pane_id and
+# takes the next command off one shared queue whenever its pane goes idle,
+# so a long command never holds up short ones queued behind it.
+
+XARGS_PANELS = ("reuse", "horizontal_split", "vertical_split", "new_tab")
+# Exit status when any command failed: exited non-zero, timed out, or
+# gave `exitCode: null` (no OSC 133;D, e.g. a shell without integration).
+# xargs' own code for "a command failed", kept apart from 1 (xargs failed).
+XARGS_FAILED_EXIT = 123
+
+
+def _read_commands(stream) -> list[str]:
+    return [line.rstrip("\r\n") for line in stream if line.strip()]
+
+
+async def xargs_panes(
+    aio: AsyncMcpSession | StreamableMcpSession, count: int, tab_id: str | None,
+    pane_ids: list[str], panel: str, split_ratio: float | None, working_dir: str | None,
+) -> list[tuple[str, str]]:
+    """(tab_id, pane_id) for `count` workers: the given panes, then scratch and new ones."""
+    if tab_id is None:
+        tab_id = decode_tool_result("get_active_tab", await aio.call("get_active_tab", {}))["id"]
+    panes = [(tab_id, pane_id) for pane_id in dict.fromkeys(pane_ids)][:count]
+    claim_timeout = _run_command_timeout(None)
+
+    async def claim(**args) -> tuple[str, str]:
+        # `:` so the pane exists (and its shell is up) before the first job.
+        result = decode_tool_result("run_command", await aio.call(
+            "run_command", _tool_args(script=":", working_dir=working_dir, **args), claim_timeout,
+        ))
+        if not result.get("ok"):
+            raise ToolError("run_command", result.get("error") or "run_command failed")
+        return result["tabId"], result["paneId"]
+
+    if len(panes) < count and panel != "new_tab":
+        scratch = await claim(tab_id=tab_id, panel=panel, split_ratio=split_ratio)
+        if scratch not in panes:
+            panes.append(scratch)
+    created = []
+    while len(panes) + len(created) < count:
+        if panel == "new_tab":
+            panes.append(await claim(tab_id=tab_id, panel="new_tab"))
             continue
-        if msg.get("id") == request_id:
-            if "error" in msg:
-                err = msg["error"]
-                raise RuntimeError(
-                    f"JSON-RPC error {err.get('code', '?')}: {err.get('message', '')}"
-                )
-            return msg.get("result", {})
-        # Other notifications / unrelated responses — keep waiting.
+        split = decode_tool_result("run_in_panel", await aio.call("run_in_panel", _tool_args(
+            panel="horizontal_split" if panel == "reuse" else panel, script="", tab_id=tab_id,
+            working_dir=working_dir, split_ratio=split_ratio,
+        )))
+        created.append((split["tabId"], split["paneId"]))
+    await asyncio.gather(*(claim(tab_id=t, pane_id=p) for t, p in created))
+    return panes + created
 
 
-# ---------------------------------------------------------------------------
-# Session helpers
-# ---------------------------------------------------------------------------
+async def xargs_async(
+    aio: AsyncMcpSession | StreamableMcpSession, commands: list[str],
+    panes: list[tuple[str, str]], working_dir: str | None, timeout_ms: int | None, done: Queue,
+) -> None:
+    """Run every command on the first idle pane; `(index, record)` goes on `done` per command."""
+    pending = list(enumerate(commands))
+    pending.reverse()
+    started = time.monotonic()
+    timeout = _run_command_timeout(timeout_ms)
 
+    async def worker(tab_id: str, pane_id: str) -> None:
+        while pending:
+            index, command = pending.pop()
+            record = {"index": index, "command": command, "tab_id": tab_id, "pane_id": pane_id,
+                      "started_ms": round((time.monotonic() - started) * 1000, 1)}
+            call_started = time.monotonic()
+            try:
+                result = decode_tool_result("run_command", await aio.call("run_command", _tool_args(
+                    script=command, tab_id=tab_id, pane_id=pane_id, working_dir=working_dir,
+                    timeout_ms=timeout_ms,
+                ), timeout))
+                error = result.get("error")
+            except ToolError as e:
+                result, error = {}, e.text
+            except Exception as e:
+                result, error = {}, str(e) or type(e).__name__
+            exit_code = result.get("exitCode")
+            record.update(
+                ok=bool(result.get("ok")) and exit_code == 0,
+                exit_code=exit_code,
+                # durationMs is measured inside the pane's lock: the command's
+                # own run time. Without it, the client-side wall time.
+                duration_ms=result.get("durationMs", round((time.monotonic() - call_started) * 1000)),
+                output=result.get("output", ""),
+                truncated=bool(result.get("truncated")),
+            )
+            if error:
+                record["error"] = error
+            done.put((index, record))
 
-def open_session(port: int) -> tuple[SseReader, str]:
-    """Open the SSE stream and grab the session-scoped POST endpoint URL."""
-    # SDK 0.8.3 mounts the SSE endpoint at root, not /sse.
-    sse_url = f"http://127.0.0.1:{port}/"
-    reader = SseReader(sse_url)
-    reader.start()
-    try:
-        event, data = reader.queue.get(timeout=SSE_OPEN_TIMEOUT_SEC)
-    except Empty:
-        reader.close()
-        raise RuntimeError("timed out waiting for SSE endpoint event")
-    if event == "__error__":
-        reader.close()
-        raise RuntimeError(data)
-    if event != "endpoint":
-        reader.close()
-        raise RuntimeError(f"expected 'endpoint' SSE event, got '{event}'")
-    # The endpoint event's data is the session-scoped URL (often a relative
-    # path like `/?sessionId=abc`). Make it absolute against the server.
-    base = urllib.parse.urlparse(sse_url)
-    post_url = urllib.parse.urljoin(f"{base.scheme}://{base.netloc}", data)
-    return reader, post_url
-
-
-def initialize(reader: SseReader, post_url: str) -> None:
-    post_json(post_url, {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": MCP_PROTOCOL_VERSION,
-            "capabilities": {},
-            "clientInfo": {"name": CLIENT_NAME, "version": CLIENT_VERSION},
-        },
-    })
-    wait_for_response(reader, 1, RPC_RESPONSE_TIMEOUT_SEC)
-    post_json(post_url, {
-        "jsonrpc": "2.0",
-        "method": "notifications/initialized",
-    })
+    await asyncio.gather(*(worker(*pane) for pane in panes))
 
 
-def call_tool(reader: SseReader, post_url: str, name: str, args: dict) -> dict:
-    post_json(post_url, {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {"name": name, "arguments": args},
-    })
-    return wait_for_response(reader, 2, RPC_RESPONSE_TIMEOUT_SEC)
+def cmd_xargs(
+    port: int | str, path: str | None, jobs: int, tab_id: str | None, pane_ids: list[str], panel: str,
+    split_ratio: float | None, working_dir: str | None, timeout_ms: int | None,
+    with_output: bool, summary: bool,
+) -> int:
+    """Run shell commands, one per line of `path` (or stdin), in `jobs` panes at once.
 
+    Each output line is `{"index", "command", "tab_id", "pane_id",
+    "started_ms", "ok", "exit_code", "duration_ms", "output", "truncated"}`
+    (plus `error`), in completion order; `started_ms` is from the first
+    command's start. Makespan and per-pane utilization go to stderr, or
+    as a final `{"summary": ...}` line with `summary`.
+    """
+    from queue import Queue
+
+    if jobs < 1:
+        print("xargs: -P must be at least 1", file=sys.stderr)
+        return 2
+    try:
+        if path is None:
+            commands = _read_commands(sys.stdin)
+        else:
+            with open(path) as f:
+                commands = _read_commands(f)
+    except OSError as e:
+        print(f"xargs: {e}", file=sys.stderr)
+        return 2
+    if not commands:
+        return 0
+    try:
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
+    except Exception as e:
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
+
+    failures = 0
+    busy: dict[tuple[str, str], list[int]] = {}
+    try:
+        # Every worker holds a pooled connection for its whole run_command
+        # over Streamable HTTP; one more keeps pane setup off their backs.
+        pool = connection_pool(event_loop())
+        pool.max_per_host = max(pool.max_per_host, jobs + 1)
+        started = time.perf_counter()
+        try:
+            panes = run_sync(xargs_panes(
+                session.aio, min(jobs, len(commands)), tab_id, pane_ids, panel, split_ratio,
+                working_dir,
+            ))
+        except ToolError as e:
+            print(f"opening panes failed: {e.text}", file=sys.stderr)
+            return 1
+        except Exception as e:
+            print(f"opening panes failed: {e}", file=sys.stderr)
+            return 1
+        TRACE.phase("panes", started)
+        busy = {pane: [0, 0] for pane in panes}
+        done: Queue = Queue()
+        started = time.perf_counter()
+        run = submit(xargs_async(session.aio, commands, panes, working_dir, timeout_ms, done))
+        try:
+            for index, record in drain_results(run, done, "xargs"):
+                if not record["ok"]:
+                    failures += 1
+                stats = busy[(record["tab_id"], record["pane_id"])]
+                stats[0] += 1
+                stats[1] += record["duration_ms"]
+                if not with_output:
+                    del record["output"]
+                print(json.dumps(record), flush=True)
+            run.result()
+        except KeyboardInterrupt:
+            run.cancel()
+            return 130
+        makespan = time.perf_counter() - started
+        TRACE.phase("xargs", started)
+        TRACE.fields["commands"] = len(commands)
+        TRACE.fields["panes"] = len(panes)
+    finally:
+        session.close()
+
+    makespan_ms = round(makespan * 1000)
+    per_pane = [
+        {"tab_id": tab, "pane_id": pane, "commands": count, "busy_ms": busy_ms,
+         "utilization": round(busy_ms / makespan_ms, 3) if makespan_ms else 0.0}
+        for (tab, pane), (count, busy_ms) in busy.items()
+    ]
+    if summary:
+        print(json.dumps({"summary": {
+            "commands": len(commands), "failed": failures, "makespan_ms": makespan_ms,
+            "utilization": round(sum(p["busy_ms"] for p in per_pane) / (makespan_ms * len(panes)), 3)
+            if makespan_ms else 0.0,
+            "panes": per_pane,
+        }}), flush=True)
+    else:
+        print(f"xargs: {len(commands)} commands ({failures} failed) on {len(panes)} panes, "
+              f"makespan {makespan:.2f}s", file=sys.stderr)
+        for p in per_pane:
+            print(f"  {p['pane_id']}  {p['commands']:>4} commands  busy {p['busy_ms'] / 1000:.2f}s  "
+                  f"{p['utilization']:.0%}", file=sys.stderr)
+    return XARGS_FAILED_EXIT if failures else 0
 
-# ---------------------------------------------------------------------------
-# CLI entrypoints
-# ---------------------------------------------------------------------------
+
+def cmd_wait_for(
+    port: int | str, tab_id: str, regex: str, timeout: float | None,
+    ignore_case: bool, max_interval: float,
+) -> int:
+    try:
+        pattern = re.compile(regex, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        print(f"invalid regex: {e}", file=sys.stderr)
+        return 2
+    try:
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
+    except Exception as e:
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
+    waiter = OutputWaiter(session.aio, tab_id, pattern, max_interval)
+    started = time.perf_counter()
+    try:
+        line = session_wait(waiter, timeout)
+    except ToolError as e:
+        print(f"wait-for failed: {e.text}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"wait-for failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        TRACE.phase("wait", started)
+        TRACE.fields["polls"] = waiter.polls
+        session.close()
+    if line is None:
+        print(f"timed out after {timeout:g}s waiting for /{regex}/ in {tab_id}", file=sys.stderr)
+        if not waiter.debug_enabled:
+            print("  Note: debug data collection is off for this tab, so no output is recorded.",
+                  file=sys.stderr)
+        return 1
+    print(line)
+    return 0
 
 
-def cmd_ping(port: int) -> int:
+def cmd_follow(
+    port: int | str, tab_id: str, since: int | None, lines: int, plain: bool,
+    as_json: bool, sources: list[str], max_interval: float,
+) -> int:
     try:
-        reader, post_url = open_session(port)
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
     except Exception as e:
-        print(f"ping failed: {e}", file=sys.stderr)
+        print(f"connect failed: {e}", file=sys.stderr)
         return 1
+    tail = DebugConsoleTail(session.aio, tab_id, max_interval=max_interval)
+    out = sys.stdout
+
+    def emit(chunk: dict) -> None:
+        data = chunk.get("data", "")
+        if plain:
+            data = _ANSI_ESCAPE.sub("", data).replace("\r\n", "\n")
+        if as_json:
+            out.write(json.dumps({"index": chunk["index"], "timestamp": chunk["timestamp"],
+                                  "source": chunk["source"], "data": data}) + "\n")
+        else:
+            out.write(data)
+        out.flush()
+
+    def on_gap(gap: tuple[int, int]) -> None:
+        first, last = gap
+        if last < 0:
+            message = f"debug buffer restarted after index {first - 1}; resynced from its start"
+        else:
+            message = f"{last - first + 1} chunks ({first}..{last}) dropped from the ring buffer; resynced"
+        if as_json:
+            out.write(json.dumps({"gap": {"from": first, "to": last if last >= 0 else None}}) + "\n")
+            out.flush()
+        print(f"follow: {message}", file=sys.stderr, flush=True)
+
+    async def run() -> None:
+        if lines > 0:
+            # Same session, back to back with the seek below, so the window
+            # between the two (output neither prints) is one round trip.
+            page = decode_tool_result(
+                "read_scrollback",
+                await session.aio.call("read_scrollback", {"tab_id": tab_id, "lines": lines}),
+            )
+            for line in page.get("lines", []):
+                if as_json:
+                    out.write(json.dumps({"line": line}) + "\n")
+                else:
+                    out.write(line + "\n")
+            out.flush()
+        if since is None:
+            await tail.seek_newest()
+        else:
+            tail.since = since
+        if not tail.debug_enabled:
+            print(f"follow: debug data collection is off for {tab_id}; nothing will be recorded",
+                  file=sys.stderr, flush=True)
+        await follow_output(tail, emit, on_gap, frozenset(s.upper() for s in sources))
+
+    started = time.perf_counter()
+    future = submit(run())
     try:
-        initialize(reader, post_url)
+        future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        return 130
+    except BrokenPipeError:
+        future.cancel()
+        # The reader went away (`| head`); don't let the final flush complain.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except ToolError as e:
+        print(f"follow failed: {e.text}", file=sys.stderr)
+        return 1
     except Exception as e:
-        print(f"ping failed: {e}", file=sys.stderr)
+        print(f"follow failed: {e}", file=sys.stderr)
         return 1
     finally:
-        reader.close()
+        TRACE.phase("follow", started)
+        TRACE.fields["polls"] = tail.polls
+        session.close()
     return 0
 
 
-def cmd_call(port: int, tool: str, args_json: str) -> int:
+def cmd_export(
+    port: int | str, tab_id: str, path: str, pane_id: str | None, compression: str,
+    restart: bool, page_lines: int,
+) -> int:
     try:
-        args = json.loads(args_json)
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
     except Exception as e:
-        print(f"invalid args JSON: {e}", file=sys.stderr)
+        print(f"connect failed: {e}", file=sys.stderr)
+        return 1
+    exporter = ScrollbackExporter(
+        session.aio, tab_id, path, pane_id=pane_id, compression=compression, page_lines=page_lines,
+    )
+    started = time.perf_counter()
+    future = submit(exporter.run(restart))
+    try:
+        future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        print(f"export interrupted; run it again to resume from {exporter.state_path}", file=sys.stderr)
+        return 130
+    except ScrollbackError as e:
+        print(f"export failed: {e}", file=sys.stderr)
+        return 1
+    except ToolError as e:
+        print(f"export failed: {e.text}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"export failed: {e}; run it again to resume", file=sys.stderr)
+        return 1
+    finally:
+        TRACE.phase("export", started)
+        TRACE.fields["pages"] = exporter.pages
+        session.close()
+    resumed = "" if exporter.resumed_at is None else f" (resumed at line {exporter.resumed_at})"
+    print(f"exported {exporter.written} lines to {path}{resumed}", file=sys.stderr)
+    if exporter.gaps:
+        print("  Note: history scrolled past the export before it could be read; "
+              "some lines are missing (raise bufferMaxLines to keep more).", file=sys.stderr)
+    return 0
+
+
+def cmd_grep(port: int | str, tab_id: str, ns: argparse.Namespace) -> int:
+    patterns = list(ns.patterns or [])
+    if ns.pattern is not None:
+        patterns.append(ns.pattern)
+    for path in ns.pattern_files or []:
+        try:
+            with open(path, encoding="utf-8") as f:
+                patterns.extend(line.rstrip("\n") for line in f)
+        except OSError as e:
+            print(f"grep: {e}", file=sys.stderr)
+            return 2
+    if not patterns:
+        print("grep: no pattern given (PATTERN, -e or -f)", file=sys.stderr)
         return 2
-    if not isinstance(args, dict):
-        print("args JSON must be an object", file=sys.stderr)
+    try:
+        regex = grep_pattern(patterns, ns.fixed, ns.ignore_case, ns.word, ns.whole_line)
+        prefilter = None
+        if ns.word or ns.whole_line:
+            prefilter = grep_pattern(patterns, ns.fixed, ns.ignore_case)
+    except re.error as e:
+        print(f"grep: invalid regex: {e}", file=sys.stderr)
         return 2
     try:
-        reader, post_url = open_session(port)
+        session = traced_connect(port)
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
     except Exception as e:
         print(f"connect failed: {e}", file=sys.stderr)
-        return 1
+        return 2
+    temp_dir = None
+    if ns.no_cache:
+        import tempfile
+
+        temp_dir = tempfile.TemporaryDirectory(prefix="bossterm-grep-")
+    # --no-cache scrollback goes away however grep exits.
+    try:
+        cache = ScrollbackCache(
+            session.aio, session.port, tab_id, ns.pane_id,
+            cache_dir=temp_dir.name if temp_dir else GREP_CACHE_DIR,
+        )
+        started = time.perf_counter()
+        try:
+            submit(cache.refresh()).result()
+        except KeyboardInterrupt:
+            return 130
+        except ToolError as e:
+            print(f"grep: {e.text}", file=sys.stderr)
+            return 2
+        except Exception as e:
+            print(f"grep: {e}", file=sys.stderr)
+            return 2
+        finally:
+            TRACE.phase("refresh", started)
+            TRACE.fields["pages"] = cache.pages
+            TRACE.fields["fetched"] = cache.fetched
+            session.close()
+
+        label = f"{ns.pane_id or tab_id}:" if ns.with_label else ""
+        selected = 0
+        started = time.perf_counter()
+        try:
+            limit = 1 if ns.quiet else ns.max_count
+            for lineno, line in grep_lines(cache, regex, ns.invert, ns.jobs, limit, prefilter):
+                if ns.max_count is not None and selected >= ns.max_count:
+                    break
+                selected += 1
+                if ns.count or ns.quiet:
+                    continue
+                number = f"{lineno + 1}:" if ns.line_number else ""
+                sys.stdout.write(f"{label}{number}{line}\n")
+            if ns.count:
+                sys.stdout.write(f"{label}{selected}\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except KeyboardInterrupt:
+            return 130
+        finally:
+            TRACE.phase("search", started)
+        return 0 if selected else 1
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+def cmd_refresh_cache(port: int | str) -> int:
+    # Stamped before fetching: a server that restarts meanwhile leaves the
+    # cache stale (refreshed again next time), never attributed wrongly.
+    stamp = server_stamp()
+
+    async def run() -> tuple[int, dict]:
+        async with AsyncClient(port) as bt:
+            return bt.port, await collect_completions(bt)
+
+    started = time.perf_counter()
     try:
-        initialize(reader, post_url)
-        result = call_tool(reader, post_url, tool, args)
+        bound, completions = submit(run()).result()
+    except ServerNotFound as e:
+        return report_unreachable(str(e))
     except Exception as e:
-        print(f"tool call failed: {e}", file=sys.stderr)
+        print(f"refresh-cache failed: {e}", file=sys.stderr)
         return 1
     finally:
-        reader.close()
+        TRACE.phase("refresh", started)
+    os.makedirs(os.path.dirname(COMPLETION_CACHE_PATH), mode=0o700, exist_ok=True)
+    _write_json_atomic(COMPLETION_CACHE_PATH, dict(
+        completions, port=bound, stamp=stamp, written=time.time(),
+    ))
+    return 0
 
-    # BossTerm tool results are CallToolResult { content: [TextContent{text}] }.
-    # The text is itself a JSON string we want to surface to the caller.
-    content = result.get("content") or []
-    for chunk in content:
-        if chunk.get("type") == "text" and "text" in chunk:
-            print(chunk["text"])
-            break
+
+def cmd_complete(kind: str, tab_id: str | None, describe: bool) -> int:
+    cache, fresh = read_completion_cache()
+    if not fresh:
+        refresh_completions_in_background()
+    if cache is None:
+        return 0
+    if kind == "tabs":
+        entries = cache.get("tabs", [])
+    elif kind == "panes":
+        panes = cache.get("panes", {})
+        # Without --tab, pane commands act on the active tab.
+        entries = panes.get(tab_id or cache.get("active"), [])
     else:
-        # No text content; surface the structured result as a courtesy.
-        print(json.dumps(result))
-    if result.get("isError"):
-        return 1
+        entries = cache.get("tools", [])
+    for name, description in entries:
+        # Descriptions are for zsh's `_describe`, which splits on ':'.
+        sys.stdout.write(f"{name}:{description}\n" if describe else f"{name}\n")
     return 0
 
 
+def session_wait(waiter: OutputWaiter, timeout: float | None) -> str | None:
+    """Run a waiter on the shared loop; Ctrl-C cancels it instead of orphaning it."""
+    future = submit(waiter.wait(timeout))
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        raise
+
+
+# The invocations the bash CLI makes on every command: subcommand and
+# positionals only. main() reads those straight from argv instead of
+# building the argparse parser, whose import and setup are a good part of
+# startup; any option, a different arity or a bad port goes to argparse,
+# which also produces every usage error.
+_PLAIN_ARGS = {
+    # subcommand: (required positionals, optional positionals)
+    "ping": (("port",), ()),
+    "call": (("port", "tool", "args_json"), ()),
+    "discover": ((), ("base",)),
+    "complete": (("kind",), ("tab_id",)),
+}
+
+
+def plain_args(argv: list[str]):
+    """The namespace argparse would produce for a `_PLAIN_ARGS` invocation, else None."""
+    if not argv or argv[0] not in _PLAIN_ARGS or any(arg.startswith("-") for arg in argv):
+        return None
+    required, optional = _PLAIN_ARGS[argv[0]]
+    values = argv[1:]
+    if not len(required) <= len(values) <= len(required) + len(optional):
+        return None
+    import types
+
+    names = required + optional
+    ns = types.SimpleNamespace(cmd=argv[0], trace=None, window=PORT_WINDOW, describe=False)
+    for name, value in zip(names, values + [None] * (len(names) - len(values))):
+        setattr(ns, name, value)
+    try:
+        if getattr(ns, "port", "auto") != "auto":
+            ns.port = int(ns.port)
+        if getattr(ns, "base", None) is not None:
+            ns.base = int(ns.base)
+    except ValueError:
+        return None
+    if ns.cmd == "complete" and ns.kind not in ("tabs", "panes", "tools"):
+        return None
+    return ns
+
+
 def main() -> int:
+    started, startup_cpu = time.perf_counter(), time.process_time()
+    ns = plain_args(sys.argv[1:])
+    if ns is None:
+        ns = parse_args()
+    global TRACE
+    TRACE = Trace(trace_target(getattr(ns, "trace", None)), started)
+    if TRACE.enabled:
+        TRACE.phases["startup_cpu"] = round(startup_cpu * 1000, 3)
+    TRACE.fields["cmd"] = ns.cmd
+    if ns.cmd in ("call", "fanout"):
+        TRACE.fields["tool"] = ns.tool
+    rc = run_command(ns)
+    TRACE.emit(rc)
+    return rc
+
+
+def parse_args() -> argparse.Namespace:
+    import argparse
+
     parser = argparse.ArgumentParser(prog="bossterm-mcp")
+    tracing = argparse.ArgumentParser(add_help=False)
+    tracing.add_argument(
+        "--trace", action="store_const", const="-", default=None,
+        help="print per-phase timings as one JSON line on stderr",
+    )
+    tracing.add_argument(
+        "--trace-file", dest="trace", metavar="FILE",
+        help="append the timings line to FILE instead",
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
-    p_ping = sub.add_parser("ping", help="verify the MCP server responds")
-    p_ping.add_argument("port", type=int)
-    p_call = sub.add_parser("call", help="invoke a tool")
-    p_call.add_argument("port", type=int)
+    p_ping = sub.add_parser("ping", parents=[tracing], help="verify the MCP server responds")
+    p_ping.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_call = sub.add_parser("call", parents=[tracing], help="invoke a tool")
+    p_call.add_argument("port", type=port_arg, help="port number, or 'auto'")
     p_call.add_argument("tool")
     p_call.add_argument("args_json", help='JSON object, e.g. \'{"tab_id":"..."}\'')
-    ns = parser.parse_args()
+    p_discover = sub.add_parser(
+        "discover", parents=[tracing], help="print the first live MCP port"
+    )
+    p_discover.add_argument(
+        "base", type=int, nargs="?", default=None,
+        help="first port of the window (default: settings.mcpPort, else 7676)",
+    )
+    p_discover.add_argument(
+        "--window", type=int, default=PORT_WINDOW, metavar="N",
+        help=f"number of ports to probe from base (default: {PORT_WINDOW})",
+    )
+    p_batch = sub.add_parser(
+        "call-batch", parents=[tracing],
+        help="pipeline JSONL {tool, args} records from stdin over one session",
+    )
+    p_batch.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_batch.add_argument(
+        "--ordered", action="store_true",
+        help="emit results in input order (default: completion order)",
+    )
+    p_batch.add_argument(
+        "--call-timeout", type=float, default=RPC_RESPONSE_TIMEOUT_SEC, metavar="SEC",
+        help="per-call response timeout; a record's own 'timeout' overrides it",
+    )
+    p_batch.add_argument(
+        "--deadline", type=float, default=None, metavar="SEC",
+        help="overall budget for the whole batch (default: none)",
+    )
+    p_batch.add_argument(
+        "--jobs", type=int, default=8, metavar="N",
+        help="max keep-alive POST connections (default: 8)",
+    )
+    p_batch.add_argument(
+        "--stats", action="store_true",
+        help="print connection pool counters (opened/reused/stale/retried) to stderr",
+    )
+    p_fanout = sub.add_parser(
+        "fanout", parents=[tracing],
+        help="call one tool on every pane (or tab) concurrently",
+    )
+    p_fanout.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_fanout.add_argument("tool")
+    p_fanout.add_argument(
+        "args_json", nargs="?", default="{}",
+        help="args template; tab_id/pane_id are filled in per target (default: {})",
+    )
+    p_fanout.add_argument(
+        "--tabs", dest="scope", action="store_const", const="tabs", default="panes",
+        help="one call per tab (its focused pane) instead of per pane",
+    )
+    p_fanout.add_argument(
+        "--jobs", type=int, default=16, metavar="N",
+        help="max calls in flight at once (default: 16)",
+    )
+    p_fanout.add_argument(
+        "--call-timeout", type=float, default=RPC_RESPONSE_TIMEOUT_SEC, metavar="SEC",
+        help=f"per-call response timeout (default: {RPC_RESPONSE_TIMEOUT_SEC:g})",
+    )
+    p_xargs = sub.add_parser(
+        "xargs", parents=[tracing],
+        help="run shell commands from stdin in N panes at once, like xargs -P",
+    )
+    p_xargs.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_xargs.add_argument(
+        "-P", "--max-procs", dest="jobs", type=int, default=4, metavar="N",
+        help="panes to run commands in at once (default: 4)",
+    )
+    p_xargs.add_argument(
+        "-a", "--arg-file", dest="file", default=None, metavar="FILE",
+        help="read commands from FILE instead of stdin",
+    )
+    p_xargs.add_argument("--tab", dest="tab_id", default=None, metavar="ID",
+                         help="tab to run in (default: the active tab)")
+    p_xargs.add_argument(
+        "--pane", dest="pane_ids", action="append", default=[], metavar="ID",
+        help="run in this pane of the tab; repeatable, used before any others",
+    )
+    p_xargs.add_argument(
+        "--panel", choices=XARGS_PANELS, default="reuse",
+        help="how further panes are opened (default: reuse, which splits like "
+             "run_command's scratch pane)",
+    )
+    p_xargs.add_argument("--working-dir", default=None, metavar="DIR")
+    p_xargs.add_argument(
+        "--timeout-ms", type=int, default=None, metavar="MS",
+        help="per-command timeout (default: run_command's, 120000)",
+    )
+    p_xargs.add_argument("--split-ratio", type=float, default=None, metavar="R",
+                         help="size of each new split (0.05..0.95)")
+    p_xargs.add_argument("--no-output", dest="with_output", action="store_false",
+                         help="leave each command's output out of its line")
+    p_xargs.add_argument(
+        "--summary", action="store_true",
+        help="end with a {\"summary\": ...} line instead of the stderr report",
+    )
+    p_wait = sub.add_parser(
+        "wait-for", parents=[tracing],
+        help="block until new output in a tab matches a regex",
+    )
+    p_wait.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_wait.add_argument("tab_id")
+    p_wait.add_argument("regex", help="Python regex, matched per output line")
+    p_wait.add_argument(
+        "--timeout", type=float, default=None, metavar="SEC",
+        help="give up after SEC seconds, exit 1 (default: wait forever)",
+    )
+    p_wait.add_argument("-i", "--ignore-case", action="store_true")
+    p_wait.add_argument(
+        "--max-interval", type=float, default=WAIT_POLL_MAX_SEC, metavar="SEC",
+        help=f"longest gap between polls while idle (default: {WAIT_POLL_MAX_SEC:g})",
+    )
+    p_follow = sub.add_parser(
+        "follow", parents=[tracing], help="stream a tab's new PTY output to stdout",
+    )
+    p_follow.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_follow.add_argument("tab_id")
+    p_follow.add_argument(
+        "--since", type=int, default=None, metavar="INDEX",
+        help="resume after chunk INDEX (default: start with new output)",
+    )
+    p_follow.add_argument(
+        "--lines", type=int, default=0, metavar="N",
+        help="first print the last N lines of scrollback, like `tail -n N -f`",
+    )
+    p_follow.add_argument(
+        "--plain", action="store_true", help="strip escape sequences and CRs before CRLF",
+    )
+    p_follow.add_argument(
+        "--json", action="store_true",
+        help="one JSON object per chunk ({index, timestamp, source, data}) or gap ({gap})",
+    )
+    p_follow.add_argument(
+        "--source", dest="sources", action="append", default=None, metavar="NAME",
+        help="chunk source to include, repeatable (default: PTY_OUTPUT)",
+    )
+    p_follow.add_argument(
+        "--max-interval", type=float, default=WAIT_POLL_MAX_SEC, metavar="SEC",
+        help=f"longest gap between polls while idle (default: {WAIT_POLL_MAX_SEC:g})",
+    )
+    p_export = sub.add_parser(
+        "export", parents=[tracing], help="write a tab's whole scrollback to a file, resumably",
+    )
+    p_export.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_export.add_argument("tab_id")
+    p_export.add_argument("file")
+    p_export.add_argument("--pane", dest="pane_id", default=None, metavar="ID",
+                          help="a split pane (default: the focused pane)")
+    p_export.add_argument(
+        "--compress", choices=("auto", "none", "gzip", "xz"), default="auto",
+        help="compression (default: auto, from the file's .gz/.xz suffix)",
+    )
+    p_export.add_argument(
+        "--restart", action="store_true", help="ignore an interrupted export's checkpoint",
+    )
+    p_export.add_argument(
+        "--page-lines", type=int, default=EXPORT_PAGE_LINES, metavar="N",
+        help=f"lines per read_scrollback request (default: {EXPORT_PAGE_LINES})",
+    )
+    p_grep = sub.add_parser(
+        "grep", parents=[tracing],
+        help="search a pane's scrollback like grep, from a local cache refreshed incrementally",
+    )
+    p_grep.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_grep.add_argument("tab_id")
+    p_grep.add_argument("pattern", nargs="?", help="Python regex (or see -e/-f)")
+    p_grep.add_argument("-e", dest="patterns", action="append", metavar="PATTERN",
+                        help="a pattern; repeatable, lines matching any are selected")
+    p_grep.add_argument("-f", dest="pattern_files", action="append", metavar="FILE",
+                        help="read patterns from FILE, one per line")
+    p_grep.add_argument("-F", "--fixed-strings", dest="fixed", action="store_true")
+    p_grep.add_argument("-i", "--ignore-case", dest="ignore_case", action="store_true")
+    p_grep.add_argument("-w", "--word-regexp", dest="word", action="store_true")
+    p_grep.add_argument("-x", "--line-regexp", dest="whole_line", action="store_true")
+    p_grep.add_argument("-v", "--invert-match", dest="invert", action="store_true")
+    p_grep.add_argument("-n", "--line-number", dest="line_number", action="store_true",
+                        help="prefix the line's number in the buffer, oldest line is 1")
+    p_grep.add_argument("-c", "--count", action="store_true")
+    p_grep.add_argument("-q", "--quiet", action="store_true")
+    p_grep.add_argument("-m", "--max-count", type=int, default=None, metavar="NUM")
+    p_grep.add_argument("-H", "--with-filename", dest="with_label", action="store_true",
+                        help="prefix the pane (or tab) id")
+    p_grep.add_argument("--pane", dest="pane_id", default=None, metavar="ID",
+                        help="a split pane (default: the focused pane)")
+    p_grep.add_argument(
+        "--jobs", type=int, default=None, metavar="N",
+        help=f"worker processes (default: 1, or up to {GREP_MAX_JOBS} for caches over "
+             f"{GREP_PARALLEL_MIN_BYTES >> 20} MB)",
+    )
+    p_grep.add_argument("--no-cache", action="store_true",
+                        help="read the whole scrollback and keep nothing on disk")
+    p_complete = sub.add_parser(
+        "complete", help="print cached tab, pane or tool names for shell completion",
+    )
+    p_complete.add_argument("kind", choices=("tabs", "panes", "tools"))
+    p_complete.add_argument("tab_id", nargs="?", help="with `panes`: only this tab's")
+    p_complete.add_argument("--describe", action="store_true",
+                            help="name:description per line (zsh _describe format)")
+    p_refresh = sub.add_parser(
+        "refresh-cache", parents=[tracing],
+        help="fetch tabs, panes and tools into the completion cache",
+    )
+    p_refresh.add_argument("port", type=port_arg, help="port number, or 'auto'")
+    p_serve = sub.add_parser("serve", help="run the resident session broker")
+    p_serve.add_argument(
+        "--idle-timeout", type=float, default=None, metavar="SEC",
+        help="exit after SEC seconds without a request (default: never)",
+    )
+    ns, extra = parser.parse_known_args()
+    # argparse can't take a subcommand's optional positional after options
+    # (`grep 7676 tab-1 -n PATTERN`), which is how grep is usually typed.
+    if ns.cmd == "grep" and ns.pattern is None and len(extra) == 1 and not extra[0].startswith("-"):
+        ns.pattern = extra.pop()
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return ns
+
+
+def run_command(ns: argparse.Namespace) -> int:
     if ns.cmd == "ping":
         return cmd_ping(ns.port)
     if ns.cmd == "call":
         return cmd_call(ns.port, ns.tool, ns.args_json)
+    if ns.cmd == "discover":
+        return cmd_discover(ns.base, ns.window)
+    if ns.cmd == "call-batch":
+        return cmd_call_batch(
+            ns.port, ns.ordered, ns.call_timeout, ns.deadline, ns.jobs, ns.stats
+        )
+    if ns.cmd == "fanout":
+        return cmd_fanout(ns.port, ns.tool, ns.args_json, ns.scope, ns.jobs, ns.call_timeout)
+    if ns.cmd == "xargs":
+        return cmd_xargs(
+            ns.port, ns.file, ns.jobs, ns.tab_id, ns.pane_ids, ns.panel, ns.split_ratio,
+            ns.working_dir, ns.timeout_ms, ns.with_output, ns.summary,
+        )
+    if ns.cmd == "wait-for":
+        return cmd_wait_for(
+            ns.port, ns.tab_id, ns.regex, ns.timeout, ns.ignore_case, ns.max_interval
+        )
+    if ns.cmd == "follow":
+        return cmd_follow(
+            ns.port, ns.tab_id, ns.since, ns.lines, ns.plain, ns.json,
+            ns.sources or ["PTY_OUTPUT"], ns.max_interval,
+        )
+    if ns.cmd == "complete":
+        return cmd_complete(ns.kind, ns.tab_id, ns.describe)
+    if ns.cmd == "refresh-cache":
+        return cmd_refresh_cache(ns.port)
+    if ns.cmd == "grep":
+        return cmd_grep(ns.port, ns.tab_id, ns)
+    if ns.cmd == "export":
+        return cmd_export(
+            ns.port, ns.tab_id, ns.file, ns.pane_id, ns.compress, ns.restart, ns.page_lines,
+        )
+    if ns.cmd == "serve":
+        return cmd_serve(ns.idle_timeout)
     return 2
 
 
@@ -0,0 +1,28 @@
+"""
+Importable name for bossterm-mcp.py, the `bossterm` CLI's MCP helper.
+
+The helper ships as one hyphenated file (that's what the installers put next
+to the `bossterm` launcher), so it can't be imported by name. This module
+loads it and stands in for it in sys.modules:
+
+    import bossterm_mcp
+
+    with bossterm_mcp.Client() as bt:
+        print(bt.list_tabs())
+
+Put this directory (or wherever bossterm-mcp.py is installed, with this
+file next to it) on sys.path first.
+"""
+
+import importlib.util
+import os
+import sys
+
+_HELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bossterm-mcp.py")
+
+_spec = importlib.util.spec_from_file_location(__name__, _HELPER_PATH)
+_helper = importlib.util.module_from_spec(_spec)
+# Replace this module before running the helper, so `import bossterm_mcp`
+# anywhere (including re-entrantly) yields the helper's one module object.
+sys.modules[__name__] = _helper
+_spec.loader.exec_module(_helper)
@@ -5,6 +5,7 @@ import ai.rever.bossterm.compose.TerminalSession
 import ai.rever.bossterm.compose.debug.ChunkSource
 import ai.rever.bossterm.compose.settings.SettingsManager
 import ai.rever.bossterm.compose.tabs.TerminalTab
+import ai.rever.bossterm.terminal.model.BufferSnapshot
 import ai.rever.bossterm.terminal.model.CommandStateListener
 import ai.rever.bossterm.terminal.model.TerminalTextBuffer
 import java.io.ByteArrayInputStream
@@ -480,7 +481,8 @@ class BossTermMcpServer(
                 "Read the last N lines from a tab/pane's terminal buffer " +
                         "(history + visible screen) as plain UTF-8 text. Trailing whitespace per " +
                         "line is stripped. When `pane_id` is supplied, reads the specific split " +
-                        "pane (returned by run_in_panel); otherwise reads the focused pane."
+                        "pane (returned by run_in_panel); otherwise reads the focused pane. " +
+                        "Pass `start` to page forward through the whole buffer instead."
             ),
             inputSchema = ToolSchema(
                 properties = buildJsonObject {
@@ -493,6 +495,13 @@ class BossTermMcpServer(
                         put("description", "Maximum number of lines to return from the end. Default 200.")
                         put("minimum", 1)
                     }
+                    putJsonObject("start") {
+                        put("type", "integer")
+                        put("description", "Optional 0-based line to start at, counted from the oldest " +
+                                "line of history. Returns up to `lines` lines from there, oldest first, " +
+                                "instead of the last `lines`.")
+                        put("minimum", 0)
+                    }
                     putJsonObject("pane_id") {
                         put("type", "string")
                         put("description", "Optional specific pane within the tab " +
@@ -509,6 +518,10 @@ class BossTermMcpServer(
             if (requested < 1) {
                 return@addTool errorResult("'lines' must be >= 1 (got $requested)")
             }
+            val start = args.optionalInt("start")
+            if (start != null && start < 0) {
+                return@addTool errorResult("'start' must be >= 0 (got $start)")
+            }
             val paneId = args.requireString("pane_id")
             val state = registry.findState(tabId)
                 ?: return@addTool errorResult("Unknown tab_id: $tabId")
@@ -518,45 +531,67 @@ class BossTermMcpServer(
                     else "No session for tab_id: $tabId"
                 )
 
-            val snapshot = session.textBuffer.createSnapshot()
-            val totalAvailable = snapshot.historyLinesCount + snapshot.height
-            val take = minOf(requested, totalAvailable)
-
-            // Iterate the most recent `take` rows. Buffer row indices run from
-            // `-historyLinesCount` (oldest) through `height - 1` (bottom of screen).
-            val endExclusive = snapshot.height
-            val startInclusive = endExclusive - take
-            val lines = ArrayList<String>(take)
-            var row = startInclusive
-            while (row < endExclusive) {
-                val text = snapshot.getLine(row).text
-                lines.add(text.trimEnd())
-                row++
-            }
+            successJson(readScrollbackAnswer(session.textBuffer.createSnapshot(), requested, start))
+        }
+    }
 
-            val payload = ReadScrollbackResult(lines = lines, totalAvailable = totalAvailable)
-            val full = json.encodeToString(ReadScrollbackResult.serializer(), payload)
-            // Progressive fallbacks. Most callers want recent context, so the
-            // first fallback keeps the tail; the final form gives the agent
-            // enough to refine the next call (smaller `lines`).
-            successJson(shorten(
-                full,
-                {
-                    val tail = lines.takeLast(20)
-                    buildJsonObject {
-                        put("lines", buildJsonArray { for (l in tail) add(JsonPrimitive(l)) })
-                        put("totalAvailable", totalAvailable)
-                        put("shortened", "tail: last ${tail.size} of ${lines.size} requested lines")
-                    }.toString()
-                },
-                {
-                    buildJsonObject {
-                        put("totalAvailable", totalAvailable)
-                        put("shortened", "totals only; retry with a smaller `lines` value")
-                    }.toString()
-                }
-            ))
+    /**
+     * The read_scrollback answer for [snapshot]: the last [requested] lines, or
+     * with [start] up to [requested] lines from that line on, shortened to [cap].
+     * Split out of the handler so paging can be tested against a plain buffer.
+     */
+    internal fun readScrollbackAnswer(
+        snapshot: BufferSnapshot,
+        requested: Int,
+        start: Int?,
+        cap: Int = settingsManager.settings.value.mcpMaxAnswerChars
+    ): String {
+        val totalAvailable = snapshot.historyLinesCount + snapshot.height
+        val take = minOf(requested, totalAvailable)
+
+        // Iterate the most recent `take` rows, or with `start` up to `take`
+        // rows from there. Buffer row indices run from `-historyLinesCount`
+        // (oldest) through `height - 1` (bottom of screen).
+        val startInclusive = if (start == null) {
+            snapshot.height - take
+        } else {
+            -snapshot.historyLinesCount + minOf(start, totalAvailable)
+        }
+        val endExclusive = minOf(startInclusive + take, snapshot.height)
+        val lines = ArrayList<String>(endExclusive - startInclusive)
+        var row = startInclusive
+        while (row < endExclusive) {
+            val text = snapshot.getLine(row).text
+            lines.add(text.trimEnd())
+            row++
         }
+
+        val payload = ReadScrollbackResult(lines = lines, totalAvailable = totalAvailable, start = start)
+        val full = json.encodeToString(ReadScrollbackResult.serializer(), payload)
+        val totalsOnly = {
+            buildJsonObject {
+                put("totalAvailable", totalAvailable)
+                put("shortened", "totals only; retry with a smaller `lines` value")
+            }.toString()
+        }
+        // Progressive fallbacks. Most callers want recent context, so the
+        // first fallback keeps the tail; the final form gives the agent
+        // enough to refine the next call (smaller `lines`). A page read
+        // (`start`) skips the tail: lines out of place would corrupt it.
+        if (start != null) return shorten(full, totalsOnly, cap = cap)
+        return shorten(
+            full,
+            {
+                val tail = lines.takeLast(20)
+                buildJsonObject {
+                    put("lines", buildJsonArray { for (l in tail) add(JsonPrimitive(l)) })
+                    put("totalAvailable", totalAvailable)
+                    put("shortened", "tail: last ${tail.size} of ${lines.size} requested lines")
+                }.toString()
+            },
+            totalsOnly,
+            cap = cap
+        )
     }
 
     // -----------------------------------------------------------------
@@ -2374,9 +2409,9 @@ class BossTermMcpServer(
      */
     private fun shorten(
         full: String,
-        vararg fallbacks: () -> String
+        vararg fallbacks: () -> String,
+        cap: Int = settingsManager.settings.value.mcpMaxAnswerChars
     ): String {
-        val cap = settingsManager.settings.value.mcpMaxAnswerChars
         if (cap <= 0 || full.length <= cap) return full
         for ((i, factory) in fallbacks.withIndex()) {
             val short = factory()
@@ -2482,7 +2517,9 @@ class BossTermMcpServer(
     @Serializable
     data class ReadScrollbackResult(
         val lines: List<String>,
-        val totalAvailable: Int
+        val totalAvailable: Int,
+        /** Echoes the request's `start` for page reads; omitted otherwise. */
+        val start: Int? = null
     )
 
     @Serializable
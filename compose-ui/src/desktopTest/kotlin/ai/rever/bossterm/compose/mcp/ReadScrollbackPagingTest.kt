@@ -0,0 +1,104 @@
+package ai.rever.bossterm.compose.mcp
+
+import ai.rever.bossterm.terminal.model.BufferSnapshot
+import ai.rever.bossterm.terminal.model.CharBuffer
+import ai.rever.bossterm.terminal.model.StyleState
+import ai.rever.bossterm.terminal.model.TerminalTextBuffer
+import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.JsonObject
+import kotlinx.serialization.json.int
+import kotlinx.serialization.json.jsonArray
+import kotlinx.serialization.json.jsonObject
+import kotlinx.serialization.json.jsonPrimitive
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.test.assertFalse
+import kotlin.test.assertTrue
+
+/**
+ * `read_scrollback` with `start` — the page reads `bossterm export` walks the buffer with.
+ *
+ * The exporter trusts three things about a page: its lines are the ones counted from `start`,
+ * oldest first; `start` is echoed back so a page can be matched to its request; and a page that
+ * doesn't fit `mcpMaxAnswerChars` comes back as totals only, never as a tail. A tail would be
+ * lines from somewhere else in the buffer written as if they were the page.
+ *
+ * The buffer here has 7 history rows and 3 screen rows, holding `line 0` (oldest) to `line 9`.
+ */
+class ReadScrollbackPagingTest {
+
+    private val server = BossTermMcpServer(McpTerminalRegistry)
+
+    private fun snapshot(lineCount: Int = 10, height: Int = 3): BufferSnapshot {
+        val buffer = TerminalTextBuffer(20, height, StyleState(), maxHistoryLinesCount = 100)
+        for (i in 0 until lineCount) {
+            val row = if (i < height) {
+                i + 1
+            } else {
+                buffer.scrollArea(scrollRegionTop = 1, dy = -1, scrollRegionBottom = height)
+                height
+            }
+            buffer.writeString(0, row, CharBuffer("line $i"))
+        }
+        return buffer.createSnapshot()
+    }
+
+    private fun read(requested: Int, start: Int?, cap: Int = 0): JsonObject =
+        Json.parseToJsonElement(server.readScrollbackAnswer(snapshot(), requested, start, cap)).jsonObject
+
+    private fun JsonObject.lines(): List<String> = getValue("lines").jsonArray.map { it.jsonPrimitive.content }
+
+    @Test
+    fun `the fixture has history and screen rows`() {
+        val snapshot = snapshot()
+        assertEquals(7, snapshot.historyLinesCount)
+        assertEquals(3, snapshot.height)
+    }
+
+    @Test
+    fun `start 0 reads from the oldest line of history`() {
+        val page = read(requested = 4, start = 0)
+        assertEquals(listOf("line 0", "line 1", "line 2", "line 3"), page.lines())
+        assertEquals(0, page.getValue("start").jsonPrimitive.int)
+        assertEquals(10, page.getValue("totalAvailable").jsonPrimitive.int)
+    }
+
+    @Test
+    fun `a mid-buffer page runs oldest first across the history-screen boundary`() {
+        val page = read(requested = 4, start = 5)
+        assertEquals(listOf("line 5", "line 6", "line 7", "line 8"), page.lines())
+        assertEquals(5, page.getValue("start").jsonPrimitive.int)
+    }
+
+    @Test
+    fun `a page running off the end stops at the bottom of the screen`() {
+        val page = read(requested = 5, start = 8)
+        assertEquals(listOf("line 8", "line 9"), page.lines())
+    }
+
+    @Test
+    fun `start at or past the end returns no lines, not the tail`() {
+        for (start in listOf(10, 50)) {
+            val page = read(requested = 4, start = start)
+            assertEquals(emptyList(), page.lines(), "start=$start")
+            assertEquals(start, page.getValue("start").jsonPrimitive.int, "start=$start is still echoed")
+            assertEquals(10, page.getValue("totalAvailable").jsonPrimitive.int)
+        }
+    }
+
+    @Test
+    fun `a page larger than mcpMaxAnswerChars comes back as totals only`() {
+        // The full page is ~130 chars; the totals-only form ~85.
+        val page = read(requested = 10, start = 0, cap = 100)
+        assertFalse("lines" in page, "a page must never be shortened to some other lines")
+        assertEquals(10, page.getValue("totalAvailable").jsonPrimitive.int)
+        assertTrue(page.getValue("shortened").jsonPrimitive.content.startsWith("totals only"))
+    }
+
+    @Test
+    fun `without start the last lines are read and start is left off the wire`() {
+        val page = read(requested = 3, start = null)
+        assertEquals(listOf("line 7", "line 8", "line 9"), page.lines())
+        assertFalse("start" in page)
+    }
+}